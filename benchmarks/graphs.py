@@ -0,0 +1,115 @@
+"""Graph builders shared by the benchmarks.
+
+The browser is simulated by setting the ``nodes`` and ``edges`` parameters
+the way reactflow synchronizes them.
+"""
+import random
+from typing import Any, Dict, List, Tuple
+
+import panel as pn
+import param
+
+from panel_reactflow.api import Edge, Node, NodePort, PortDirection, PortPosition
+from panel_reactflow.workflow import WorkflowNode
+
+
+class BenchNode(WorkflowNode):
+    """Light node summing the values of its inputs."""
+    node_class_name = "Bench"
+    ports:List[NodePort] = [NodePort(direction=PortDirection.INPUT, position=PortPosition.LEFT, name="Input"),
+                            NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output")]
+
+    def __init__(self, value:float = 1.):
+        super().__init__()
+        self.value = value
+        self.result = value
+
+    def create(self, ):
+        return pn.pane.Markdown(self.name)
+
+    def update(self, _):
+        self.result = self.value + sum(node.get_node_json_value()["value"] for node in self.plugged_nodes.get("Input", []))
+        self.update_outputs()
+
+    def get_node_json_value(self):
+        return {"value": self.result}
+
+
+def chain(n:int) -> List[Tuple[int, int]]:
+    """Each node feeds the next one."""
+    return [(i, i + 1) for i in range(n - 1)]
+
+
+def fan_out(n:int) -> List[Tuple[int, int]]:
+    """The first node feeds all the others."""
+    return [(0, i) for i in range(1, n)]
+
+
+def diamond(n:int) -> List[Tuple[int, int]]:
+    """Stacked diamonds: every layer splits in two branches merging in the next layer."""
+    edges = []
+    for top in range(0, n - 3, 3):
+        edges += [(top, top + 1), (top, top + 2), (top + 1, top + 3), (top + 2, top + 3)]
+    return edges
+
+
+def random_dag(n:int, edge_factor:int = 2, seed:int = 0) -> List[Tuple[int, int]]:
+    """Random edges going from lower to higher node indices, every node being reachable from the first one."""
+    rng = random.Random(seed)
+    edges = {(rng.randrange(i), i) for i in range(1, n)}
+    while len(edges) < min(edge_factor * n, n * (n - 1) // 2):
+        source, target = sorted(rng.sample(range(n), 2))
+        edges.add((source, target))
+    return sorted(edges)
+
+
+TOPOLOGIES = {
+    "chain": chain,
+    "fan_out": fan_out,
+    "diamond": diamond,
+    "random_dag": random_dag,
+}
+
+
+def make_nodes(n:int) -> List[Node]:
+    return [Node(f"node_{i}", BenchNode(), 200 * (i % 50), 100 * (i // 50)) for i in range(n)]
+
+
+def make_edges(pairs:List[Tuple[int, int]]) -> List[Edge]:
+    return [Edge(f"node_{s}", "Output", f"node_{t}", "Input") for s, t in pairs]
+
+
+def node_dicts(nodes:List[Node]) -> List[Dict[str, Any]]:
+    """Nodes as synchronized by reactflow."""
+    return [node.to_reactflow() for node in nodes]
+
+
+def edge_dicts(edges:List[Edge]) -> List[Dict[str, Any]]:
+    """Edges as synchronized by reactflow."""
+    return [
+        {
+            "id": "_".join([e.source, e.source_handle, e.target, e.target_handle]),
+            "source": e.source,
+            "sourceHandle": e.source_handle,
+            "target": e.target,
+            "targetHandle": e.target_handle,
+        }
+        for e in edges
+    ]
+
+
+def sync(graph, nodes:List[Node], edges:List[Edge]):
+    """Simulates the browser sending the graph state."""
+    graph.nodes = node_dicts(nodes)
+    graph.edges = edge_dicts(edges)
+
+
+def wire(workflow, nodes:List[Node], edges:List[Edge]):
+    """Simulates the browser sending the graph state, without triggering the updates of the created nodes and edges."""
+    with param.discard_events(workflow):
+        workflow.nodes = node_dicts(nodes)
+        workflow.edges = edge_dicts(edges)
+    workflow.old_nodes = {n["id"]: n for n in workflow.nodes}
+    workflow._check_node_change(workflow.old_nodes)
+    workflow.old_edges = {e["id"]: e for e in workflow.edges}
+    workflow._build_node_tree()
@@ -0,0 +1,31 @@
+"""Benchmarks of the JSON encoding of the node values."""
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from panel_reactflow.encoding import JSONEncoderToString, dumps
+
+# Large arrays are converted to lists by the standard encoder, while orjson
+# serializes them natively.
+VALUES = {
+    "array": lambda: {"value": np.random.default_rng(0).random(1_000_000)},
+    "table": lambda: {f"column_{i}": np.arange(100_000) for i in range(10)},
+    "records": lambda: [{"x": float(i), "y": i, "label": f"node {i}"} for i in range(100_000)],
+}
+
+
+@pytest.mark.parametrize("value", list(VALUES))
+def test_json_encoder(benchmark, value):
+    data = VALUES[value]()
+
+    benchmark(json.dumps, data, cls=JSONEncoderToString)
+
+
+@pytest.mark.parametrize("value", list(VALUES))
+def test_dumps(benchmark, value):
+    data = VALUES[value]()
+
+    benchmark(dumps, data)
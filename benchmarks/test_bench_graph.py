@@ -0,0 +1,80 @@
+"""Benchmarks of the ReactFlowGraph hot paths."""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from panel_reactflow.reactflow import ReactFlowGraph
+
+from benchmarks.graphs import BenchNode, chain, make_edges, make_nodes, node_dicts, sync
+
+SIZES = [100, 1000]
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_construction(benchmark, n):
+    def setup():
+        return (), {"nodes": make_nodes(n), "edges": make_edges(chain(n))}
+
+    def construct(nodes, edges):
+        return ReactFlowGraph(nodes_classes=[BenchNode], initial_nodes=nodes, initial_edges=edges)
+
+    benchmark.pedantic(construct, setup=setup, rounds=3)
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_construction_lazy(benchmark, n):
+    def setup():
+        return (), {"nodes": make_nodes(n), "edges": make_edges(chain(n))}
+
+    def construct(nodes, edges):
+        return ReactFlowGraph(nodes_classes=[BenchNode], initial_nodes=nodes, initial_edges=edges, lazy_nodes=True)
+
+    benchmark.pedantic(construct, setup=setup, rounds=3)
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_update_nodes_move_all(benchmark, n):
+    nodes = make_nodes(n)
+    edges = make_edges(chain(n))
+    graph = ReactFlowGraph(nodes_classes=[BenchNode], initial_nodes=nodes, initial_edges=edges)
+    sync(graph, nodes, edges)
+
+    moves = [node_dicts(nodes), node_dicts(nodes)]
+    for node in moves[1]:
+        node["position"] = {"x": node["position"]["x"] + 10, "y": node["position"]["y"]}
+
+    state = {"step": 0}
+
+    def move():
+        state["step"] += 1
+        graph.nodes = moves[state["step"] % 2]
+
+    benchmark(move)
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_update_nodes_box_select(benchmark, n):
+    nodes = make_nodes(n)
+    graph = ReactFlowGraph(nodes_classes=[BenchNode], initial_nodes=nodes, initial_edges=[])
+    sync(graph, nodes, [])
+
+    selections = [node_dicts(nodes), node_dicts(nodes)]
+    for node in selections[1]:
+        node["selected"] = True
+
+    state = {"step": 0}
+
+    def select():
+        state["step"] += 1
+        graph.nodes = selections[state["step"] % 2]
+
+    benchmark(select)
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_add_edges_validation(benchmark, n):
+    nodes = make_nodes(n)
+    graph = ReactFlowGraph(nodes_classes=[BenchNode], initial_nodes=nodes, initial_edges=[])
+    edges = make_edges(chain(n))
+
+    benchmark(graph.add_edges, edges)
@@ -0,0 +1,54 @@
+"""Benchmarks of the Workflow node tree building and update propagation."""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from panel_reactflow.workflow import Workflow
+
+from benchmarks.graphs import TOPOLOGIES, BenchNode, make_edges, make_nodes, wire
+
+# Updates follow the execution plans, each node being updated once per
+# propagation: the cost grows with the number of reachable nodes and edges.
+PROPAGATION_CASES = [
+    (topology, n) for topology in ["chain", "fan_out", "diamond", "random_dag"] for n in [100, 1000]
+]
+
+
+def make_workflow(n, topology):
+    nodes = make_nodes(n)
+    edges = make_edges(TOPOLOGIES[topology](n))
+    workflow = Workflow(nodes_classes=[BenchNode], initial_nodes=nodes, initial_edges=edges)
+    wire(workflow, nodes, edges)
+    return workflow, nodes
+
+
+@pytest.mark.parametrize("n", [100, 1000])
+@pytest.mark.parametrize("topology", list(TOPOLOGIES))
+def test_build_node_tree(benchmark, topology, n):
+    workflow, _ = make_workflow(n, topology)
+
+    benchmark(workflow._build_node_tree)
+
+
+@pytest.mark.parametrize("topology, n", PROPAGATION_CASES)
+def test_propagation(benchmark, topology, n):
+    workflow, nodes = make_workflow(n, topology)
+    source = nodes[0].node
+
+    def propagate():
+        source.value += 1
+        source.update(None)
+
+    benchmark(propagate)
+
+
+@pytest.mark.parametrize("n", [100, 1000])
+def test_plan_compilation(benchmark, n):
+    workflow, nodes = make_workflow(n, "random_dag")
+    source = nodes[0].node
+
+    def compile_plan():
+        workflow._topology_version += 1
+        workflow._plan(source)
+
+    benchmark(compile_plan)
@@ -1,8 +1,9 @@
 
 from dataclasses import dataclass
 from enum import Enum
+import weakref
 import panel as pn
-from typing import Any, Dict, List, Union
+from typing import Any, Callable, Dict, List, Set, Tuple, Union
 
 class PortDirection(Enum):
     """Whether the port is an input or output. The update function will spread through output ports."""
@@ -23,6 +24,142 @@ class PortRestriction:
     color:str = "#000"
     """HTML color code of the restriction"""
 
+class PortRestrictionRegistry:
+    """Interns the port restrictions to small integer ids, so that they are shipped once to the browser and compared by id."""
+    def __init__(self, ):
+        self.restrictions:List[PortRestriction] = []
+        """Registered restrictions, indexed by their id"""
+        self.version:int = 0
+        """Counter incremented at each registry change"""
+        self._ids:Dict[Tuple[str, str], int] = {}
+        self._accepted:Dict[str, Set[Union[str, None]]] = {}
+        self._watchers:List[weakref.WeakMethod] = []
+
+    def watch(self, callback:Callable[[], None]):
+        """Registers a method called at each registry change, such as the synchronization of a graph with the browser.
+        The registry only keeps a weak reference to the method object, so that the graphs can be garbage collected.
+        The methods are called in the thread of the change, that can come from any session when the registry is shared.
+
+        Parameters
+        ----------
+        callback : Callable[[], None]
+            Bound method called without argument
+        """
+        self._watchers.append(weakref.WeakMethod(callback))
+
+    def _changed(self, ):
+        """Increments the version and calls the watchers still alive"""
+        self.version += 1
+        alive = []
+        for reference in self._watchers:
+            callback = reference()
+            if callback is not None:
+                alive.append(reference)
+                callback()
+        self._watchers = alive
+
+    def intern(self, restriction:PortRestriction) -> Union[int, None]:
+        """Returns the id of the restriction, registering it if necessary. Restrictions are identified by their name
+        and color, restrictions with the same name being compatible.
+
+        Parameters
+        ----------
+        restriction : PortRestriction
+            Port restriction, can be None
+
+        Returns
+        -------
+        Union[int, None]
+            Restriction id, None if no restriction is provided
+        """
+        if restriction is None:
+            return None
+
+        key = (restriction.name, restriction.color)
+        if not key in self._ids:
+            self._ids[key] = len(self.restrictions)
+            self.restrictions.append(restriction)
+            self._changed()
+
+        return self._ids[key]
+
+    def get(self, restriction_id:Union[int, None]) -> Union[PortRestriction, None]:
+        """Returns the restriction associated to the id
+
+        Parameters
+        ----------
+        restriction_id : Union[int, None]
+            Restriction id
+
+        Returns
+        -------
+        Union[PortRestriction, None]
+            Port restriction
+        """
+        return None if restriction_id is None else self.restrictions[restriction_id]
+
+    def allow(self, target:PortRestriction, sources:List[PortRestriction]):
+        """Allows ports with the target restriction name to accept edges coming from ports with one of the sources restrictions names
+
+        Parameters
+        ----------
+        target : PortRestriction
+            Restriction of the accepting port
+        sources : List[PortRestriction]
+            Restrictions that can be plugged to the target restriction, None accepts ports without restriction
+        """
+        assert target is not None, "The accepting restriction can not be None."
+
+        self.intern(target)
+        for source in sources:
+            self.intern(source)
+        self._accepted.setdefault(target.name, set()).update(None if source is None else source.name for source in sources)
+        self._changed()
+
+    def is_compatible(self, source_id:Union[int, None], target_id:Union[int, None]) -> bool:
+        """Checks if an edge can go from a port with the source restriction to a port with the target restriction
+
+        Parameters
+        ----------
+        source_id : Union[int, None]
+            Source port restriction id
+        target_id : Union[int, None]
+            Target port restriction id
+
+        Returns
+        -------
+        bool
+            Whether the restrictions are compatible
+        """
+        if source_id == target_id:
+            return True
+        if target_id is None:
+            return False
+        source_name = None if source_id is None else self.restrictions[source_id].name
+        target_name = self.restrictions[target_id].name
+        return source_name == target_name or source_name in self._accepted.get(target_name, ())
+
+    def to_reactflow(self, ) -> List[Dict[str, Any]]:
+        """Convert self to reactflow list
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            reactflow readable list of restrictions, indexed by their id, with the ids of the other restrictions they accept
+        """
+        ids = [None] + list(range(len(self.restrictions)))
+        return [
+                    {
+                        "name":restriction.name,
+                        "color":restriction.color,
+                        "accepts":[i for i in ids if i != restriction_id and self.is_compatible(i, restriction_id)],
+                    }
+                    for restriction_id, restriction in enumerate(self.restrictions)
+                ]
+
+restriction_registry = PortRestrictionRegistry()
+"""Registry used by default by the graphs"""
+
 class NodePort:
     def __init__(self, 
                     direction:PortDirection, 
@@ -72,9 +209,14 @@ class NodePort:
 class ReactFlowNode:
     node_class_name = ""
     """Node class name, as it will appear in the reactflow side bar."""
+    node_category = ""
+    """Category used to group the node classes in the reactflow side bar."""
     ports:List[NodePort]
     """List of node ports"""
     name:str
+    state_widgets:Union[List[str], None] = None
+    """Names of the attributes holding the widgets whose value is the node state, recorded by the history and the journal. 
+    None for all the widgets stored in public attributes, except the buttons."""
 
     def __init__(self,):
         """ ReactflowNode constructor used to instanciate the plugged_nodes dictionnary. It is necessary to call it in nodes constructors.
@@ -85,6 +227,29 @@ class ReactFlowNode:
         """Function called by the Reactflow class to instanciate the content of the node
         """
         raise NotImplementedError
+
+def stateful_widgets(node:Any) -> Dict[str, pn.widgets.Widget]:
+    """Returns the widgets stored in the attributes of a node whose value is a state of the node: the widgets declared in 
+    its state_widgets, by default the widgets of its public attributes (buttons values are clicks)
+
+    Parameters
+    ----------
+    node : Any
+        Node instance
+
+    Returns
+    -------
+    Dict[str, pn.widgets.Widget]
+        Widgets for each attribute name
+    """
+    names = getattr(node, "state_widgets", None)
+    if names is not None:
+        return {attribute: getattr(node, attribute) for attribute in names}
+    return {
+                attribute: widget for attribute, widget in vars(node).items()
+                if not attribute.startswith("_") and isinstance(widget, pn.widgets.Widget) and "value" in widget.param 
+                and not isinstance(widget, pn.widgets.Button)
+            }
     
 class Node:
     react_props = {}
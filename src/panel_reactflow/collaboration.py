@@ -0,0 +1,72 @@
+""" Operation log of the graphs edited by several sessions
+"""
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, List, Union
+
+
+class OperationLog:
+    def __init__(self, max_operations:int = 10000):
+        """Numbers the operations applied to a collaborative graph. The operations are applied by Python in the order
+        they are received, each view applying them in the same order: the views converge to the Python graph state,
+        the last operation on a node winning.
+
+        Operations are compact dictionnaries such as :
+            ```
+            {"op":"add_nodes", "nodes":[reactflow nodes]}
+            {"op":"remove_nodes", "ids":[nodes names]}
+            {"op":"move", "positions":{node name: {"x":X coordinate, "y":Y coordinate}}}
+            {"op":"add_edges", "edges":[reactflow edges]}
+            {"op":"remove_edges", "ids":[edges ids]}
+            ```
+
+        Parameters
+        ----------
+        max_operations : int, optional
+            Number of operations kept to bring the late views up to date, by default 10000
+        """
+        self.seq:int = 0
+        """Sequence number of the last operation"""
+        self.operations:Deque[Dict[str, Any]] = deque(maxlen=max_operations)
+        """Last operations, with their sequence number"""
+
+    def __len__(self, ):
+        return len(self.operations)
+
+    def append(self, operation:Dict[str, Any]) -> Dict[str, Any]:
+        """Numbers an operation and stores it
+
+        Parameters
+        ----------
+        operation : Dict[str, Any]
+            Applied operation
+
+        Returns
+        -------
+        Dict[str, Any]
+            Operation with its "seq" sequence number
+        """
+        self.seq += 1
+        entry = {"seq":self.seq, **operation}
+        self.operations.append(entry)
+        return entry
+
+    def since(self, seq:int) -> Union[List[Dict[str, Any]], None]:
+        """Returns the operations applied after a sequence number
+
+        Parameters
+        ----------
+        seq : int
+            Sequence number of the last operation known by a view
+
+        Returns
+        -------
+        Union[List[Dict[str, Any]], None]
+            Operations in order, None if some of them are no longer stored
+        """
+        if seq >= self.seq:
+            return []
+        first = self.operations[0]["seq"] if self.operations else self.seq + 1
+        if first > seq + 1:
+            return None
+        return list(islice(self.operations, seq + 1 - first, None))
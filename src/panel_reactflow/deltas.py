@@ -0,0 +1,50 @@
+""" Changes of the collection valued outputs, for the nodes updating incrementally
+"""
+from dataclasses import dataclass
+from typing import Any, List, Union
+
+import numpy as np
+
+
+@dataclass
+class Delta:
+    """Change of a collection valued output (array, list, DataFrame), published by a node along with its full value."""
+    appended:Any = None
+    """Elements appended at the end of the collection, None if no element was appended"""
+    changed:Union[List[int], None] = None
+    """Indices of the elements changed in place, their new value being read in the full value, None if no element changed"""
+
+    @property
+    def empty(self) -> bool:
+        return self.appended is None and not self.changed
+
+
+def array_delta(old:Any, new:Any) -> Union[Delta, None]:
+    """Returns the change between two arrays along their first axis
+
+    Parameters
+    ----------
+    old : Any
+        Previous value
+    new : Any
+        New value
+
+    Returns
+    -------
+    Union[Delta, None]
+        Appended elements and indices of the changed elements, None if the new value isn't the old one
+        with changed or appended elements (removed elements, different element shape)
+    """
+    if not isinstance(old, np.ndarray) or not isinstance(new, np.ndarray):
+        return None
+    if old.ndim == 0 or old.ndim != new.ndim or old.shape[1:] != new.shape[1:] or len(new) < len(old):
+        return None
+
+    kept = new[:len(old)]
+    different = (kept != old).reshape(len(old), -1).any(axis=1)
+    changed = np.flatnonzero(different).tolist()
+
+    return Delta(
+                    appended=new[len(old):] if len(new) > len(old) else None,
+                    changed=changed if changed else None,
+                )
@@ -0,0 +1,169 @@
+""" JSON encoding of the node values, using orjson when it is installed
+"""
+import datetime
+import json
+from typing import Any, Callable, Dict, Type, Union
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_converters:Dict[Type, Callable[[Any], Any]] = {}
+
+_TYPED_ARRAY_DTYPES = {np.dtype(name) for name in ["bool", "int8", "int16", "int32", "uint8", "uint16", "uint32", "float32", "float64"]}
+"""Array dtypes matching a JavaScript typed array, sent as binary buffers to the browser"""
+
+
+def register_type(value_type:Type, converter:Callable[[Any], Any]):
+    """Registers the conversion of the values of a type to JSON serializable values, used by dumps and JSONEncoderToString
+
+    Parameters
+    ----------
+    value_type : Type
+        Converted type, its subclasses being converted as well
+    converter : Callable[[Any], Any]
+        Function returning a JSON serializable value, that can contain NumPy arrays, for a value of the type
+    """
+    _converters[value_type] = converter
+
+
+def _convert(obj:Any) -> Any:
+    """Returns a JSON serializable value for the objects the encoders don't handle natively"""
+    for value_type, converter in _converters.items():
+        if isinstance(obj, value_type):
+            return converter(obj)
+
+    if isinstance(obj, np.integer):
+        return int(obj)
+    elif isinstance(obj, np.floating):
+        return float(obj)
+    elif isinstance(obj, np.bool_):
+        return bool(obj)
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    elif isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    elif isinstance(obj, (set, frozenset)):
+        return list(obj)
+
+    # pandas is not a dependency, DataFrames and Series are recognized by their module
+    if type(obj).__module__.startswith("pandas"):
+        if hasattr(obj, "columns"):
+            return {str(column): obj[column].to_numpy() for column in obj.columns}
+        if hasattr(obj, "to_numpy"):
+            return obj.to_numpy()
+        if hasattr(obj, "isoformat"):
+            return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JSONEncoderToString(json.JSONEncoder):
+    """ Special json encoder for numpy types and datetimes """
+    def default(self, obj):
+        if isinstance(obj, tuple) and isinstance(obj[0], datetime.date):
+            return [e.isoformat() for e in obj]
+        try:
+            return _convert(obj)
+        except TypeError:
+            return json.JSONEncoder.default(self, obj)
+
+
+def _finite(value:Any) -> Any:
+    """Returns the value with its NaN and infinite floats replaced by None, as orjson encodes them"""
+    if isinstance(value, float):
+        return value if np.isfinite(value) else None
+    elif isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    elif isinstance(value, np.ndarray) and value.dtype.kind in "fc":
+        return _finite(value.tolist())
+    return value
+
+
+class _FiniteJSONEncoder(JSONEncoderToString):
+    """ JSONEncoderToString encoding the non finite floats of the converted values as null """
+    def default(self, obj):
+        return _finite(super().default(obj))
+
+
+def dumps(value:Any) -> str:
+    """Encodes a node value in JSON. With orjson, NumPy arrays, numbers and datetimes are serialized natively,
+    otherwise the value is encoded with JSONEncoderToString. NaN and infinite values are encoded as null with both 
+    encoders, the text being valid JSON.
+
+    Parameters
+    ----------
+    value : Any
+        Encoded value
+
+    Returns
+    -------
+    str
+        JSON text
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_convert, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(_finite(value), cls=_FiniteJSONEncoder, separators=(",", ":"), allow_nan=False)
+
+
+def loads(text:str) -> Any:
+    """Decodes a JSON text, with orjson when it is installed
+
+    Parameters
+    ----------
+    text : str
+        JSON text
+
+    Returns
+    -------
+    Any
+        Decoded value
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def typed_array(values:Union[np.ndarray, Any]) -> np.ndarray:
+    """Returns a contiguous array whose dtype matches a JavaScript typed array. Such arrays are sent to the browser 
+    as binary buffers along the json of the ESMEvent messages, other arrays being converted to json lists.
+
+    Parameters
+    ----------
+    values : Union[np.ndarray, Any]
+        Numeric array, or values convertible to an array
+
+    Returns
+    -------
+    np.ndarray
+        Array of a typed array dtype: 64 bits integers are converted to int32 or uint32 if they fit, float16 to 
+        float32 and the other floats to float64
+
+    Raises
+    ------
+    ValueError
+        Non numeric array, or 64 bits integers out of the 32 bits integers range
+    """
+    array = np.asarray(values)
+    if not array.dtype in _TYPED_ARRAY_DTYPES:
+        if array.dtype.kind == "f" and array.dtype.itemsize < 4:
+            array = array.astype(np.float32)
+        elif array.dtype.kind in "iu":
+            # Bokeh has no binary encoding of the 64 bits integers, converting them to float64 would lose precision
+            for dtype in (np.int32, np.uint32):
+                limits = np.iinfo(dtype)
+                if array.size == 0 or (array.min() >= limits.min and array.max() <= limits.max):
+                    array = array.astype(dtype)
+                    break
+            else:
+                raise ValueError(f"Array of dtype {array.dtype} has values out of the 32 bits integers range, "
+                                 "it can't be sent as a typed array without loss of precision: convert it to float64.")
+        elif array.dtype.kind == "f":
+            array = array.astype(np.float64)
+        else:
+            raise ValueError(f"Array of dtype {array.dtype} can't be sent as a typed array.")
+    return np.ascontiguousarray(array)
@@ -1,11 +1,32 @@
+from typing import Any, Dict
+
+
+def _slots_values(change:Any) -> Dict[str, Any]:
+    """Returns the value of the slots of a change, in their declaration order"""
+    return {slot: getattr(change, slot) for cls in reversed(type(change).__mro__) for slot in getattr(cls, "__slots__", ())}
 
 class NodeChange:
     """Class defining any node change occuring in the graph."""
+    __slots__ = ("node_name",)
+
     def __init__(self, name:str):
         self.node_name = name
+        """Changed node name"""
+
+    def to_dict(self, ) -> Dict[str, Any]:
+        """Returns the change properties
+
+        Returns
+        -------
+        Dict[str, Any]
+            Value of each change attribute
+        """
+        return _slots_values(self)
 
 class NodeCreation(NodeChange):
     """Class defining a node creation."""
+    __slots__ = ()
+
     def __init__(self, name:str):
         """Class defining a node creation.
 
@@ -21,6 +42,8 @@ class NodeCreation(NodeChange):
 
 class NodeDeletion(NodeChange):
     """Class defining a node deletion."""
+    __slots__ = ()
+
     def __init__(self, name:str):
         """Class defining a node deletion.
 
@@ -36,6 +59,8 @@ class NodeDeletion(NodeChange):
 
 class NodeMove(NodeChange):
     """Class defining a node movement."""
+    __slots__ = ("new_x", "new_y", "old_x", "old_y")
+
     def __init__(self, name:str, new_x:float, new_y:float, old_x:float, old_y:float):
         """Description of a node movement.
 
@@ -67,6 +92,8 @@ class NodeMove(NodeChange):
 
 class NodeSelected(NodeChange):
     """Class defining a node selection."""
+    __slots__ = ()
+
     def __init__(self, name:str):
         """Class defining a node selection.
 
@@ -82,6 +109,8 @@ class NodeSelected(NodeChange):
 
 class NodeDeselected(NodeChange):
     """Class defining a node deselection."""
+    __slots__ = ()
+
     def __init__(self, name:str):
         """Class defining a node deselection.
 
@@ -97,6 +126,8 @@ class NodeDeselected(NodeChange):
 
 class EdgeChange:
     """Class defining any edge change occuring in the graph."""
+    __slots__ = ("source", "source_handle", "target", "target_handle")
+
     def __init__(self, source:str, source_handle:str, target:str, target_handle:str):
         """Class defining any edge change occuring in the graph.
 
@@ -120,8 +151,20 @@ class EdgeChange:
         self.target_handle = target_handle
         """Plugged port name in the target node"""
 
+    def to_dict(self, ) -> Dict[str, Any]:
+        """Returns the change properties
+
+        Returns
+        -------
+        Dict[str, Any]
+            Value of each change attribute
+        """
+        return _slots_values(self)
+
 class EdgeCreation(EdgeChange):
     """Class defining a edge creation."""
+    __slots__ = ()
+
     def __init__(self, source:str, source_handle:str, target:str, target_handle:str):
         """Class defining a edge creation.
 
@@ -143,6 +186,8 @@ class EdgeCreation(EdgeChange):
 
 class EdgeDeletion(EdgeChange):
     """Class defining a edge deletion."""
+    __slots__ = ()
+
     def __init__(self, source:str, source_handle:str, target:str, target_handle:str):
         """Class defining a edge deletion.
 
@@ -164,6 +209,8 @@ class EdgeDeletion(EdgeChange):
 
 class EdgeSelected(EdgeChange):
     """Class defining a edge selection."""
+    __slots__ = ()
+
     def __init__(self, source:str, source_handle:str, target:str, target_handle:str):
         """Class defining a edge selection.
 
@@ -185,6 +232,8 @@ class EdgeSelected(EdgeChange):
 
 class EdgeDeselected(EdgeChange):
     """Class defining a edge deselection."""
+    __slots__ = ()
+
     def __init__(self, source:str, source_handle:str, target:str, target_handle:str):
         """Class defining a edge deselection.
 
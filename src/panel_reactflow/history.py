@@ -0,0 +1,292 @@
+""" Undo/redo history of the graph edits
+"""
+from collections import Counter, deque
+from dataclasses import dataclass
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Tuple, Union
+
+import param
+from panel.custom import ESMEvent
+
+from panel_reactflow.api import Edge, Node, ReactFlowNode, stateful_widgets
+from panel_reactflow.events import NodeChange, NodeCreation, NodeDeletion, NodeMove, EdgeChange, EdgeCreation, EdgeDeletion
+
+if TYPE_CHECKING:
+    from panel_reactflow.reactflow import ReactFlowGraph
+
+_RUNTIME_KEYS = {"id", "type", "position", "data", "selected", "dragging", "measured"}
+"""Reactflow node properties that are not given by react_props"""
+
+Operation = Tuple[Any, ...]
+"""Operation applied to the graph, such as ("move", node name, x, y)"""
+
+_PHASES = {"restore":0, "add_edge":1, "move":2, "value":2, "remove_edge":3, "delete":4}
+"""Order in which the operations of a step are applied : the nodes exist before their edges are plugged"""
+
+
+@dataclass
+class HistoryStep:
+    """Edit undone or redone at once, such as the changes of a graph sync or successive value changes of a widget."""
+    operations:List[Tuple[Operation, Operation]]
+    """Operation and inverse operation of each change, in the order they were applied"""
+    key:Union[Tuple[Any, ...], None]
+    """Successive steps with the same key are merged (node drag, typing in a widget), None for the steps that are never merged"""
+    time:float
+    """monotonic time of the last change of the step"""
+
+
+def _change_key(change:Union[NodeChange, EdgeChange]) -> Tuple[Any, ...]:
+    if isinstance(change, NodeMove):
+        return ("NodeMove", change.node_name, change.new_x, change.new_y)
+    return (type(change).__name__,) + tuple(change.to_dict().values())
+
+
+class History:
+    def __init__(self, graph:"ReactFlowGraph", max_steps:int = 100, merge_interval:float = 1.):
+        """Records the edits of a graph as operations with their inverse operation: node creations and deletions, moves,
+        edge creations and deletions, and value changes of the nodes widgets. Each step only stores the changed elements,
+        so that the memory grows with the edits and not with the graph size.
+
+        Parameters
+        ----------
+        graph : ReactFlowGraph
+            Recorded graph
+        max_steps : int, optional
+            Number of steps that can be undone, by default 100
+        merge_interval : float, optional
+            Successive moves of the same nodes or value changes of the same widget closer than this interval in seconds
+            are undone at once, by default 1.
+        """
+        self.graph = graph
+        """Recorded graph"""
+        self.merge_interval:float = merge_interval
+        """Maximum interval in seconds between two merged steps"""
+        self.undo_steps:Deque[HistoryStep] = deque(maxlen=max_steps)
+        """Steps that can be undone, the last one first"""
+        self.redo_steps:List[HistoryStep] = []
+        """Undone steps that can be redone, the last one first"""
+
+        self._instances:Dict[str, ReactFlowNode] = {}
+        self._watched:set = set()
+        # Changes expected in the syncs, by mark of the operations producing them
+        self._expected:Dict[int, Counter] = {}
+        self._mark:int = 0
+        self._applying:bool = False
+
+    @property
+    def can_undo(self) -> bool:
+        return len(self.undo_steps) > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return len(self.redo_steps) > 0
+
+    def clear(self, ):
+        """Forgets the recorded steps.
+        """
+        self.undo_steps.clear()
+        self.redo_steps.clear()
+
+    def track_node(self, name:str, node:ReactFlowNode):
+        """Registers a node added to the graph, watching the value of the widgets stored in its attributes
+
+        Parameters
+        ----------
+        name : str
+            Node name
+        node : ReactFlowNode
+            Node instance
+        """
+        self._instances[name] = node
+        if id(node) in self._watched:
+            return
+        self._watched.add(id(node))
+
+        for widget in stateful_widgets(node).values():
+            widget.param.watch(self._record_value, "value")
+
+    def expect(self, changes:List[Union[NodeChange, EdgeChange]]):
+        """Declares graph changes that will be found in a sync without being edits, such as the synchronization
+        of the initial graph or of the undone operations. The expectations are kept until end_expectations is 
+        called and the views acknowledged the operations, so that changes never echoed don't hide later edits.
+
+        Parameters
+        ----------
+        changes : List[Union[NodeChange, EdgeChange]]
+            Expected changes
+        """
+        self._expected.setdefault(self._mark, Counter()).update(_change_key(change) for change in changes)
+
+    def end_expectations(self, ):
+        """Closes the expectations declared since the last call. In the graphs whose state is set by python, the changes 
+        were already synchronized and the remaining expectations are dropped. Otherwise, the views are asked to acknowledge 
+        the operations once they synchronized their result, the expectations being dropped by synced.
+        """
+        mark = self._mark
+        self._mark += 1
+        if not mark in self._expected:
+            return
+
+        if self.graph._python_owned:
+            del self._expected[mark]
+        else:
+            self.graph._send_event(ESMEvent, data={"action":"SyncMark", "mark":mark})
+
+    def synced(self, mark:int):
+        """Drops the expectations of the operations acknowledged by a view: their changes were synchronized or dropped by the view
+
+        Parameters
+        ----------
+        mark : int
+            Mark of the last acknowledged operations
+        """
+        for acknowledged in [m for m in self._expected if m <= mark]:
+            del self._expected[acknowledged]
+
+    def _consume(self, key:Tuple[Any, ...]) -> bool:
+        """Returns whether the change is expected, removing it from the expectations"""
+        for mark, expected in self._expected.items():
+            if expected[key] > 0:
+                expected[key] -= 1
+                if expected.total() == 0:
+                    del self._expected[mark]
+                return True
+        return False
+
+    def _push(self, step:HistoryStep):
+        previous = self.undo_steps[-1] if self.undo_steps else None
+        if previous is not None and step.key is not None and previous.key == step.key and step.time - previous.time <= self.merge_interval:
+            # Keeping the first inverse operations and the last operations
+            previous.operations = [(operation, inverse) for (operation, _), (_, inverse) in zip(step.operations, previous.operations, strict=True)]
+            previous.time = step.time
+        else:
+            self.undo_steps.append(step)
+        self.redo_steps.clear()
+
+    def _record_value(self, event:param.parameterized.Event):
+        if self._applying or not self.graph.track_history:
+            return
+        widget = event.obj
+        self._push(HistoryStep([(("value", widget, event.new), ("value", widget, event.old))], ("value", id(widget)), monotonic()))
+
+    def record(self, changes:List[Union[NodeChange, EdgeChange]]):
+        """Records the changes found in a graph sync as a single step
+
+        Parameters
+        ----------
+        changes : List[Union[NodeChange, EdgeChange]]
+            Node and edge changes of the sync
+        """
+        operations:List[Tuple[Operation, Operation]] = []
+        new_nodes:Union[Dict[str, Any], None] = None
+
+        for change in changes:
+            if not isinstance(change, (NodeCreation, NodeDeletion, NodeMove, EdgeCreation, EdgeDeletion)):
+                continue
+
+            if self._consume(_change_key(change)):
+                continue
+
+            if isinstance(change, NodeCreation):
+                if new_nodes is None:
+                    new_nodes = {n["id"]: n for n in self.graph.nodes}
+                restore = ("restore", change.node_name, self._instances.get(change.node_name), new_nodes[change.node_name])
+                operations.append((restore, ("delete", change.node_name)))
+            elif isinstance(change, NodeDeletion):
+                restore = ("restore", change.node_name, self._instances.pop(change.node_name, None), self.graph.old_nodes[change.node_name])
+                operations.append((("delete", change.node_name), restore))
+            elif isinstance(change, NodeMove):
+                operations.append((("move", change.node_name, change.new_x, change.new_y), ("move", change.node_name, change.old_x, change.old_y)))
+            else:
+                edge = Edge(change.source, change.source_handle, change.target, change.target_handle)
+                if isinstance(change, EdgeCreation):
+                    operations.append((("add_edge", edge), ("remove_edge", edge)))
+                else:
+                    operations.append((("remove_edge", edge), ("add_edge", edge)))
+
+        if not operations:
+            return
+
+        key = None
+        if all(operation[0] == "move" for operation, _ in operations):
+            # Syncs of a drag are merged
+            operations.sort(key=lambda pair: pair[0][1])
+            key = ("move",) + tuple(operation[1] for operation, _ in operations)
+        self._push(HistoryStep(operations, key, monotonic()))
+
+    def undo(self, ):
+        """Undoes the last step.
+        """
+        if not self.undo_steps:
+            return
+        step = self.undo_steps.pop()
+        self._apply([inverse for _, inverse in reversed(step.operations)])
+        self.redo_steps.append(step)
+
+    def redo(self, ):
+        """Redoes the last undone step.
+        """
+        if not self.redo_steps:
+            return
+        step = self.redo_steps.pop()
+        self._apply([operation for operation, _ in step.operations])
+        self.undo_steps.append(step)
+
+    def _apply(self, operations:List[Operation]):
+        graph = self.graph
+        self._applying = True
+        try:
+            for operation in sorted(operations, key=lambda operation: _PHASES[operation[0]]):
+                kind = operation[0]
+
+                if kind == "restore":
+                    _, name, instance, node_dict = operation
+                    if name in graph.item_names:
+                        # Node deleted in the browser, whose instance was kept: it is removed without triggering on_node_deleted
+                        graph._remove_nodes([name])
+                    self.expect([NodeCreation(name)])
+                    graph.add_node(Node(
+                                            name,
+                                            instance,
+                                            node_dict["position"]["x"],
+                                            node_dict["position"]["y"],
+                                            react_props={k: v for k, v in node_dict.items() if not k in _RUNTIME_KEYS},
+                                            is_parent=node_dict.get("type") == "group",
+                                        ))
+
+                elif kind == "delete":
+                    _, name = operation
+                    plugged = [e for e in graph.get_edges() if e.source == name or e.target == name]
+                    if plugged:
+                        self.expect([EdgeDeletion(e.source, e.source_handle, e.target, e.target_handle) for e in plugged])
+                        graph.remove_edges(plugged)
+                    self.expect([NodeDeletion(name)])
+                    graph.remove_nodes([name])
+                    self._instances.pop(name, None)
+
+                elif kind == "move":
+                    _, name, x, y = operation
+                    self.expect([NodeMove(name, x, y, x, y)])
+                    graph._move_nodes({name: (x, y)})
+
+                elif kind == "add_edge":
+                    edge = operation[1]
+                    if edge in graph.get_edges():
+                        continue
+                    self.expect([EdgeCreation(edge.source, edge.source_handle, edge.target, edge.target_handle)])
+                    graph.add_edges([edge])
+
+                elif kind == "remove_edge":
+                    edge = operation[1]
+                    # Edges plugged to a deleted node are removed with it
+                    if not edge in graph.get_edges():
+                        continue
+                    self.expect([EdgeDeletion(edge.source, edge.source_handle, edge.target, edge.target_handle)])
+                    graph.remove_edges([edge])
+
+                elif kind == "value":
+                    _, widget, value = operation
+                    widget.value = value
+        finally:
+            self._applying = False
+            self.end_expectations()
@@ -0,0 +1,396 @@
+""" Append-only journal of the graph edits, replayed to recover the graph after a restart
+"""
+import base64
+import importlib
+import os
+import threading
+from pathlib import Path
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Dict, List, Set, Tuple, Type, Union
+
+import numpy as np
+import panel as pn
+import param
+
+from panel_reactflow.api import Edge, Node, ReactFlowNode, stateful_widgets
+from panel_reactflow.encoding import dumps, loads
+from panel_reactflow.events import NodeChange, NodeCreation, NodeDeletion, NodeMove, EdgeChange, EdgeCreation, EdgeDeletion
+
+if TYPE_CHECKING:
+    from panel_reactflow.reactflow import ReactFlowGraph
+
+_RUNTIME_KEYS = {"id", "type", "position", "data", "selected", "dragging", "measured"}
+"""Reactflow node properties that are not given by react_props"""
+
+
+def _dump_value(widget:pn.widgets.Widget) -> Union[Dict[str, Any], None]:
+    """Returns the json serializable value of a widget, None if the value can't be journaled"""
+    value = widget.value
+    if isinstance(value, np.ndarray):
+        return {"array":value}
+    if isinstance(value, (bytes, bytearray)):
+        # File contents
+        return {"bytes":base64.b64encode(value).decode("ascii")}
+    try:
+        serialized = widget.param.serialize_value("value")
+        dumps(serialized)
+    except (TypeError, ValueError):
+        return None
+    return {"json":serialized}
+
+def _load_value(widget:pn.widgets.Widget, value:Dict[str, Any]):
+    """Sets the value of a widget from its journaled value, unchanged values being skipped"""
+    if "array" in value:
+        array = np.asarray(value["array"])
+        if not (isinstance(widget.value, np.ndarray) and np.array_equal(widget.value, array)):
+            widget.value = array
+    elif "bytes" in value:
+        content = base64.b64decode(value["bytes"])
+        if widget.value != content:
+            widget.value = content
+    else:
+        if widget.param.serialize_value("value") != value["json"]:
+            widget.value = widget.param.deserialize_value("value", value["json"])
+
+
+class Journal:
+    def __init__(self,
+                    graph:"ReactFlowGraph",
+                    path:Union[str, Path],
+                    sync_every:int = 100,
+                    sync_interval:float = 1.,
+                    compact_every:int = 10000):
+        """Appends the graph edits to a json lines file: node creations and deletions, moves, edge creations and deletions
+        and value changes of the nodes widgets. The journal is periodically compacted in a snapshot of the graph,
+        the graph being recovered from the snapshot and the following journal entries.
+
+        The entries are flushed to the disk at the latest sync_interval seconds after being written, by a timer thread, 
+        and the journal is closed when the session that created it is destroyed. Only the widgets holding the nodes state 
+        are journaled (see ReactFlowNode.state_widgets), and not if their value is neither json serializable, an array nor bytes.
+
+        Parameters
+        ----------
+        graph : ReactFlowGraph
+            Journaled graph
+        path : Union[str, Path]
+            Journal file path, the snapshot being stored next to it with the .snapshot suffix
+        sync_every : int, optional
+            Number of entries after which the journal is flushed to the disk, by default 100
+        sync_interval : float, optional
+            Maximum time in seconds between an entry and its flush to the disk, by default 1.
+        compact_every : int, optional
+            Number of entries after which the journal is compacted in a snapshot, by default 10000
+        """
+        self.graph = graph
+        """Journaled graph"""
+        self.path:Path = Path(path)
+        """Journal file path"""
+        self.snapshot_path:Path = self.path.with_name(self.path.name + ".snapshot")
+        """Snapshot file path"""
+        self.sync_every:int = sync_every
+        """Number of entries after which the journal is flushed to the disk"""
+        self.sync_interval:float = sync_interval
+        """Maximum time in seconds between an entry and its flush to the disk"""
+        self.compact_every:int = compact_every
+        """Number of entries after which the journal is compacted in a snapshot"""
+        self.seq:int = 0
+        """Sequence number of the last entry"""
+
+        self._file = None
+        self._started:bool = False
+        self._unsynced:int = 0
+        self._last_sync:float = monotonic()
+        self._entries_since_snapshot:int = 0
+        self._watched:set = set()
+        self._live:Dict[str, ReactFlowNode] = {}
+        # Nodes and edges of the journaled graph, whose creations synchronized later by the views are not journaled again
+        self._journaled_nodes:Set[str] = set()
+        self._journaled_edges:Set[Tuple[str, str, str, str]] = set()
+        # The timer thread flushes the file while the entries are written
+        self._lock = threading.RLock()
+        self._timer:Union[threading.Timer, None] = None
+
+        if pn.state.curdoc is not None and pn.state.curdoc.session_context is not None:
+            pn.state.on_session_destroyed(lambda _: self.close())
+
+    def _node_class(self, record:Dict[str, Any]) -> Type[ReactFlowNode]:
+        """Returns the class of a journaled node, looked up in the graph classes or imported"""
+        if record["class"] in self.graph.nodes_classes_by_name:
+            return self.graph.nodes_classes_by_name[record["class"]]
+
+        module, _, qualname = record["path"].partition(":")
+        try:
+            node_class = importlib.import_module(module)
+            for attribute in qualname.split("."):
+                node_class = getattr(node_class, attribute)
+        except (ImportError, AttributeError) as err:
+            raise ValueError(f"Journaled node {record['name']} class {record['path']} is not in the graph classes and can't be imported.") from err
+        return node_class
+
+    def read(self, ) -> Union[Tuple[List[Node], List[Edge]], None]:
+        """Replays the snapshot and the journal entries following it
+
+        Returns
+        -------
+        Union[Tuple[List[Node], List[Edge]], None]
+            Nodes, with their widgets values, and edges of the recovered graph, None if there is nothing to recover
+        """
+        if not self.snapshot_path.exists() and not self.path.exists():
+            return None
+
+        nodes:Dict[str, Dict[str, Any]] = {}
+        edges:Dict[Tuple[str, str, str, str], None] = {}
+        snapshot_seq = 0
+
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = loads(f.read())
+            snapshot_seq = snapshot["seq"]
+            nodes = {record["name"]: record for record in snapshot["nodes"]}
+            edges = dict.fromkeys(tuple(edge) for edge in snapshot["edges"])
+        self.seq = snapshot_seq
+
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = loads(line)
+                    except ValueError:
+                        # Entry interrupted by the crash
+                        break
+                    self.seq = max(self.seq, entry["seq"])
+                    # Entries already compacted in the snapshot
+                    if entry["seq"] <= snapshot_seq:
+                        continue
+
+                    op = entry["op"]
+                    if op == "add_node":
+                        nodes[entry["node"]["name"]] = entry["node"]
+                    elif op == "remove_nodes":
+                        removed = set(entry["ids"])
+                        for name in removed:
+                            nodes.pop(name, None)
+                        edges = dict.fromkeys(e for e in edges if not (e[0] in removed or e[2] in removed))
+                    elif op == "move":
+                        for name, position in entry["positions"].items():
+                            if name in nodes:
+                                nodes[name]["position"] = position
+                    elif op == "add_edges":
+                        edges.update(dict.fromkeys(tuple(edge) for edge in entry["edges"]))
+                    elif op == "remove_edges":
+                        for edge in entry["edges"]:
+                            edges.pop(tuple(edge), None)
+                    elif op == "value":
+                        if entry["node"] in nodes:
+                            nodes[entry["node"]].setdefault("values", {})[entry["widget"]] = entry["value"]
+
+        recovered:List[Node] = []
+        for name, record in nodes.items():
+            instance = self._node_class(record)()
+            widgets = stateful_widgets(instance)
+            for attribute, value in record.get("values", {}).items():
+                if attribute in widgets:
+                    _load_value(widgets[attribute], value)
+            recovered.append(Node(name, instance, record["position"]["x"], record["position"]["y"],
+                                    react_props=record.get("react_props", {}), is_parent=record.get("is_parent", False)))
+
+        return recovered, [Edge(*edge) for edge in edges if edge[0] in nodes and edge[2] in nodes]
+
+    def _node_record(self, node:ReactFlowNode, node_dict:Dict[str, Any]) -> Dict[str, Any]:
+        """Returns the journaled description of a node from its reactflow dictionnary"""
+        return {
+                    "name":node_dict["id"],
+                    "class":node.node_class_name,
+                    "path":f"{type(node).__module__}:{type(node).__qualname__}",
+                    "position":node_dict["position"],
+                    "react_props":{k: v for k, v in node_dict.items() if not k in _RUNTIME_KEYS},
+                    "is_parent":node_dict.get("type") == "group",
+                    "values":{
+                                attribute: value for attribute, value in 
+                                ((attribute, _dump_value(widget)) for attribute, widget in stateful_widgets(node).items())
+                                if value is not None
+                            },
+                }
+
+    def snapshot(self, nodes:Union[List[Node], None] = None, edges:Union[List[Edge], None] = None):
+        """Writes a snapshot of the graph and truncates the journal. The snapshot is written next to the previous one
+        then renamed, so that a crash during the compaction leaves the previous snapshot and journal.
+
+        Parameters
+        ----------
+        nodes : Union[List[Node], None], optional
+            Nodes of the graph, by default the nodes as last synchronized
+        edges : Union[List[Edge], None], optional
+            Edges of the graph, by default the edges as last synchronized
+        """
+        graph = self.graph
+        if nodes is None:
+            instances = dict(zip(graph.item_names, graph.nodes_instances, strict=True))
+            records = [self._node_record(instances[n["id"]], n) for n in graph.nodes if n["id"] in instances]
+        else:
+            records = [self._node_record(node.node, node.to_reactflow()) for node in nodes]
+        if edges is None:
+            edges = graph.get_edges()
+
+        snapshot = {
+            "seq":self.seq,
+            "nodes":records,
+            "edges":[[e.source, e.source_handle, e.target, e.target_handle] for e in edges],
+        }
+
+        temporary_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        with self._lock:
+            with open(temporary_path, "w", encoding="utf-8") as f:
+                f.write(dumps(snapshot))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary_path, self.snapshot_path)
+
+            # Entries older than the snapshot are skipped by the recovery if the truncation doesn't happen
+            if self._file is not None:
+                self._file.close()
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._started = True
+            self._unsynced = 0
+            self._entries_since_snapshot = 0
+            self._journaled_nodes = {record["name"] for record in records}
+            self._journaled_edges = {tuple(edge) for edge in snapshot["edges"]}
+
+    def append(self, entry:Dict[str, Any]):
+        """Appends an entry to the journal, flushing the journal to the disk every sync_every entries, 
+        and at the latest sync_interval seconds after the entry
+
+        Parameters
+        ----------
+        entry : Dict[str, Any]
+            Journal entry
+        """
+        # Journaling starts with the first snapshot, written once the graph is built
+        if not self._started:
+            return
+
+        with self._lock:
+            if self._file is None:
+                # Closed with its session, while the graph is still edited (shared graph)
+                self._file = open(self.path, "a", encoding="utf-8")
+
+            self.seq += 1
+            self._file.write(dumps({"seq":self.seq, **entry}) + "\n")
+            self._unsynced += 1
+            self._entries_since_snapshot += 1
+
+            if self._entries_since_snapshot >= self.compact_every:
+                self.snapshot()
+            elif self._unsynced >= self.sync_every or monotonic() - self._last_sync >= self.sync_interval:
+                self.sync()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.sync_interval, self._timed_sync)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _timed_sync(self, ):
+        """Timer callback, flushing the entries written since the last sync"""
+        with self._lock:
+            self._timer = None
+            self.sync()
+
+    def sync(self, ):
+        """Flushes the journal entries to the disk.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._file is not None and self._unsynced:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            self._unsynced = 0
+            self._last_sync = monotonic()
+
+    def close(self, ):
+        """Flushes and closes the journal file. Entries appended afterwards reopen it.
+        """
+        with self._lock:
+            self.sync()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def track_node(self, node:ReactFlowNode):
+        """Journals the value changes of the widgets stored in the node attributes
+
+        Parameters
+        ----------
+        node : ReactFlowNode
+            Node added to the graph
+        """
+        self._live[node.name] = node
+        if id(node) in self._watched:
+            return
+        self._watched.add(id(node))
+
+        for attribute, widget in stateful_widgets(node).items():
+            widget.param.watch(lambda event, attribute=attribute, node=node: self._record_value(node, attribute, event), "value")
+
+    def _record_value(self, node:ReactFlowNode, attribute:str, event:param.parameterized.Event):
+        if self._live.get(node.name) is not node:
+            return
+        value = _dump_value(event.obj)
+        if value is not None:
+            self.append({"op":"value", "node":node.name, "widget":attribute, "value":value})
+
+    def record(self, changes:List[Union[NodeChange, EdgeChange]]):
+        """Journals the changes found in a graph sync
+
+        Parameters
+        ----------
+        changes : List[Union[NodeChange, EdgeChange]]
+            Node and edge changes of the sync
+        """
+        created:List[str] = []
+        deleted:List[str] = []
+        positions:Dict[str, Dict[str, float]] = {}
+        added_edges:List[List[str]] = []
+        removed_edges:List[List[str]] = []
+
+        for change in changes:
+            if isinstance(change, NodeCreation):
+                # Nodes of the snapshot, synchronized by the views after it
+                if not change.node_name in self._journaled_nodes:
+                    created.append(change.node_name)
+            elif isinstance(change, NodeDeletion):
+                deleted.append(change.node_name)
+                self._journaled_nodes.discard(change.node_name)
+                # Restored nodes are tracked again when added back
+                self._live.pop(change.node_name, None)
+            elif isinstance(change, NodeMove):
+                positions[change.node_name] = {"x":change.new_x, "y":change.new_y}
+            elif isinstance(change, EdgeCreation):
+                edge = (change.source, change.source_handle, change.target, change.target_handle)
+                if not edge in self._journaled_edges:
+                    self._journaled_edges.add(edge)
+                    added_edges.append(list(edge))
+            elif isinstance(change, EdgeDeletion):
+                edge = (change.source, change.source_handle, change.target, change.target_handle)
+                self._journaled_edges.discard(edge)
+                removed_edges.append(list(edge))
+
+        if created:
+            graph = self.graph
+            instances = dict(zip(graph.item_names, graph.nodes_instances, strict=True))
+            node_dicts = {n["id"]: n for n in graph.nodes}
+            for name in created:
+                if name in instances:
+                    self._journaled_nodes.add(name)
+                    self.append({"op":"add_node", "node":self._node_record(instances[name], node_dicts[name])})
+        if removed_edges:
+            self.append({"op":"remove_edges", "edges":removed_edges})
+        if deleted:
+            # The replay removes the edges of the removed nodes
+            removed = set(deleted)
+            self._journaled_edges = {edge for edge in self._journaled_edges if not (edge[0] in removed or edge[2] in removed)}
+            self.append({"op":"remove_nodes", "ids":deleted})
+        if positions:
+            self.append({"op":"move", "positions":positions})
+        if added_edges:
+            self.append({"op":"add_edges", "edges":added_edges})
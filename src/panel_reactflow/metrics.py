@@ -0,0 +1,264 @@
+""" Counters of the traffic exchanged between a ReactFlowGraph and the browser
+"""
+from collections import deque
+from dataclasses import dataclass
+import json
+from time import monotonic
+from typing import Any, Deque, Dict, List, Tuple
+import weakref
+
+import numpy as np
+import panel as pn
+
+
+@dataclass
+class TrafficCounter:
+    """Number of messages and bytes exchanged in one direction."""
+    messages:int = 0
+    """Number of messages"""
+    bytes:int = 0
+    """Total size of the messages in bytes, estimated from the sampled messages"""
+    sampled_size:int = 0
+    """Size in bytes of the last measured message"""
+
+
+def payload_size(value:Any) -> int:
+    """Returns the size of a value once serialized in compact json
+
+    Parameters
+    ----------
+    value : Any
+        Synchronized value
+
+    Returns
+    -------
+    int
+        Size in bytes
+    """
+    # NumPy arrays are sent as binary buffers, counted with their size in memory
+    buffers:List[int] = []
+    def default(obj:Any) -> Any:
+        if isinstance(obj, np.ndarray):
+            buffers.append(obj.nbytes)
+            return None
+        return str(obj)
+
+    try:
+        return len(json.dumps(value, separators=(",", ":"), default=default).encode()) + sum(buffers)
+    except (TypeError, ValueError):
+        return 0
+
+
+class SyncMetrics:
+    def __init__(self, name:str = "", max_samples:int = 10000, sample_every:int = 10):
+        """Counts the messages and bytes exchanged by a ReactFlowGraph: parameters syncs in both directions,
+        events sent with _send_event, messages received from model.send_msg and the graph changes found in each sync.
+
+        The sizes are measured by serializing the messages again in json, which costs about as much as their sync: 
+        only one message in sample_every of each counter is measured, the others being counted with the last measured size.
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the graph, by default ""
+        max_samples : int, optional
+            Number of message timestamps and diff sizes kept in memory, by default 10000
+        sample_every : int, optional
+            Number of messages of a counter per measured message, 1 to measure all the messages, by default 10
+        """
+        self.name:str = name
+        """Name of the graph"""
+        self.sample_every:int = sample_every
+        """Number of messages of a counter per measured message"""
+        self.params_sent:Dict[str, TrafficCounter] = {}
+        """Parameters syncs from Python to the browser, for each parameter name"""
+        self.params_received:Dict[str, TrafficCounter] = {}
+        """Parameters syncs from the browser to Python, for each parameter name"""
+        self.events_sent:Dict[str, TrafficCounter] = {}
+        """Events sent to the browser, for each action"""
+        self.messages_received:Dict[str, TrafficCounter] = {}
+        """Messages received from the browser, for each action"""
+        self.changes:Dict[str, int] = {}
+        """Number of graph changes found in the syncs, for each change type"""
+        self.diff_sizes:Deque[int] = deque(maxlen=max_samples)
+        """Number of graph changes found in each of the last nodes/edges syncs"""
+
+        self._timestamps:Deque[float] = deque(maxlen=max_samples)
+
+    def reset(self, ):
+        """Clears the counters.
+        """
+        for counters in (self.params_sent, self.params_received, self.events_sent, self.messages_received, self.changes):
+            counters.clear()
+        self.diff_sizes.clear()
+        self._timestamps.clear()
+
+    def _record(self, counters:Dict[str, TrafficCounter], key:str, value:Any, measure:bool = True):
+        counter = counters.get(key)
+        if counter is None:
+            counter = counters[key] = TrafficCounter()
+        if measure and counter.messages % self.sample_every == 0:
+            counter.sampled_size = payload_size(value)
+        counter.messages += 1
+        counter.bytes += counter.sampled_size
+        self._timestamps.append(monotonic())
+
+    def record_param(self, name:str, value:Any, received:bool, measure:bool = True):
+        """Records a parameter sync
+
+        Parameters
+        ----------
+        name : str
+            Parameter name
+        value : Any
+            Synchronized value
+        received : bool
+            Whether the value was received from the browser
+        measure : bool, optional
+            Measure the value size, by default True
+        """
+        self._record(self.params_received if received else self.params_sent, name, value, measure)
+
+    def record_event(self, data:Any):
+        """Records an event sent to the browser
+
+        Parameters
+        ----------
+        data : Any
+            Event data
+        """
+        action = data.get("action", "") if isinstance(data, dict) else ""
+        self._record(self.events_sent, action, data)
+
+    def record_message(self, data:Any):
+        """Records a message received from the browser
+
+        Parameters
+        ----------
+        data : Any
+            Message content
+        """
+        action = data.get("action", "") if isinstance(data, dict) else ""
+        self._record(self.messages_received, action, data)
+
+    def record_changes(self, changes:List[Any]):
+        """Records the graph changes found in a nodes/edges sync
+
+        Parameters
+        ----------
+        changes : List[Any]
+            NodeChange and EdgeChange found in the sync
+        """
+        self.diff_sizes.append(len(changes))
+        for change in changes:
+            change_type = type(change).__name__
+            self.changes[change_type] = self.changes.get(change_type, 0) + 1
+
+    def messages_per_second(self, window:float = 10.) -> float:
+        """Returns the mean number of messages exchanged per second
+
+        Parameters
+        ----------
+        window : float, optional
+            Duration in seconds over which the messages are counted, by default 10.
+
+        Returns
+        -------
+        float
+            Messages per second
+        """
+        start = monotonic() - window
+        return sum(1 for t in self._timestamps if t >= start) / window
+
+    def totals(self, ) -> Dict[str, Tuple[int, int]]:
+        """Returns the total number of messages and bytes for each direction
+
+        Returns
+        -------
+        Dict[str, Tuple[int, int]]
+            (messages, bytes) sent and received
+        """
+        sent = list(self.params_sent.values()) + list(self.events_sent.values())
+        received = list(self.params_received.values()) + list(self.messages_received.values())
+        return {
+            "sent":(sum(c.messages for c in sent), sum(c.bytes for c in sent)),
+            "received":(sum(c.messages for c in received), sum(c.bytes for c in received)),
+        }
+
+    def summary(self, ) -> Dict[str, Any]:
+        """Returns the counters as a json serializable dictionnary
+
+        Returns
+        -------
+        Dict[str, Any]
+            Metrics of the graph
+        """
+        def as_dict(counters:Dict[str, TrafficCounter]) -> Dict[str, Dict[str, int]]:
+            return {k: {"messages":c.messages, "bytes":c.bytes} for k, c in counters.items()}
+
+        totals = self.totals()
+        return {
+            "name":self.name,
+            "messages_per_second":self.messages_per_second(),
+            "messages_sent":totals["sent"][0],
+            "bytes_sent":totals["sent"][1],
+            "messages_received":totals["received"][0],
+            "bytes_received":totals["received"][1],
+            "params_sent":as_dict(self.params_sent),
+            "params_received":as_dict(self.params_received),
+            "events_sent":as_dict(self.events_sent),
+            "messages_received_by_action":as_dict(self.messages_received),
+            "changes":dict(self.changes),
+            "mean_diff_size":sum(self.diff_sizes) / len(self.diff_sizes) if self.diff_sizes else 0.,
+            "max_diff_size":max(self.diff_sizes, default=0),
+        }
+
+
+_tracked_metrics:"weakref.WeakSet[SyncMetrics]" = weakref.WeakSet()
+"""Metrics of the graphs tracking their traffic, displayed by the admin plugin"""
+
+
+def track(metrics:SyncMetrics):
+    """Adds the metrics to the ones displayed by the admin plugin
+
+    Parameters
+    ----------
+    metrics : SyncMetrics
+        Graph metrics
+    """
+    _tracked_metrics.add(metrics)
+
+
+def admin_view(period:int = 1000) -> pn.viewable.Viewable:
+    """Returns a panel displaying the metrics of all the graphs tracking their traffic, refreshed periodically
+
+    Parameters
+    ----------
+    period : int, optional
+        Refresh period in milliseconds, by default 1000
+
+    Returns
+    -------
+    pn.viewable.Viewable
+        Metrics display
+    """
+    pane = pn.pane.JSON({}, depth=2, sizing_mode="stretch_width")
+
+    def refresh():
+        pane.object = [metrics.summary() for metrics in list(_tracked_metrics)]
+
+    refresh()
+    pn.state.add_periodic_callback(refresh, period=period)
+    return pane
+
+
+def register_admin_plugin(name:str = "ReactFlow traffic"):
+    """Adds a tab displaying the graphs metrics to the Panel admin page (panel serve --admin)
+
+    Parameters
+    ----------
+    name : str, optional
+        Tab name, by default "ReactFlow traffic"
+    """
+    if not any(plugin_name == name for plugin_name, _ in pn.config.admin_plugins):
+        pn.config.admin_plugins = pn.config.admin_plugins + [(name, admin_view)]
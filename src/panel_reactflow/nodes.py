@@ -1,22 +1,24 @@
 """ List of nodes for default holoviz panel input widgets
 """
-import datetime
-import functools
-from json import JSONEncoder
-import json
-from typing import List
+from typing import Any, Dict, List
 
 import numpy as np
 import panel as pn
+import param
 
 from panel_reactflow.api import NodePort, PortDirection, PortPosition
+from panel_reactflow.deltas import array_delta
+from panel_reactflow.encoding import JSONEncoderToString, dumps
 from panel_reactflow.workflow import WorkflowNode
 
 class ArrayInputNode(WorkflowNode):
-    """ Generic node containig an ArrayInput widget, provided text is given with the "value" key.
+    """ Generic node containig an ArrayInput widget, provided text is given with the "value" key. 
+    When elements are appended or changed, the change is published to the plugged nodes implementing apply_delta.
     """
     node_class_name = "Array Input"
     """Node class name, as it will appear in the reactflow side bar."""
+    node_category = "Widgets"
+    """Category used to group the node classes in the reactflow side bar."""
     ports:List[NodePort] = [NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output")]
     """List of node ports"""
 
@@ -36,14 +38,17 @@ class ArrayInputNode(WorkflowNode):
                                     margin=0
                                 )
     
-    def update(self, _):
+    def update(self, event):
         """Update the node content based on the input ports.
 
         Parameters
         ----------
-        _ : Any
+        event : Any
             Event requesting the update
         """
+        if isinstance(event, param.parameterized.Event):
+            self.update_outputs(delta=array_delta(event.old, event.new))
+            return
         self.update_outputs()
 
     def get_node_json_value(self):
@@ -62,6 +67,8 @@ class ButtonNode(WorkflowNode):
     """
     node_class_name = "Button"
     """Node class name, as it will appear in the reactflow side bar."""
+    node_category = "Widgets"
+    """Category used to group the node classes in the reactflow side bar."""
     ports:List[NodePort] = [NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output")]
     """List of node ports"""
 
@@ -108,6 +115,8 @@ class CheckBoxNode(WorkflowNode):
     """
     node_class_name = "Check Box"
     """Node class name, as it will appear in the reactflow side bar."""
+    node_category = "Widgets"
+    """Category used to group the node classes in the reactflow side bar."""
     ports:List[NodePort] = [NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output")]
     """List of node ports"""
 
@@ -154,6 +163,8 @@ class ColorPickerNode(WorkflowNode):
     """
     node_class_name = "Color Picker"
     """Node class name, as it will appear in the reactflow side bar."""
+    node_category = "Widgets"
+    """Category used to group the node classes in the reactflow side bar."""
     ports:List[NodePort] = [NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output")]
     """List of node ports"""
 
@@ -200,6 +211,8 @@ class DatePickerNode(WorkflowNode):
     """
     node_class_name = "Date Picker"
     """Node class name, as it will appear in the reactflow side bar."""
+    node_category = "Widgets"
+    """Category used to group the node classes in the reactflow side bar."""
     ports:List[NodePort] = [NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output")]
     """List of node ports"""
 
@@ -246,6 +259,8 @@ class DateRangePickerNode(WorkflowNode):
     """
     node_class_name = "Date Range Picker"
     """Node class name, as it will appear in the reactflow side bar."""
+    node_category = "Widgets"
+    """Category used to group the node classes in the reactflow side bar."""
     ports:List[NodePort] = [NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output")]
     """List of node ports"""
 
@@ -292,6 +307,8 @@ class FileInputNode(WorkflowNode):
     """
     node_class_name = "File Input"
     """Node class name, as it will appear in the reactflow side bar."""
+    node_category = "Widgets"
+    """Category used to group the node classes in the reactflow side bar."""
     ports:List[NodePort] = [NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output")]
     """List of node ports"""
 
@@ -338,6 +355,8 @@ class FloatInputNode(WorkflowNode):
     """
     node_class_name = "Float Input"
     """Node class name, as it will appear in the reactflow side bar."""
+    node_category = "Widgets"
+    """Category used to group the node classes in the reactflow side bar."""
     ports:List[NodePort] = [NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output")]
     """List of node ports"""
 
@@ -384,6 +403,8 @@ class IntInputNode(WorkflowNode):
     """
     node_class_name = "Int Input"
     """Node class name, as it will appear in the reactflow side bar."""
+    node_category = "Widgets"
+    """Category used to group the node classes in the reactflow side bar."""
     ports:List[NodePort] = [NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output")]
     """List of node ports"""
 
@@ -426,10 +447,13 @@ class IntInputNode(WorkflowNode):
 
 
 class SelectNode(WorkflowNode):
-    """ Generic node containig a select widget, provided chosent item is given with the "value" key. The options are expected from a single connection under the "value" label.
+    """ Generic node containig a select widget, provided chosent item is given with the "value" key. 
+    The options are expected from a single connection under the "value" label.
     """
     node_class_name = "Select"
     """Node class name, as it will appear in the reactflow side bar."""
+    node_category = "Widgets"
+    """Category used to group the node classes in the reactflow side bar."""
     ports:List[NodePort] = [NodePort(direction=PortDirection.INPUT, position=PortPosition.LEFT, name="Options", connection_count_limit=1),
                             NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output")]
     """List of node ports"""
@@ -494,10 +518,13 @@ class SelectNode(WorkflowNode):
 
 
 class MultiChoiceNode(WorkflowNode):
-    """ Generic node containig a multi select widget, provided chosent item is given with the "value" key. The options are expected from a single connection under the "value" label.
+    """ Generic node containig a multi select widget, provided chosent item is given with the "value" key. 
+    The options are expected from a single connection under the "value" label.
     """
     node_class_name = "Multi Choice"
     """Node class name, as it will appear in the reactflow side bar."""
+    node_category = "Widgets"
+    """Category used to group the node classes in the reactflow side bar."""
     ports:List[NodePort] = [NodePort(direction=PortDirection.INPUT, position=PortPosition.LEFT, name="Options", connection_count_limit=1),
                             NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output")]
     """List of node ports"""
@@ -566,6 +593,8 @@ class TextInputNode(WorkflowNode):
     """
     node_class_name = "Text Input"
     """Node class name, as it will appear in the reactflow side bar."""
+    node_category = "Widgets"
+    """Category used to group the node classes in the reactflow side bar."""
     ports:List[NodePort] = [NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output")]
     """List of node ports"""
 
@@ -607,38 +636,132 @@ class TextInputNode(WorkflowNode):
 
 
 
-class JSONEncoderToString(JSONEncoder):
-    """ Special json encoder for numpy types and datetimes """
-    def default(self, obj):
-        if isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, datetime.date):
-            return obj.isoformat()
-        elif isinstance(obj, tuple) and isinstance(obj[0], datetime.date):
-            return [e.isoformat() for e in obj]
-        return json.JSONEncoder.default(self, obj)
+class JSONPane(pn.pane.JSON):
+    """ JSON pane encoding its object with the fast encoding of the node values. Panel has no public hook for the 
+    encoding of the pane object, the override of pn.pane.JSON._transform_object is covered by test_json_pane.
+    """
+    def _transform_object(self, obj):
+        if isinstance(obj, str):
+            return super()._transform_object(obj)
+        return dict(object=dumps({} if obj is None else obj))
+
+def preview_value(value:Any, max_items:int = 10, max_depth:int = 3, max_string:int = 200) -> Any:
+    """ Returns a bounded size preview of a value: the arrays and DataFrames larger than max_items are summarized 
+    (shape, dtype, head, tail and statistics), the collections are cut to max_items elements and to max_depth levels.
+
+    Parameters
+    ----------
+    value : Any
+        Previewed value
+    max_items : int, optional
+        Number of elements shown for the collections, by default 10
+    max_depth : int, optional
+        Number of nested levels shown, by default 3
+    max_string : int, optional
+        Number of characters shown for the strings, by default 200
+
+    Returns
+    -------
+    Any
+        Preview of the value, that can be encoded with the JSONEncoderToString
+    """
+    if isinstance(value, np.ndarray):
+        if value.size <= max_items:
+            return value.tolist()
+        half = max(1, max_items // 2)
+        flat = value.reshape(-1)
+        summary = {
+                    "shape":list(value.shape),
+                    "dtype":str(value.dtype),
+                    "head":flat[:half].tolist(),
+                    "tail":flat[-half:].tolist(),
+                }
+        if np.issubdtype(value.dtype, np.number) and not np.issubdtype(value.dtype, np.complexfloating):
+            if np.issubdtype(value.dtype, np.floating) and np.isnan(value).all():
+                # nanmin warns on all-NaN arrays
+                summary.update({"min":None, "max":None, "mean":None})
+            else:
+                summary.update({"min":np.nanmin(value), "max":np.nanmax(value), "mean":np.nanmean(value)})
+        return summary
+
+    # pandas is not a dependency, DataFrames and Series are recognized by their module
+    if type(value).__module__.startswith("pandas") and hasattr(value, "shape") and hasattr(value, "head"):
+        if len(value) <= max_items:
+            return preview_value(value.to_dict(), max_items, max_depth, max_string)
+        half = max(1, max_items // 2)
+        summary = {"shape":list(value.shape)}
+        if hasattr(value, "dtypes") and not hasattr(value, "dtype"):
+            summary["dtypes"] = {str(column): str(dtype) for column, dtype in list(value.dtypes.items())[:max_items]}
+        else:
+            summary["dtype"] = str(value.dtype)
+        summary["head"] = preview_value(value.head(half).to_dict(), max_items, max_depth, max_string)
+        summary["tail"] = preview_value(value.tail(half).to_dict(), max_items, max_depth, max_string)
+        return summary
+
+    if isinstance(value, str):
+        return value if len(value) <= max_string else value[:max_string] + f"... ({len(value)} characters)"
+
+    if isinstance(value, dict):
+        if max_depth <= 0:
+            return f"dict ({len(value)} keys)"
+        preview = {
+                    key if isinstance(key, (str, int, float, bool)) or key is None else str(key):
+                        preview_value(item, max_items, max_depth - 1, max_string)
+                    for key, item in list(value.items())[:max_items]
+                }
+        if len(value) > max_items:
+            preview["..."] = f"{len(value) - max_items} more keys"
+        return preview
+
+    if isinstance(value, (list, tuple, set)):
+        if max_depth <= 0:
+            return f"{type(value).__name__} ({len(value)} elements)"
+        items = list(value) if not isinstance(value, set) else sorted(value, key=str)
+        preview = [preview_value(item, max_items, max_depth - 1, max_string) for item in items[:max_items]]
+        if len(value) > max_items:
+            preview.append(f"... {len(value) - max_items} more elements")
+        return preview if not isinstance(value, tuple) else tuple(preview)
+
+    return value
+
 
 class PrintInputNode(WorkflowNode):
-    """ Node displaying in a JSON pane the provided inputs.
+    """ Node displaying in a JSON pane the provided inputs. The inputs are shown as bounded previews, the arrays and 
+    DataFrames being summarized, and an input can be expanded on demand with a larger limit.
     """
     node_class_name = "Print Input"
     """Node class name, as it will appear in the reactflow side bar."""
+    node_category = "Display"
+    """Category used to group the node classes in the reactflow side bar."""
     ports:List[NodePort] = [NodePort(direction=PortDirection.INPUT, position=PortPosition.LEFT, name="Input")]
     """List of node ports"""
+    preview:bool = True
+    """Show bounded previews of the inputs, instead of their full value"""
+    max_items:int = 10
+    """Number of elements shown for the collections of the inputs"""
+    max_depth:int = 3
+    """Number of nested levels shown"""
+    expanded_items:int = 1000
+    """Number of elements shown for the collections of the expanded input"""
+    state_widgets:List[str] = []
+    """The input selection only changes the display, it is not recorded by the history and the journal"""
 
     def __init__(self, ):
         super().__init__()
 
-        self.json = pn.pane.JSON(object={}, depth=-1, encoder = JSONEncoderToString)
+        self.json = JSONPane(object={}, depth=-1, encoder = JSONEncoderToString)
+
+        self.expand = pn.widgets.Select(options={"Preview": None}, width=100, visible=False)
+        self.expand.param.watch(self._expand_changed, "value")
+        self.values:Dict[str, Any] = {}
+        """Last value of the plugged nodes, by node name"""
+        self._updating = False
 
     def create(self, ):
         """Function called by the Reactflow class to instanciate the content of the node
         """
         return pn.layout.Column(
+                                    self.expand,
                                     self.json, 
                                     name=self.name, 
                                     align="center",
@@ -653,11 +776,42 @@ class PrintInputNode(WorkflowNode):
         _ : Any
             Event requesting the update
         """
-        self.json.object = {
+        self.values = {
                 node.name:node.get_node_json_value() 
                 for node in self.plugged_nodes["Input"]
              }
 
+        options = {"Preview": None, **{name: name for name in self.values}}
+        # The inputs are rendered once, after the expand selection is updated
+        self._updating = True
+        try:
+            if self.expand.value not in self.values:
+                self.expand.value = None
+            self.expand.param.update(options=options, visible=self.preview and len(self.values) > 0)
+        finally:
+            self._updating = False
+        self._render()
+
+    def _expand_changed(self, _:param.parameterized.Event):
+        if not self._updating:
+            self._render()
+
+    def _render(self, ):
+        """Shows the inputs previews, the expanded input being shown with the expanded_items limit
+        """
+        if not self.preview:
+            self.json.object = dict(self.values)
+            return
+
+        self.json.object = {
+                name: preview_value(
+                                        value, 
+                                        self.expanded_items if name == self.expand.value else self.max_items, 
+                                        self.max_depth,
+                                    )
+                for name, value in self.values.items()
+             }
+
     def get_node_json_value(self):
         """ Returns a dictionnary describing the node content, this dictionnary can be obtain by other nodes in their update call.
         
@@ -671,10 +825,13 @@ class PrintInputNode(WorkflowNode):
 
 
 class ParentNode(WorkflowNode):
-    """ Generic node containig a text input widget, provided text is given with the "value" key.
+    """ Group node, other nodes are placed in it by giving its name as "parentId" in their react_props. 
+    The group can be collapsed with the graph collapse_group function.
     """
     node_class_name = "Parent"
     """Node class name, as it will appear in the reactflow side bar."""
+    node_category = "Layout"
+    """Category used to group the node classes in the reactflow side bar."""
     ports:List[NodePort] = []
     """List of node ports"""
 
@@ -0,0 +1,188 @@
+""" Storage of the nodes positions and selection flags as synchronized by the browser
+"""
+from operator import itemgetter, methodcaller
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+
+from panel_reactflow.events import NodeChange, NodeCreation, NodeDeletion, NodeMove, NodeSelected, NodeDeselected
+
+_POSITION = itemgetter("position")
+_X = itemgetter("x")
+_Y = itemgetter("y")
+_SELECTION = methodcaller("get", "selected", -1)
+
+
+class PositionTable:
+    def __init__(self, capacity:int = 64):
+        """Stores the nodes positions and selection flags in NumPy arrays, each node keeping the same row
+        while it is in the graph. The graph changes between two syncs are found with vectorized comparisons.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Initial number of rows, by default 64
+        """
+        self.ids:Dict[str, int] = {}
+        """Row of each node name"""
+        self.names:List[Union[str, None]] = [None] * capacity
+        """Node name of each row, None for free rows"""
+        self.xy:np.ndarray = np.zeros((capacity, 2))
+        """X and Y coordinates of each row"""
+        self.selected:np.ndarray = np.zeros(capacity, dtype=bool)
+        """Selection flag of each row"""
+
+        self._free:List[int] = list(range(capacity - 1, -1, -1))
+        self._synced_names:List[str] = []
+        self._synced_rows:np.ndarray = np.zeros(0, dtype=np.intp)
+
+    def __len__(self, ):
+        return len(self.ids)
+
+    def __contains__(self, name:str):
+        return name in self.ids
+
+    def _grow(self, ):
+        capacity = len(self.names)
+        self.names += [None] * capacity
+        self.xy = np.concatenate([self.xy, np.zeros((capacity, 2))])
+        self.selected = np.concatenate([self.selected, np.zeros(capacity, dtype=bool)])
+        self._free = list(range(2 * capacity - 1, capacity - 1, -1)) + self._free
+
+    def add(self, name:str, x:float, y:float, selected:bool = False) -> int:
+        """Stores a new node
+
+        Parameters
+        ----------
+        name : str
+            Node name
+        x : float
+            X coordinate
+        y : float
+            Y coordinate
+        selected : bool, optional
+            Selection flag, by default False
+
+        Returns
+        -------
+        int
+            Row of the node
+        """
+        if not self._free:
+            self._grow()
+
+        row = self._free.pop()
+        self.ids[name] = row
+        self.names[row] = name
+        self.xy[row] = (x, y)
+        self.selected[row] = selected
+        return row
+
+    def remove(self, name:str):
+        """Removes a node, its row can be reused by the next added node
+
+        Parameters
+        ----------
+        name : str
+            Node name
+        """
+        row = self.ids.pop(name)
+        self.names[row] = None
+        self.selected[row] = False
+        self._free.append(row)
+
+    def position(self, name:str) -> Tuple[float, float]:
+        """Returns the position of a node
+
+        Parameters
+        ----------
+        name : str
+            Node name
+
+        Returns
+        -------
+        Tuple[float, float]
+            X and Y coordinates
+        """
+        x, y = self.xy[self.ids[name]]
+        return float(x), float(y)
+
+    def as_array(self, ) -> Tuple[List[str], np.ndarray]:
+        """Returns the positions of all the nodes
+
+        Returns
+        -------
+        Tuple[List[str], np.ndarray]
+            Nodes names and (n, 2) array of their coordinates, in the same order
+        """
+        rows = np.fromiter(self.ids.values(), dtype=np.intp, count=len(self.ids))
+        return list(self.ids), self.xy[rows]
+
+    def diff(self, new_node_dict:Dict[str, Any]) -> List[NodeChange]:
+        """Stores the synchronized nodes and returns the changes since the previous sync
+
+        Parameters
+        ----------
+        new_node_dict : Dict[str, Any]
+            Dictionnary containing the nodes parameters for each node name
+
+        Returns
+        -------
+        List[NodeChange]
+            Node creations, then moves, selections, deselections and deletions
+        """
+        node_changes:List[NodeChange] = []
+
+        # Membership is checked with set operations on the keys, the names being only iterated when nodes are added or removed
+        deleted = self.ids.keys() - new_node_dict.keys()
+        if deleted:
+            deleted = [name for name in self.ids if name in deleted]
+            for name in deleted:
+                self.remove(name)
+
+        created = new_node_dict.keys() - self.ids.keys()
+        if created:
+            created = [name for name in new_node_dict if name in created]
+            for name in created:
+                node = new_node_dict[name]
+                self.add(name, node["position"]["x"], node["position"]["y"], bool(node.get("selected", False)))
+                node_changes.append(NodeCreation(name))
+
+        names = list(new_node_dict)
+        count = len(names)
+        if count:
+            # The rows are recomputed only when the nodes or their order changed since the previous sync
+            if created or deleted or names != self._synced_names:
+                self._synced_names = names
+                self._synced_rows = np.fromiter(map(self.ids.__getitem__, names), dtype=np.intp, count=count)
+            rows = self._synced_rows
+
+            # The values are read from the synchronized dictionnaries with C level iterations (map, itemgetter)
+            nodes = list(new_node_dict.values())
+            positions = list(map(_POSITION, nodes))
+            xy = np.empty((count, 2))
+            xy[:, 0] = np.fromiter(map(_X, positions), dtype=float, count=count)
+            xy[:, 1] = np.fromiter(map(_Y, positions), dtype=float, count=count)
+            # Selection state, -1 when the browser didn't provide it
+            selection = np.fromiter(map(_SELECTION, nodes), dtype=object, count=count)
+            has_selected = selection != -1
+            selected = has_selected & selection.astype(bool)
+
+            old_xy = self.xy[rows]
+            old_selected = self.selected[rows]
+
+            # Created nodes are stored with their synchronized state, they don't produce moves or selections
+            moved = np.flatnonzero((old_xy != xy).any(axis=1))
+            for i in moved:
+                node_changes.append(NodeMove(names[i], float(xy[i, 0]), float(xy[i, 1]), float(old_xy[i, 0]), float(old_xy[i, 1])))
+            for i in np.flatnonzero(has_selected & selected & ~old_selected):
+                node_changes.append(NodeSelected(names[i]))
+            for i in np.flatnonzero(has_selected & ~selected & old_selected):
+                node_changes.append(NodeDeselected(names[i]))
+
+            if len(moved):
+                self.xy[rows] = xy
+            self.selected[rows] = selected
+
+        node_changes += [NodeDeletion(name) for name in deleted]
+        return node_changes
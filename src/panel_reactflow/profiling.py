@@ -0,0 +1,189 @@
+""" Recording of the nodes updates executed by a Workflow
+"""
+from collections import deque
+from dataclasses import dataclass, field
+import sys
+from typing import Any, Deque, Dict, List, Union
+
+import numpy as np
+
+
+@dataclass
+class NodeRun:
+    """Execution of one node update during a propagation wave."""
+    node_name:str
+    """Updated node name"""
+    parent_name:Union[str, None]
+    """Name of the node whose outputs requested the update, None if the update was requested by a graph change"""
+    start:float
+    """perf_counter time at which the update started"""
+    duration:float
+    """Duration of the update in seconds, including the updates of the nodes it triggered"""
+    self_time:float
+    """Duration of the update in seconds, excluding the updates of the nodes it triggered"""
+    queue_wait:float
+    """Time in seconds between the update request and its start"""
+    output_size:int
+    """Estimated size in bytes of the node value after the update"""
+    depth:int
+    """Depth of the update in the propagation, 0 for the updates requested by the trigger"""
+
+@dataclass
+class PropagationWave:
+    """Cascade of nodes updates following a single trigger."""
+    wave_id:int
+    """Wave index since the Workflow creation"""
+    trigger:Any
+    """What started the wave : a NodeChange/EdgeChange or the node whose outputs were updated"""
+    start:float
+    """perf_counter time at which the wave started"""
+    duration:float = 0.
+    """Duration of the wave in seconds"""
+    runs:List[NodeRun] = field(default_factory=list)
+    """Nodes updates executed during the wave, in their completion order"""
+
+@dataclass
+class NodeTiming:
+    """Aggregated execution statistics of a node."""
+    calls:int = 0
+    """Number of updates"""
+    wall_time:float = 0.
+    """Total time spent in the node update in seconds, excluding the updates of the nodes it triggered"""
+    max_time:float = 0.
+    """Longest update in seconds, excluding the updates of the nodes it triggered"""
+    queue_wait:float = 0.
+    """Total time in seconds between the updates requests and their start"""
+    output_size:int = 0
+    """Estimated size in bytes of the node value after its last update"""
+
+    @property
+    def mean_time(self) -> float:
+        """Mean update time in seconds"""
+        return self.wall_time / self.calls if self.calls else 0.
+
+
+def estimate_size(value:Any, max_depth:int = 4) -> int:
+    """Estimates the memory size of a node value, without copying or serializing it.
+
+    Parameters
+    ----------
+    value : Any
+        Value to measure
+    max_depth : int, optional
+        Depth up to which the containers content is measured, by default 4
+
+    Returns
+    -------
+    int
+        Estimated size in bytes
+    """
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if hasattr(value, "memory_usage") and callable(value.memory_usage):
+        # pandas objects
+        usage = value.memory_usage(deep=False)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if max_depth > 0:
+        if isinstance(value, dict):
+            return sum(estimate_size(k, max_depth - 1) + estimate_size(v, max_depth - 1) for k, v in value.items())
+        if isinstance(value, (list, tuple, set)):
+            return sum(estimate_size(v, max_depth - 1) for v in value)
+    return sys.getsizeof(value)
+
+
+class WorkflowProfiler:
+    def __init__(self, max_waves:int = 100, measure_output_size:bool = True):
+        """Records the per node execution statistics of a Workflow, and the last propagation waves.
+
+        Parameters
+        ----------
+        max_waves : int, optional
+            Number of propagation waves kept in memory, by default 100
+        measure_output_size : bool, optional
+            Estimate the size of the node value after each update, by default True
+        """
+        self.measure_output_size:bool = measure_output_size
+        """Estimate the size of the node value after each update"""
+        self.stats:Dict[str, NodeTiming] = {}
+        """Aggregated statistics for each node name"""
+        self.waves:Deque[PropagationWave] = deque(maxlen=max_waves)
+        """Last propagation waves"""
+
+    def reset(self, ):
+        """Clears the recorded statistics.
+        """
+        self.stats.clear()
+        self.waves.clear()
+
+    def wave_started(self, wave:PropagationWave):
+        """Function called by the Workflow when a propagation wave starts
+
+        Parameters
+        ----------
+        wave : PropagationWave
+            Started wave
+        """
+        self.waves.append(wave)
+
+    def node_updated(self, wave:PropagationWave, run:NodeRun):
+        """Function called by the Workflow after each node update
+
+        Parameters
+        ----------
+        wave : PropagationWave
+            Current wave
+        run : NodeRun
+            Node update description
+        """
+        timing = self.stats.setdefault(run.node_name, NodeTiming())
+        timing.calls += 1
+        timing.wall_time += run.self_time
+        timing.max_time = max(timing.max_time, run.self_time)
+        timing.queue_wait += run.queue_wait
+        timing.output_size = run.output_size
+
+    def wave_finished(self, wave:PropagationWave):
+        """Function called by the Workflow when a propagation wave ends
+
+        Parameters
+        ----------
+        wave : PropagationWave
+            Finished wave
+        """
+        pass
+
+    def costs(self, ) -> Dict[str, float]:
+        """Returns the total update time of each node, relative to the most expensive node
+
+        Returns
+        -------
+        Dict[str, float]
+            Cost between 0 and 1 for each node name
+        """
+        max_time = max((timing.wall_time for timing in self.stats.values()), default=0.)
+        if max_time == 0.:
+            return {name: 0. for name in self.stats}
+        return {name: timing.wall_time / max_time for name, timing in self.stats.items()}
+
+    def summary(self, ) -> List[Dict[str, Any]]:
+        """Returns the nodes statistics, sorted from the most to the least expensive node
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            Statistics of each node
+        """
+        return [
+                    {
+                        "node":name,
+                        "calls":timing.calls,
+                        "wall_time":timing.wall_time,
+                        "mean_time":timing.mean_time,
+                        "max_time":timing.max_time,
+                        "queue_wait":timing.queue_wait,
+                        "output_size":timing.output_size,
+                    }
+                    for name, timing in sorted(self.stats.items(), key=lambda item: item[1].wall_time, reverse=True)
+                ]
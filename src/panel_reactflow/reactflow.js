@@ -34,6 +34,9 @@ export const ModelProvider = ({ model, children }) => {
     );
 };
 
+// Numeric series of the nodes, received as binary typed arrays
+const SeriesContext = createContext(new Map());
+
 /**
  * 
  *  Drag and drop feature
@@ -57,6 +60,9 @@ export const useDnD = () => {
 };
 
 
+const PALETTE_ROW_HEIGHT = 46;
+const PALETTE_OVERSCAN = 5;
+
 function Sidebar() {
     const [_, setType] = useDnD();
 
@@ -65,24 +71,117 @@ function Sidebar() {
         event.dataTransfer.effectAllowed = 'move';
     };
 
-    const [node_class_labels, setNodeClassLabels] = useModel().useState("node_class_labels");
+    const [node_class_labels,] = useModel().useState("node_class_labels");
+    const [node_class_categories,] = useModel().useState("node_class_categories");
+
+    const [search, setSearch] = useState("");
+    const [collapsed, setCollapsed] = useState({});
+    const [scrollTop, setScrollTop] = useState(0);
+    const [viewHeight, setViewHeight] = useState(0);
+    const containerRef = useRef(null);
+
+    // Grouping the node classes by category, only recomputed when the classes or the search change
+    const categories = useMemo(() => {
+        const query = search.trim().toLowerCase();
+        const grouped = new Map();
+
+        node_class_labels.forEach((label, index) => {
+            const category = node_class_categories[index] || "";
+            if (query && !label.toLowerCase().includes(query) && !category.toLowerCase().includes(query))
+                return;
+            if (!grouped.has(category))
+                grouped.set(category, []);
+            grouped.get(category).push(label);
+        });
+
+        return grouped;
+    }, [node_class_labels, node_class_categories, search]);
+
+    // Flat list of category headers and node rows
+    const rows = useMemo(() => {
+        const flat = [];
+        const displayHeaders = categories.size > 1 || !categories.has("");
+
+        categories.forEach((labels, category) => {
+            if (displayHeaders)
+                flat.push({ header: true, category: category, count: labels.length });
+            if (!collapsed[category] || search)
+                labels.forEach((label) => flat.push({ header: false, label: label }));
+        });
+
+        return flat;
+    }, [categories, collapsed, search]);
+
+    useEffect(() => {
+        const element = containerRef.current;
+        if (!element || typeof ResizeObserver === "undefined")
+            return;
+
+        const observer = new ResizeObserver((entries) => {
+            setViewHeight(entries[0].contentRect.height);
+        });
+        observer.observe(element);
+
+        return () => observer.disconnect();
+    }, []);
+
+    // Only the rows in the visible window are rendered
+    const first = Math.max(0, Math.floor(scrollTop / PALETTE_ROW_HEIGHT) - PALETTE_OVERSCAN);
+    const last = Math.min(rows.length, Math.ceil((scrollTop + viewHeight) / PALETTE_ROW_HEIGHT) + PALETTE_OVERSCAN);
 
     return (
         <aside className="node-palette">
             <div className="description">
                 {"Available drag and drop nodes"}
             </div>
-            <div className="nodes-container">
-                {node_class_labels.map((label, index) => (
-                    <div
-                        key={index}
-                        className={`dndnode`}
-                        onDragStart={(event) => onDragStart(event, label)}
-                        draggable
-                    >
-                        {label} Node
-                    </div>
-                ))}
+            <input
+                className="palette-search"
+                type="search"
+                placeholder="Search nodes"
+                value={search}
+                onChange={(event) => setSearch(event.target.value)}
+            />
+            <div
+                className="nodes-container"
+                ref={containerRef}
+                onScroll={(event) => setScrollTop(event.currentTarget.scrollTop)}
+            >
+                <div style={{ position: 'relative', height: `${rows.length * PALETTE_ROW_HEIGHT}px` }}>
+                    {rows.slice(first, last).map((row, offset) => {
+                        const rowStyle = {
+                            position: 'absolute',
+                            top: `${(first + offset) * PALETTE_ROW_HEIGHT}px`,
+                            left: 0,
+                            right: 0,
+                            height: `${PALETTE_ROW_HEIGHT}px`,
+                        };
+
+                        if (row.header) {
+                            return (
+                                <div
+                                    key={`category:${row.category}`}
+                                    className="palette-category"
+                                    style={rowStyle}
+                                    onClick={() => setCollapsed((c) => ({ ...c, [row.category]: !c[row.category] }))}
+                                >
+                                    {collapsed[row.category] && !search ? "\u25b8" : "\u25be"} {row.category || "Other"} ({row.count})
+                                </div>
+                            );
+                        }
+
+                        return (
+                            <div key={`node:${row.label}`} className="palette-row" style={rowStyle}>
+                                <div
+                                    className={`dndnode`}
+                                    onDragStart={(event) => onDragStart(event, row.label)}
+                                    draggable
+                                >
+                                    {row.label} Node
+                                </div>
+                            </div>
+                        );
+                    })}
+                </div>
             </div>
         </aside>
     );
@@ -127,13 +226,20 @@ const CustomRestrictiveHandle = (props) => {
  * 
  * 
  */
-const positions = [Position.Top, Position.Bottom, Position.Right, Position.Left];
+const positions = {
+    top: Position.Top,
+    bottom: Position.Bottom,
+    right: Position.Right,
+    left: Position.Left,
+};
+const noPorts = { top: [], bottom: [], right: [], left: [] };
+
 function renderPortsNames(ports) {
     const maxOffset =
-        ports && ports.length > 0
+        ports.length > 0
             ? Math.max(
-                ...ports.map(([, , , display_name, offset]) =>
-                    display_name && offset !== undefined ? offset : 0
+                ...ports.map((port) =>
+                    port.display_name && port.offset !== null ? port.offset : 0
                 )
             ) + 20 // estimated height
             : 0;
@@ -149,113 +255,198 @@ function renderPortsNames(ports) {
         >
             {/* Invisible block to preserve width */}
             <div style={{ visibility: 'hidden', position: 'relative' }}>
-                {ports &&
-                    ports.map(([, , name, display_name]) =>
-                        display_name ? <div key={name}>{name}</div> : null
-                    )}
+                {ports.map((port) =>
+                    port.display_name ? <div key={port.name}>{port.name}</div> : null
+                )}
             </div>
 
             {/* Absolutely positioned spans */}
-            {ports &&
-                ports.map((handle, index) => {
-                    const [, , name, display_name, offset] = handle;
-
-                    if (!display_name) return null;
-
-                    const spanStyle =
-                        offset !== undefined
-                            ? {
-                                position: 'absolute',
-                                top: `${offset}px`,
-                                left: 0,
-                                whiteSpace: 'nowrap',
-                            }
-                            : {
-                                position: 'absolute',
-                                top: `${maxOffset * 0.5}px`,
-                                left: 0,
-                                whiteSpace: 'nowrap'
-                            };
-
-                    return (
-                        <span key={name} style={spanStyle}>
-                            {name}
-                        </span>
-                    );
-                })}
+            {ports.map((port) => {
+                if (!port.display_name) return null;
+
+                const spanStyle =
+                    port.offset !== null
+                        ? {
+                            position: 'absolute',
+                            top: `${port.offset}px`,
+                            left: 0,
+                            whiteSpace: 'nowrap',
+                        }
+                        : {
+                            position: 'absolute',
+                            top: `${maxOffset * 0.5}px`,
+                            left: 0,
+                            whiteSpace: 'nowrap'
+                        };
+
+                return (
+                    <span key={port.name} style={spanStyle}>
+                        {port.name}
+                    </span>
+                );
+            })}
         </div>
     );
 }
 
-function renderHandles(ports, origin, id) {
-    return ports && ports.map((handle, index) => {
-        let [typeValue,
-            positionValue,
-            name,
-            display_name,
-            offset,
-            connectionCount,
-            restiction_name,
-            restriction_color] = handle;
-        const type = typeValue === 0 ? 'target' : 'source';
-        const position = positions[positionValue];
-
-        if (connectionCount == undefined)
-            connectionCount = 10000;
+function renderHandles(ports, side, origin, id, restrictions) {
+    return ports.map((port) => {
+        const restriction = port.restriction !== null ? restrictions[port.restriction] : undefined;
 
         let style = {
-            background: restriction_color !== undefined ? restriction_color : '#000'
+            background: restriction !== undefined ? restriction.color : '#000'
         };
 
-        if (offset != undefined) {
-            style[[origin]] = offset;
-        }
-
-        if (typeof (restiction_name) === "undefined") {
-            restiction_name = "default";
+        if (port.offset !== null) {
+            style[[origin]] = port.offset;
         }
 
         let handleProperties = {
-            key: index,
-            type: type,
-            position: position,
-            id: name,
-            title: name,
+            key: port.name,
+            type: port.type,
+            position: positions[side],
+            id: port.name,
+            title: port.name,
             node_name: id,
             style: style,
-            connectionCount: connectionCount,
-            restiction_name: restiction_name
+            connectionCount: port.connection_count !== null ? port.connection_count : 10000,
         };
 
         return <CustomRestrictiveHandle {...handleProperties} />
     });
 }
 
+const SPARKLINE_WIDTH = 120;
+const SPARKLINE_HEIGHT = 24;
+
+// Polyline of the minimum and maximum of the values in each pixel column, read directly from the typed array
+function sparklinePoints(values, width, height) {
+    const n = values.length;
+    let min = Infinity;
+    let max = -Infinity;
+    for (let i = 0; i < n; i++) {
+        const value = values[i];
+        if (value < min) min = value;
+        if (value > max) max = value;
+    }
+    if (min === Infinity)
+        return "";
+
+    const scale = max > min ? height / (max - min) : 0;
+    const columns = Math.min(width, n);
+    const points = [];
+    for (let column = 0; column < columns; column++) {
+        const start = Math.floor(column * n / columns);
+        const end = Math.max(start + 1, Math.floor((column + 1) * n / columns));
+        let low = Infinity;
+        let high = -Infinity;
+        for (let i = start; i < end; i++) {
+            const value = values[i];
+            if (value < low) low = value;
+            if (value > high) high = value;
+        }
+        if (low === Infinity)
+            continue;
+
+        const x = columns > 1 ? column * width / (columns - 1) : width / 2;
+        points.push(`${x},${height - (low - min) * scale}`, `${x},${height - (high - min) * scale}`);
+    }
+    return points.join(" ");
+}
+
+function Sparkline({ values }) {
+    const points = useMemo(() => sparklinePoints(values, SPARKLINE_WIDTH, SPARKLINE_HEIGHT), [values]);
+
+    return (
+        <svg width={SPARKLINE_WIDTH} height={SPARKLINE_HEIGHT} style={{ display: 'block', margin: 'auto' }}>
+            <polyline points={points} fill="none" stroke="currentColor" strokeWidth={1} />
+        </svg>
+    );
+}
+
 function PanelWidgetNode({ id, data }) {
     const model = useModel(); // Access the model using the custom hook at the top level
     const updateNodeInternals = useUpdateNodeInternals();
 
     let children = model.get_child("items");
     let [children_name,] = model.useState("item_names");
+    let [children_created,] = model.useState("item_created");
     let [ports_list,] = model.useState("item_ports");
 
     let child;
     let ports;
+    let created = true;
 
     for (let index = 0; index < children.length; index++) {
         if (id == children_name[index]) {
             child = children[index];
             ports = ports_list[index];
+            created = children_created[index];
             break;
         }
     };
 
-    updateNodeInternals(id);
+    // Lazy nodes: requesting the node content creation on first display
+    useEffect(() => {
+        if (!created) {
+            model.send_msg({ action: "RENDER_NODE", node_id: id });
+        }
+    }, [id, created]);
 
-    const leftPorts = ports && ports.filter(handle => positions[handle[1]] === Position.Left);
-    const rightPorts = ports && ports.filter(handle => positions[handle[1]] === Position.Right);
-    const topPorts = ports && ports.filter(handle => positions[handle[1]] === Position.Top);
-    const bottomPorts = ports && ports.filter(handle => positions[handle[1]] === Position.Bottom);
+    if (!created) {
+        child = <div>{data.label}</div>;
+    }
+
+    // Handles are only re-measured when the ports or the node size change
+    const portsSignature = useMemo(() => JSON.stringify(ports || []), [ports]);
+
+    useEffect(() => {
+        updateNodeInternals(id);
+    }, [id, portsSignature, updateNodeInternals]);
+
+    const containerRef = useRef(null);
+
+    useEffect(() => {
+        const element = containerRef.current;
+        if (!element || typeof ResizeObserver === "undefined")
+            return;
+
+        let frame = null;
+        let lastWidth = null;
+        let lastHeight = null;
+
+        const observer = new ResizeObserver((entries) => {
+            const { width, height } = entries[0].contentRect;
+            if (width === lastWidth && height === lastHeight)
+                return;
+            lastWidth = width;
+            lastHeight = height;
+
+            // Several resizes in the same frame lead to a single measure
+            if (frame !== null)
+                cancelAnimationFrame(frame);
+            frame = requestAnimationFrame(() => {
+                frame = null;
+                updateNodeInternals(id);
+            });
+        });
+        observer.observe(element);
+
+        return () => {
+            observer.disconnect();
+            if (frame !== null)
+                cancelAnimationFrame(frame);
+        };
+    }, [id, updateNodeInternals]);
+
+    const portTable = ports || noPorts;
+    const [restrictions,] = model.useState("port_restrictions");
+
+    const series = useContext(SeriesContext).get(id);
+
+    // Overlay color, for example the node cost recorded by the profiler
+    const [overlay,] = model.useState("node_overlay");
+    const overlayValue = overlay ? overlay[id] : undefined;
 
     const gridContainerStyle = {
         display: 'grid',
@@ -263,39 +454,49 @@ function PanelWidgetNode({ id, data }) {
         gap: '0px',
     };
 
+    if (overlayValue !== undefined) {
+        gridContainerStyle.background = `color-mix(in srgb, #d62728 ${Math.round(overlayValue * 60)}%, transparent)`;
+    }
+
     const gridItemStyle = {
         // border: '1px solid black', // Uncomment for debug
         minWidth: "fit-content"
     };
 
     return (
-        <div style={gridContainerStyle}>
+        <div
+            ref={containerRef}
+            style={gridContainerStyle}
+            title={overlayValue !== undefined ? `Relative cost : ${Math.round(overlayValue * 100)}%` : undefined}
+        >
 
             <div style={gridItemStyle}>
                 {/* Display of the left ports, and if applicable, of the list of names */}
 
                 {/* HTML element with all port names, one after the other */}
-                {renderPortsNames(leftPorts)}
+                {renderPortsNames(portTable.left)}
 
                 {/* Display of Handle components */}
-                {renderHandles(leftPorts, "top", id)}
+                {renderHandles(portTable.left, "left", "top", id, restrictions)}
             </div>
 
             <div style={gridItemStyle}>
                 {/* Display of the top/bottom ports and actual panel element (child) */}
 
-                {renderHandles((topPorts || []).concat(bottomPorts || []), "left", id)}
+                {renderHandles(portTable.top, "top", "left", id, restrictions)}
+                {renderHandles(portTable.bottom, "bottom", "left", id, restrictions)}
                 {child}
+                {series !== undefined && <Sparkline values={series} />}
             </div>
 
             <div style={gridItemStyle}>
                 {/* Display of the left ports, and if applicable, of the list of names */}
 
                 {/* HTML element with all port names, one after the other */}
-                {renderPortsNames(rightPorts)}
+                {renderPortsNames(portTable.right)}
 
                 {/* Display of Handle components */}
-                {renderHandles(rightPorts, "top", id)}
+                {renderHandles(portTable.right, "right", "top", id, restrictions)}
             </div>
         </div>
     );
@@ -313,22 +514,68 @@ const getNodeTypes = (onMyTrigger) => ({
     panelWidget: PanelWidgetNode,
 });
 
-function getPortDict(node_name, port_name, node_list, port_list) {
+function getPort(node_name, port_name, node_list, port_list) {
     let ports = port_list[node_list.indexOf(node_name)];
-    let foundPort;
+    if (ports === undefined)
+        return undefined;
 
-    ports.forEach(port => {
-        if (port[2] == port_name) {
-            foundPort = port;
-        }
-    });
+    for (const side of ["top", "bottom", "right", "left"]) {
+        const port = ports[side].find((p) => p.name === port_name);
+        if (port !== undefined)
+            return port;
+    }
+}
 
-    return foundPort;
+function areRestrictionsCompatible(source, target, restrictions) {
+    if (source === target)
+        return true;
+
+    return target !== null && restrictions[target].accepts.includes(source);
 }
 
 let id = 0;
 const getId = () => `dndnode_${id++}`;
 
+// Collaborative views prefix the nodes they create so that the names don't collide between views
+const viewId = Math.random().toString(36).slice(2, 8);
+
+// Operations of a collaborative graph, applied in the order of their sequence numbers
+function applyNodeOperation(nodes, operation) {
+    if (operation.op === "add_nodes") {
+        const ids = new Set(nodes.map((node) => node.id));
+        return nodes.concat(operation.nodes.filter((node) => !ids.has(node.id)));
+    }
+    else if (operation.op === "remove_nodes") {
+        const ids = new Set(operation.ids);
+        return nodes.filter((node) => !ids.has(node.id));
+    }
+    else if (operation.op === "move") {
+        return nodes.map((node) => Object.hasOwn(operation.positions, node.id) ? { ...node, position: operation.positions[node.id] } : node);
+    }
+    return nodes;
+}
+
+function applyEdgeOperation(edges, operation) {
+    if (operation.op === "add_edges") {
+        const ids = new Set(edges.map((edge) => edge.id));
+        return edges.concat(operation.edges.filter((edge) => !ids.has(edge.id)));
+    }
+    else if (operation.op === "remove_edges") {
+        const ids = new Set(operation.ids);
+        return edges.filter((edge) => !ids.has(edge.id));
+    }
+    else if (operation.op === "remove_nodes") {
+        const ids = new Set(operation.ids);
+        return edges.filter((edge) => !ids.has(edge.source) && !ids.has(edge.target));
+    }
+    return edges;
+}
+
+function keepSelection(current, items) {
+    const selected = new Set(current.filter((item) => item.selected).map((item) => item.id));
+    return items.map((item) => ({ ...item, selected: selected.has(item.id) }));
+}
+
 const DnDFlow = () => {
     const model = useModel();
     const reactFlowWrapper = useRef(null);
@@ -341,6 +588,15 @@ const DnDFlow = () => {
 
     const [allowEdgeLoops,] = model.useState("allow_edge_loops");
     const [displaySidebar,] = model.useState("display_side_bar");
+    const [lazyNodes,] = model.useState("lazy_nodes");
+    const [readOnly,] = model.useState("read_only");
+    const readOnlyRef = useRef(readOnly);
+    readOnlyRef.current = readOnly;
+    const [collaborative,] = model.useState("collaborative");
+    const [operationSeq,] = model.useState("operation_seq");
+    // Sequence number of the last operation applied by the view
+    const seqRef = useRef(operationSeq);
+    const pythonOwned = readOnly || collaborative;
 
     const parsed_initial_nodes = JSON.parse(py_initial_nodes.toString()
         .replace(/(['"])?([a-zA-Z0-9_]+)(['"])?:/g, '"$2":')  // fix keys
@@ -351,42 +607,79 @@ const DnDFlow = () => {
         .replace(/'/g, '"') // convert single to double quotes);
     );
 
-    const [nodes, setNodes, onNodesChange] = useNodesState(parsed_initial_nodes);
-    const [edges, setEdges, onEdgesChange] = useEdgesState(parsed_initial_edges);
+    // Read only and collaborative views display the graph state owned by python
+    const [nodes, setNodes, onNodesChange] = useNodesState(pythonOwned ? py_nodes : parsed_initial_nodes);
+    const [edges, setEdges, onEdgesChange] = useEdgesState(pythonOwned ? py_edges : parsed_initial_edges);
 
     const { screenToFlowPosition, getNodes, getEdges } = useReactFlow();
     const [type] = useDnD();
+    const [series, setSeries] = useState(() => new Map());
+    // Marks of the python operations whose result was not acknowledged yet
+    const [syncMarks, setSyncMarks] = useState([]);
 
 
-    if (nodes !== py_nodes) {
+    if (!pythonOwned && nodes !== py_nodes) {
         py_setNodes(nodes);
     }
 
-    if (edges !== py_edges) {
+    if (!pythonOwned && edges !== py_edges) {
         py_setEdges(edges);
     }
 
+    // Read only views follow the python graph state, the selection stays local to the view
+    useEffect(() => {
+        if (!readOnly)
+            return;
+        setNodes((nds) => keepSelection(nds, py_nodes));
+    }, [py_nodes, readOnly]);
+
+    useEffect(() => {
+        if (!readOnly)
+            return;
+        setEdges((eds) => keepSelection(eds, py_edges));
+    }, [py_edges, readOnly]);
+
+    // Collaborative views send their edits as operations, applied by python then by all the views
+    const sendOperations = useCallback((operations) => {
+        if (operations.length !== 0)
+            model.send_msg({ action: "OPERATIONS", operations: operations });
+    }, [model]);
+
     let [item_names,] = model.useState("item_names");
     let [ports_list,] = model.useState("item_ports");
+    let [port_restrictions,] = model.useState("port_restrictions");
 
     const onConnect = useCallback(
         (params) => {
-            let sourcePort = getPortDict(params["source"], params["sourceHandle"], item_names, ports_list);
-            let targetPort = getPortDict(params["target"], params["targetHandle"], item_names, ports_list);
-
-            // Checking if the restriction name is the same
-            if (sourcePort[6] == targetPort[6]) {
-                params["style"] = { stroke: targetPort[7] };
+            let sourcePort = getPort(params["source"], params["sourceHandle"], item_names, ports_list);
+            let targetPort = getPort(params["target"], params["targetHandle"], item_names, ports_list);
+
+            // Checking if the restrictions are compatible, by id
+            if (areRestrictionsCompatible(sourcePort.restriction, targetPort.restriction, port_restrictions)) {
+                if (collaborative) {
+                    // The edge is displayed once accepted by python
+                    sendOperations([{ op: "add_edges", edges: [params] }]);
+                    return;
+                }
+                if (targetPort.restriction !== null)
+                    params["style"] = { stroke: port_restrictions[targetPort.restriction].color };
                 setEdges((eds) => addEdge(params, eds));
             }
         },
-        [setEdges, addEdge, edges, item_names, ports_list]
+        [setEdges, addEdge, edges, item_names, ports_list, port_restrictions, collaborative, sendOperations]
     );
 
     const onEdgesChangeHandler = useCallback(
         (changes) => {
             onEdgesChange(changes);
 
+            if (collaborative) {
+                const removed = changes.filter((change) => change.type === 'remove').map((change) => change.id);
+                if (removed.length !== 0)
+                    sendOperations([{ op: "remove_edges", ids: removed }]);
+                return;
+            }
+
             let new_edge = [];
             changes.forEach((change) => {
                 if (Object.hasOwn(change, 'item')) {
@@ -394,27 +687,47 @@ const DnDFlow = () => {
                 }
             });
 
-            if (new_edge.length !== 0) {
+            if (new_edge.length !== 0 && !readOnly) {
                 py_setEdges(new_edge);
             }
-        }, [py_setEdges]
+        }, [py_setEdges, readOnly, collaborative, sendOperations]
     );
 
     const onNodesChangeHandler = useCallback(
         (changes) => {
             onNodesChange(changes);
 
+            if (collaborative) {
+                // Positions are sent once the drag ends, the selection stays local to the view
+                const positions = {};
+                const removed = [];
+                changes.forEach((change) => {
+                    if (change.type === 'position' && change.dragging === false && change.position)
+                        positions[change.id] = change.position;
+                    else if (change.type === 'remove')
+                        removed.push(change.id);
+                });
+
+                const operations = [];
+                if (Object.keys(positions).length !== 0)
+                    operations.push({ op: "move", positions: positions });
+                if (removed.length !== 0)
+                    operations.push({ op: "remove_nodes", ids: removed });
+                sendOperations(operations);
+                return;
+            }
+
             let new_nodes = [];
             changes.forEach((change) => {
                 if (Object.hasOwn(change, 'item')) {
                     new_nodes.push(change.item);
                 }
             });
-            if (new_nodes.length !== 0) {
+            if (new_nodes.length !== 0 && !readOnly) {
                 py_setNodes(new_nodes);
                 model.send_msg('Node Change');
             }
-        }, [py_setNodes]
+        }, [py_setNodes, readOnly, collaborative, sendOperations]
     );
 
     const onMyTrigger = useCallback((new_nodes) => {
@@ -440,7 +753,7 @@ const DnDFlow = () => {
                 y: event.clientY,
             });
             const newNode = {
-                id: getId(),
+                id: collaborative ? `${viewId}_${getId()}` : getId(),
                 type: 'panelWidget',
                 position,
                 data: { label: `${type} node` },
@@ -454,9 +767,11 @@ const DnDFlow = () => {
                 y: newNode.position.y,
             });
 
-            setNodes((nds) => nds.concat(newNode));
+            // Collaborative views display the node once created by python
+            if (!collaborative)
+                setNodes((nds) => nds.concat(newNode));
         },
-        [screenToFlowPosition, type, setNodes]
+        [screenToFlowPosition, type, setNodes, collaborative]
     );
 
     const onDragStart = (event, nodeType) => {
@@ -471,7 +786,28 @@ const DnDFlow = () => {
     function receiveMessage(msg, setNodes, setEdges) {
         let action = msg["action"];
 
-        if (action == "NodeCreation") {
+        // Read only views receive the graph structure through the nodes and edges states
+        if (readOnlyRef.current && ["NodeCreation", "NodesRemoval", "EdgesCreation", "EdgesRemoval"].includes(action))
+            return;
+
+        if (action == "SyncMark") {
+            // Acknowledged once the updates of the previous messages are rendered and synchronized
+            setSyncMarks((marks) => marks.concat([msg["mark"]]));
+        }
+        else if (action == "NodeSeries") {
+            // Typed arrays, transferred as binary buffers
+            setSeries((previous) => {
+                const next = new Map(previous);
+                for (const [name, values] of Object.entries(msg["series"])) {
+                    if (values === null)
+                        next.delete(name);
+                    else
+                        next.set(name, values);
+                }
+                return next;
+            });
+        }
+        else if (action == "NodeCreation") {
             const node_id = msg["node_name"];
             const x = msg["x"];
             const y = msg["y"];
@@ -479,13 +815,49 @@ const DnDFlow = () => {
 
             const newNode = {
                 id: node_id,
-                type: 'panelWidget',
+                type: msg["is_parent"] ? 'group' : 'panelWidget',
                 position: { x, y },
-                data: { label: node_class_name },
+                data: { label: msg["is_parent"] ? "" : node_class_name },
+                ...msg["react_props"],
             };
 
             setNodes((nds) => nds.concat(newNode));
         }
+        else if (action == "Operations") {
+            const operations = msg["operations"].filter((operation) => operation.seq > seqRef.current);
+            if (operations.length === 0)
+                return;
+
+            if (operations[0].seq !== seqRef.current + 1) {
+                // Operations were missed, requesting the operations following the last applied one
+                model.send_msg({ action: "RESYNC", seq: seqRef.current });
+                return;
+            }
+            seqRef.current = operations[operations.length - 1].seq;
+
+            setNodes((nds) => operations.reduce(applyNodeOperation, nds));
+            setEdges((eds) => operations.reduce(applyEdgeOperation, eds));
+        }
+        else if (action == "Snapshot") {
+            // Operations no longer stored by python are replaced by its graph state
+            if (msg["seq"] <= seqRef.current)
+                return;
+            seqRef.current = msg["seq"];
+
+            setNodes((nds) => keepSelection(nds, msg["nodes"]));
+            setEdges((eds) => keepSelection(eds, msg["edges"]));
+        }
+        else if (action == "NodesUpdate") {
+            // Partial nodes properties (hidden, position, style...) merged in the current nodes
+            const updates = new Map(msg["nodes"].map((node) => [node.id, node]));
+
+            setNodes((nds) => nds.map((node) => updates.has(node.id) ? { ...node, ...updates.get(node.id) } : node));
+        }
+        else if (action == "EdgesUpdate") {
+            const updates = new Map(msg["edges"].map((edge) => [edge.id, edge]));
+
+            setEdges((eds) => eds.map((edge) => updates.has(edge.id) ? { ...edge, ...updates.get(edge.id) } : edge));
+        }
         else if (action == "NodesRemoval") {
             const nodes_list = msg["nodes_names"];
 
@@ -520,6 +892,21 @@ const DnDFlow = () => {
         });
     }, [setNodes, setEdges]); // Missing dependencies!
 
+    // Requesting the series set before the view was rendered
+    useEffect(() => {
+        model.send_msg({ action: "NODE_SERIES" });
+        // The initial graph was synchronized by the first render
+        model.send_msg({ action: "SYNC_MARK", mark: 0 });
+    }, []);
+
+    // The nodes and edges are synchronized during the render, before the effects run
+    useEffect(() => {
+        if (syncMarks.length === 0)
+            return;
+        model.send_msg({ action: "SYNC_MARK", mark: syncMarks[syncMarks.length - 1] });
+        setSyncMarks([]);
+    }, [syncMarks]);
+
     const isValidConnection = useCallback(
         (connection) => {
             if (allowEdgeLoops)
@@ -558,26 +945,32 @@ const DnDFlow = () => {
     return (
         <div className="dndflow" style={{ display: 'flex', width: '100%', height: '100%' }}>
             <div className="reactflow-wrapper" ref={reactFlowWrapper}>
-                <ReactFlow
-                    colorMode={colorMode}
-                    nodes={nodes}
-                    edges={edges}
-                    onNodesChange={onNodesChangeHandler}
-                    onEdgesChange={onEdgesChangeHandler}
-                    onConnect={onConnect}
-                    nodeTypes={nodeTypes}
-                    onDrop={onDrop}
-                    onDragStart={onDragStart}
-                    onDragOver={onDragOver}
-                    isValidConnection={isValidConnection}
-                    fitView
-                >
-                    <Controls colorMode={colorMode} />
-                    <MiniMap colorMode={colorMode} />
-                    <Background variant="dots" gap={12} size={1} />
-                </ReactFlow>
+                <SeriesContext.Provider value={series}>
+                    <ReactFlow
+                        colorMode={colorMode}
+                        nodes={nodes}
+                        edges={edges}
+                        onNodesChange={onNodesChangeHandler}
+                        onEdgesChange={onEdgesChangeHandler}
+                        onConnect={onConnect}
+                        nodeTypes={nodeTypes}
+                        onDrop={onDrop}
+                        onDragStart={onDragStart}
+                        onDragOver={onDragOver}
+                        isValidConnection={isValidConnection}
+                        onlyRenderVisibleElements={lazyNodes}
+                        nodesDraggable={!readOnly}
+                        nodesConnectable={!readOnly}
+                        deleteKeyCode={readOnly ? null : 'Backspace'}
+                        fitView
+                    >
+                        <Controls colorMode={colorMode} />
+                        <MiniMap colorMode={colorMode} />
+                        <Background variant="dots" gap={12} size={1} />
+                    </ReactFlow>
+                </SeriesContext.Provider>
             </div>
-            {displaySidebar && <Sidebar />}
+            {displaySidebar && !readOnly && <Sidebar />}
         </div>
     );
 };
@@ -1,6 +1,7 @@
 
 from pathlib import Path
-from typing import Any, Callable, Dict, List, NamedTuple, Type, Union
+from typing import Any, Callable, Dict, List, NamedTuple, Set, Tuple, Type, Union
+import numpy as np
 import panel as pn
 
 from panel.custom import Child, Children, ReactComponent, ESMEvent
@@ -8,7 +9,15 @@ import param
 
 from panel_reactflow.events import NodeCreation, NodeDeletion, NodeChange, NodeMove, NodeSelected, NodeDeselected
 from panel_reactflow.events import EdgeCreation, EdgeDeletion, EdgeSelected, EdgeDeselected, EdgeChange
-from panel_reactflow.api import ReactFlowNode, Edge, Node
+from panel_reactflow.api import ReactFlowNode, Edge, Node, NodePort, PortDirection, PortRestrictionRegistry, restriction_registry, stateful_widgets
+from panel_reactflow.collaboration import OperationLog
+from panel_reactflow.encoding import typed_array
+from panel_reactflow.history import History
+from panel_reactflow.journal import Journal
+from panel_reactflow.metrics import SyncMetrics, track
+from panel_reactflow.positions import PositionTable
+from panel_reactflow.scheduling import reachable
+from panel_reactflow.spatial import SpatialIndex
 # reactflow site : https://reactflow.dev/learn
 # reactflow github :https://github.com/xyflow/xyflow/tree/main/packages/react
 # tutorials : https://reactflow.dev/examples/
@@ -92,7 +101,27 @@ class ReactFlowGraph(ReactComponent):
         }
         ```"""
     item_ports = param.List()
-    """List of currently instanciated ports"""
+    """List of currently instanciated ports, in the same order as items. Each node ports are grouped by side such as :
+        ```
+        {
+            "top": [
+                {
+                    "name": Port name,
+                    "type": "target" for inputs, "source" for outputs,
+                    "display_name": Display the port name,
+                    "offset": Port offset or None,
+                    "connection_count": Maximum connection count or None,
+                    "restriction": Index of the port restriction in port_restrictions or None,
+                },
+            ],
+            "bottom": [...],
+            "right": [...],
+            "left": [...],
+        }
+        ```"""
+    port_restrictions = param.List()
+    """List of port restrictions referenced by the ports, as {"name": restriction name, "color": restriction color, 
+    "accepts": accepted restrictions ids} dictionnaries."""
     
     initial_nodes = param.List()
     """List of nodes as provided by the user during the Reactflow construction."""
@@ -103,9 +132,35 @@ class ReactFlowGraph(ReactComponent):
     """List of Viewables assiciated to each node."""
     item_names = param.List()
     """List of node names, in the same order as items."""
+    item_created = param.List()
+    """Whether the content of each node was created, in the same order as items."""
+    lazy_nodes = param.Boolean()
+    """Defer the creation of the nodes content until they are first rendered."""
     
+    node_overlay = param.Dict()
+    """Intensity between 0 and 1 of the overlay color displayed on each node, for example to display the nodes cost."""
+
     node_class_labels = param.List()
     """List of node class names as displayed in the sidebar."""
+    node_class_categories = param.List()
+    """List of node class categories used to group the classes in the sidebar, in the same order as node_class_labels."""
+
+    read_only = param.Boolean(constant=True)
+    """Read only graph whose structure is owned by Python: the views can't edit the graph and their selection stays local, 
+    so that a single graph can be displayed in several sessions (see shared_graph)."""
+    collaborative = param.Boolean(constant=True)
+    """Graph whose structure is owned by Python and edited by several sessions: the views send their edits as operations, 
+    applied in order by Python and sent to all the views in place of the nodes and edges lists (see shared_graph)."""
+    operation_seq = param.Integer()
+    """Sequence number of the last operation applied to the collaborative graph, from which the joining views apply the operations."""
+
+    track_metrics = param.Boolean()
+    """Count the messages and bytes exchanged with the browser in the metrics attribute."""
+    track_history = param.Boolean()
+    """Record the graph edits in the history attribute, so that they can be undone with undo and redone with redo."""
+
+    _metrics_params = ["nodes", "edges", "items", "item_names", "item_ports", "item_created", "port_restrictions", "node_overlay"]
+    """Parameters whose syncs are counted when track_metrics is set"""
 
 
     _importmap = {
@@ -134,6 +189,9 @@ class ReactFlowGraph(ReactComponent):
                     initial_edges:List[Edge] = [],
                     display_side_bar:bool = True,
                     allow_edge_loops:bool = False,
+                    lazy_nodes:bool = False,
+                    restrictions:PortRestrictionRegistry = restriction_registry,
+                    journal:Union[str, Path, None] = None,
                     **kwargs):
         """Node graph holoviz panel component
 
@@ -151,24 +209,84 @@ class ReactFlowGraph(ReactComponent):
             Display the side bar to drag and drop new nodes, by default True
         allow_edge_loops : bool, optional
             Allow to have edge loops in the graph (can lead to update infinite loops), by default False
+        lazy_nodes : bool, optional
+            Defer the call to the nodes create function until they are displayed in the graph, by default False
+        restrictions : PortRestrictionRegistry, optional
+            Registry of the port restrictions and of their compatibilities, by default the restriction_registry of panel_reactflow.api
+        journal : Union[str, Path, None], optional
+            Path of the journal file in which the graph edits are appended. If the journal exists, the graph is recovered 
+            from it in place of the initial nodes and edges, by default None
         """
         
         
         super().__init__(sizing_mode=sizing_mode, **kwargs)
 
+        self.metrics: SyncMetrics = SyncMetrics(self.name)
+        """Traffic exchanged with the browser, counted when track_metrics is set."""
+        self._received_params = set()
+        self.param.watch(self._record_syncs, self._metrics_params)
+        self.param.watch(self._update_tracking, "track_metrics")
+        self._update_tracking()
+
+        self.restrictions: PortRestrictionRegistry = restrictions
+        """Registry of the port restrictions, shared with the browser through port_restrictions."""
+        self._restrictions_version = None
+        # Restrictions registered or allowed after the graph creation are sent to the browser
+        self.restrictions.watch(self._restrictions_changed)
+
         self.nodes_classes: List[Type[ReactFlowNode]] = nodes_classes
         """Provided nodes classes that are instanciated when a node is dragged from the sidebar."""
         self.nodes_instances: List[ReactFlowNode] = []
         """All node instance in the graph."""
 
+        self.nodes_classes_by_name: Dict[str, Type[ReactFlowNode]] = {c.node_class_name: c for c in self.nodes_classes}
+        """Provided nodes classes for each node class name."""
+
+        self.group_children: Dict[str, List[str]] = {}
+        """Names of the direct children of each parent node."""
+        self.node_groups: Dict[str, str] = {}
+        """Parent node name of each child node."""
+        self.collapsed_groups: Set[str] = set()
+        """Names of the collapsed parent nodes."""
+        self._collapsed_items: Dict[str, pn.viewable.Viewable] = {}
+        self._collapsed_styles: Dict[str, Dict[str, Any]] = {}
+        self._group_styles: Dict[str, Dict[str, Any]] = {}
+        self._topology_version: int = 0
+        self._python_owned: bool = False
+
+        if self.read_only and self.collaborative:
+            raise ValueError("A graph can't be both read only and collaborative.")
+        self.operation_log: OperationLog = OperationLog()
+        """Operations applied to the collaborative graph."""
+        self._pending_operations: Union[List[Dict[str, Any]], None] = None
+        self.history: History = History(self)
+        """Edits of the graph, recorded when track_history is set."""
+        self.node_series: Dict[str, np.ndarray] = {}
+        """Numeric series displayed as sparklines in the nodes, by node name."""
+
         self.node_class_labels = [c.node_class_name for c in self.nodes_classes]
+        self.node_class_categories = [getattr(c, "node_category", "") for c in self.nodes_classes]
 
         self.display_side_bar = display_side_bar 
         self.allow_edge_loops = allow_edge_loops 
+        self.lazy_nodes = lazy_nodes
+
+        self.journal: Union[Journal, None] = None
+        """Journal of the graph edits, when a journal path is given."""
+        if journal is not None:
+            self.journal = Journal(self, journal)
+            recovered = self.journal.read()
+            if recovered is not None:
+                initial_nodes, initial_edges = recovered
 
         # Adding all nodes present in the initial nodes 
-        for node in initial_nodes:
-            self.add_node(node)
+        self.add_nodes(initial_nodes)
+
+        # The initial graph sync is not an edit
+        if self.track_history:
+            self.history.expect([NodeCreation(node.name) for node in initial_nodes] +\
+                                [EdgeCreation(e.source, e.source_handle, e.target, e.target_handle) for e in initial_edges])
+            self.history.end_expectations()
 
         # Creating the dictionnaries for ReactFlow from the Node list
         self.initial_nodes += [
@@ -189,6 +307,11 @@ class ReactFlowGraph(ReactComponent):
         # These two dictionnaries will help understanding the node graph changes
         self.old_nodes = {}
         self.old_edges = {}
+        self.positions: PositionTable = PositionTable()
+        """Nodes positions and selection flags as last synchronized by the browser."""
+        self.spatial: SpatialIndex = SpatialIndex()
+        """Grid index of the nodes absolute positions, as last synchronized by the browser."""
+        self._group_names = set()
 
         self.edge_selection_callback = None
         """Function called when an edge is selected, can be set by calling set_on_edge_selection"""
@@ -213,6 +336,20 @@ class ReactFlowGraph(ReactComponent):
             EdgeChange : []
         }
         """Registered callbacks per event type"""
+        self._rf_event__batch_callbacks:Dict[Union[Type[NodeChange], Type[EdgeChange]], List[Callable]] = {
+            event : [] for event in self._rf_event__callbacks
+        }
+        """Registered batch callbacks per event type"""
+
+        if self.read_only or self.collaborative:
+            # No view synchronizes the graph state, python sets it in place of the browser
+            self.nodes = [node.to_reactflow() for node in initial_nodes]
+            self.edges = [self._edge_to_string(edge) for edge in initial_edges]
+        self._python_owned = self.read_only or self.collaborative
+
+        if self.journal is not None:
+            # Compacting the recovered journal, the graph being synchronized later by the browser
+            self.journal.snapshot(initial_nodes, initial_edges)
 
     def _edge_to_string(self, edge:Edge):
         """Checks the Edge and prepares the dictionnary understood by reactflow
@@ -267,22 +404,15 @@ class ReactFlowGraph(ReactComponent):
             **edge.react_props
         }
 
-        if source_port.restriction is  None and target_port.restriction is not None:
-            raise ValueError("Tried plugging ports that have different restrictions, found:\n" \
-            f"Node {edge.source} - Port {edge.source_handle} : No restriction found\n" \
-            f"Node {edge.target} - Port {edge.target_handle} : Restriction {target_port.restriction.name}\n")
-        
-        if source_port.restriction is not None and target_port.restriction is None:
-            raise ValueError("Tried plugging ports that have different restrictions, found:\n" \
-            f"Node {edge.source} - Port {edge.source_handle} : Restriction {source_port.restriction.name}\n" \
-            f"Node {edge.target} - Port {edge.target_handle} : No restriction found\n")
-
-        if source_port.restriction is not None and \
-            target_port.restriction is not None and \
-            (not source_port.restriction.name == target_port.restriction.name):
-            raise ValueError("Tried plugging ports that have different restrictions, found:\n" \
-            f"Node {edge.source} - Port {edge.source_handle} : Restriction {source_port.restriction.name}\n" \
-            f"Node {edge.target} - Port {edge.target_handle} : Restriction {target_port.restriction.name}\n")
+        source_restriction = self.restrictions.intern(source_port.restriction)
+        target_restriction = self.restrictions.intern(target_port.restriction)
+
+        if not self.restrictions.is_compatible(source_restriction, target_restriction):
+            source_description = "No restriction found" if source_port.restriction is None else f"Restriction {source_port.restriction.name}"
+            target_description = "No restriction found" if target_port.restriction is None else f"Restriction {target_port.restriction.name}"
+            raise ValueError("Tried plugging ports that have incompatible restrictions, found:\n" \
+            f"Node {edge.source} - Port {edge.source_handle} : {source_description}\n" \
+            f"Node {edge.target} - Port {edge.target_handle} : {target_description}\n")
 
         if source_port.restriction is not None:
             edge_dict["style"] = {"stroke":source_port.restriction.color}
@@ -297,23 +427,205 @@ class ReactFlowGraph(ReactComponent):
         data : Dict[str, Any]
             Message content
         """
+        if self.track_metrics:
+            self.metrics.record_message(data)
+
+        if not isinstance(data, dict):
+            return
+
         action = data["action"]
 
-        if action == "NEW_NODE":
+        if action == "RENDER_NODE":
+            if data["node_id"] in self.item_names:
+                self.expand_node(data["node_id"])
+
+        elif action == "NEW_NODE":
             node_id= data["node_id"]
             node_type= data["type"]
             x= data["x"]
             y= data["y"]
 
-            for c in self.nodes_classes:
-                if c.node_class_name == node_type:
-                    print(f"Creating node of type {node_type}")
+            if node_type in self.nodes_classes_by_name and not node_id in self.item_names:
+                node = self.nodes_classes_by_name[node_type]()
+                node.name = f"{node_id}"
+                node_instance = Node(f"{node_id}", node, x, y)
+                self.add_node(node_instance)
+
+        elif action == "NODE_SERIES":
+            # Series set before the view was rendered
+            if self.node_series:
+                self._send_event(ESMEvent, data={"action":"NodeSeries", "series":dict(self.node_series)})
+
+        elif action == "SYNC_MARK":
+            # The view synchronized the result of the operations sent before the mark
+            self.history.synced(data["mark"])
+
+        elif action == "OPERATIONS" and self.collaborative:
+            self._apply_operations(data["operations"])
+
+        elif action == "RESYNC" and self.collaborative:
+            operations = self.operation_log.since(data["seq"])
+            if operations is None:
+                self._send_event(ESMEvent, data={"action":"Snapshot", "seq":self.operation_seq, "nodes":self.nodes, "edges":self.edges})
+            else:
+                self._send_event(ESMEvent, data={"action":"Operations", "operations":operations})
+
+    def _commit(self, operation:Dict[str, Any], **state:List[Dict[str, Any]]):
+        """Sets the graph state owned by python. In a collaborative graph, the operation is numbered in the operation log and sent 
+        to the views, the nodes and edges lists being updated without being synchronized.
+
+        Parameters
+        ----------
+        operation : Dict[str, Any]
+            Operation leading to the new state
+        state : List[Dict[str, Any]]
+            New nodes and/or edges lists
+        """
+        if not self.collaborative:
+            self.param.update(**state)
+            return
+
+        entry = self.operation_log.append(operation)
+        with param.discard_events(self):
+            self.param.update(operation_seq=entry["seq"], **state)
+        self.update_nodes(None)
+
+        if self._pending_operations is None:
+            self._send_event(ESMEvent, data={"action":"Operations", "operations":[entry]})
+        else:
+            self._pending_operations.append(entry)
+
+    def _apply_operations(self, operations:List[Dict[str, Any]]):
+        """Applies the operations received from a view of the collaborative graph, the resulting operations being sent to all the views 
+        in a single message. The operations made invalid by the operations of other views (move of a deleted node, edge plugged to 
+        a deleted node or creating a loop...) are dropped.
+
+        Parameters
+        ----------
+        operations : List[Dict[str, Any]]
+            Operations edited in the view
+        """
+        self._pending_operations = []
+        try:
+            for operation in operations:
+                kind = operation.get("op")
+
+                if kind == "move":
+                    positions = {name: position for name, position in operation["positions"].items() if name in self.item_names}
+                    if positions:
+                        self._commit({"op":"move", "positions":positions}, 
+                                        nodes=[{**n, "position":positions[n["id"]]} if n["id"] in positions else n for n in self.nodes])
+
+                elif kind == "remove_nodes":
+                    names = [name for name in operation["ids"] if name in self.item_names]
+                    if names:
+                        self.remove_nodes(names)
+
+                elif kind == "add_edges":
+                    for edge in operation["edges"]:
+                        edge = Edge(edge["source"], edge["sourceHandle"], edge["target"], edge["targetHandle"])
+                        if self._accepts_edge(edge):
+                            self.add_edges([edge])
+
+                elif kind == "remove_edges":
+                    ids = set(operation["ids"])
+                    removed = [Edge(e["source"], e["sourceHandle"], e["target"], e["targetHandle"]) for e in self.edges if e["id"] in ids]
+                    if removed:
+                        self.remove_edges(removed)
+        finally:
+            entries, self._pending_operations = self._pending_operations, None
+
+        if entries:
+            self._send_event(ESMEvent, data={"action":"Operations", "operations":entries})
+
+    def _accepts_edge(self, edge:Edge) -> bool:
+        """Checks an edge created in a view against the current graph state
+
+        Parameters
+        ----------
+        edge : Edge
+            Created edge
+
+        Returns
+        -------
+        bool
+            Whether the edge can be added
+        """
+        if not edge.source in self.item_names or not edge.target in self.item_names:
+            return False
+        if edge in self.get_edges():
+            return False
+
+        source_ports = self._ports(edge.source)
+        target_ports = self._ports(edge.target)
+        if not edge.source_handle in source_ports or not edge.target_handle in target_ports:
+            return False
+        if not self.restrictions.is_compatible(source_ports[edge.source_handle]["restriction"], target_ports[edge.target_handle]["restriction"]):
+            return False
+
+        limit = target_ports[edge.target_handle]["connection_count"]
+        if limit is not None and sum(1 for e in self.edges if e["target"] == edge.target and e["targetHandle"] == edge.target_handle) >= limit:
+            return False
+
+        if not self.allow_edge_loops:
+            successors:Dict[str, List[str]] = {}
+            for e in self.edges:
+                successors.setdefault(e["source"], []).append(e["target"])
+            if edge.source in reachable([edge.target], lambda name: successors.get(name, [])):
+                return False
+        return True
+
+    def _send_event(self, Event, **event_kwargs:Any):
+        """Sends an event to the browser, counting it when track_metrics is set.
+
+        Parameters
+        ----------
+        Event : Type[ModelEvent]
+            Event class, ESMEvent for the messages received by model.on('msg:custom')
+        """
+        if self.track_metrics:
+            self.metrics.record_event(event_kwargs.get("data"))
+        super()._send_event(Event, **event_kwargs)
+
+    def _process_events(self, events:Dict[str, Any]):
+        """Applies the parameters changes received from the browser, flagging them for the metrics.
+
+        Parameters
+        ----------
+        events : Dict[str, Any]
+            Changed values for each parameter name
+        """
+        self._received_params = set(events)
+        try:
+            super()._process_events(events)
+        finally:
+            self._received_params = set()
+
+    def _record_syncs(self, *events:param.parameterized.Event):
+        """Counts the synchronized parameters changes when track_metrics is set
+
+        Parameters
+        ----------
+        events : param.parameterized.Event
+            Parameters changes
+        """
+        if not self.track_metrics:
+            return
+
+        for event in events:
+            # Children are serialized as Bokeh models, their size is not measured
+            self.metrics.record_param(event.name, event.new, event.name in self._received_params, measure=event.name != "items")
+
+    def _update_tracking(self, _:param.parameterized.Event = None):
+        """Lists the graph metrics in the admin plugin when track_metrics is set.
 
-                    node = c()
-                    node.name = f"{node_id}"
-                    node_instance = Node(f"{node_id}", node, x, y)
-                    self.add_node(node_instance)
-                    
+        Parameters
+        ----------
+        _ : param.parameterized.Event, optional
+            Triggering event, by default None
+        """
+        if self.track_metrics:
+            track(self.metrics)
 
     def print_state(self, _=None):
         """Printing the list of nodes
@@ -343,34 +655,168 @@ class ReactFlowGraph(ReactComponent):
         node : Node
             Node to store
         """
-        node.node.name = node.name
-        self.nodes_instances.append(node.node)
-
-        self.items = self.items + [node.node.create()]
-        self.item_names = self.item_names + [node.name]
-        self.item_ports = self.item_ports + [[
-                                                [
-                                                    p.direction.value, 
-                                                    p.position.value, 
-                                                    p.name, 
-                                                    p.display_name, 
-                                                    p.offset, 
-                                                    p.connection_count_limit,
-                                                    p.restriction.name if p.restriction is not None else None,  
-                                                    p.restriction.color if p.restriction is not None else None,  
-                                                ] for p in node.node.ports]]
+        self.add_nodes([node])
 
-        self._send_event(ESMEvent, data={
-                                            "action":f"NodeCreation",
-                                            "node_name":node.name,
-                                            "x":node.x,
-                                            "y":node.y,
-                                            "node_class_name":node.node.node_class_name
-                                         })
+    def add_nodes(self, nodes:List[Node]):
+        """Adds nodes to the graph, the class attributes synchronized with the browser being updated once for all the nodes
+
+        Parameters
+        ----------
+        nodes : List[Node]
+            Nodes to store
+        """
+        items = []
+        item_ports = []
+        for node in nodes:
+            node.node.name = node.name
+            self.nodes_instances.append(node.node)
+            if self.read_only:
+                # The node instances are shared by the views, the inputs of a viewer would change the other views
+                for widget in stateful_widgets(node.node).values():
+                    widget.disabled = True
+            self.history.track_node(node.name, node.node)
+            if self.journal is not None:
+                self.journal.track_node(node.node)
+
+            if node.is_parent:
+                self.group_children.setdefault(node.name, [])
+                self._group_styles[node.name] = node.react_props.get("style", {})
+            parent = node.react_props.get("parentId")
+            if parent is not None:
+                self.node_groups[node.name] = parent
+                self.group_children.setdefault(parent, []).append(node.name)
+
+            if self.lazy_nodes:
+                # Cheap placeholder, replaced by the node content when the node is first rendered
+                items.append(pn.Spacer(width=0, height=0))
+            else:
+                items.append(node.node.create())
+            item_ports.append(self._make_port_table(node.node.ports))
+        self._topology_version += 1
+
+        self.items = self.items + items
+        self.item_created = self.item_created + [not self.lazy_nodes] * len(nodes)
+        self.item_names = self.item_names + [node.name for node in nodes]
+        self.item_ports = self.item_ports + item_ports
+
+        if self._python_owned:
+            reactflow_nodes = [node.to_reactflow() for node in nodes]
+            self._commit({"op":"add_nodes", "nodes":reactflow_nodes}, nodes=self.nodes + reactflow_nodes)
+
+        if not self.collaborative:
+            for node in nodes:
+                self._send_event(ESMEvent, data={
+                                                    "action":f"NodeCreation",
+                                                    "node_name":node.name,
+                                                    "x":node.x,
+                                                    "y":node.y,
+                                                    "node_class_name":node.node.node_class_name,
+                                                    "is_parent":node.is_parent,
+                                                    "react_props":node.react_props,
+                                                 })
+
+    def _sync_restrictions(self, ):
+        """Sends the port restrictions to the browser if the registry changed since the last call.
+        """
+        if self._restrictions_version != self.restrictions.version:
+            self._restrictions_version = self.restrictions.version
+            self.port_restrictions = self.restrictions.to_reactflow()
+
+    def _restrictions_changed(self, ):
+        """Registry watcher. The default registry is shared by the process and can be changed by any session: 
+        unless the change comes from a session displaying the graph, the restrictions are synchronized on the next tick 
+        of a document displaying the graph, under its lock.
+        """
+        documents = [
+                        model.document for model, _ in self._models.values() 
+                        if model.document is not None and model.document.session_context is not None
+                    ]
+        if not documents or pn.state.curdoc in documents:
+            self._sync_restrictions()
+        else:
+            documents[0].add_next_tick_callback(self._sync_restrictions)
+
+    def _make_port_table(self, ports:List[NodePort]) -> Dict[str, List[Dict[str, Any]]]:
+        """Prepares the ports description understood by reactflow, grouped by side of the node
+
+        Parameters
+        ----------
+        ports : List[NodePort]
+            Node ports
+
+        Returns
+        -------
+        Dict[str, List[Dict[str, Any]]]
+            Ports description for each side of the node
+        """
+        port_table = {"top":[], "bottom":[], "right":[], "left":[]}
+
+        for p in ports:
+            port_table[p.position.name.lower()].append({
+                "name":p.name,
+                "type":"target" if p.direction == PortDirection.INPUT else "source",
+                "display_name":p.display_name,
+                "offset":p.offset,
+                "connection_count":p.connection_count_limit,
+                "restriction":self.restrictions.intern(p.restriction),
+            })
+
+        self._sync_restrictions()
+        return port_table
+
+    def _ports(self, node_name:str) -> Dict[str, Dict[str, Any]]:
+        """Returns the ports description of a node
+
+        Parameters
+        ----------
+        node_name : str
+            Node name
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            Ports description for each port name
+        """
+        port_table = self.item_ports[self.item_names.index(node_name)]
+        return {p["name"]:p for side in port_table.values() for p in side}
+
+    def expand_node(self, node_name:str):
+        """Creates the content of a node whose creation was deferred by the lazy_nodes option.
+
+        Parameters
+        ----------
+        node_name : str
+            Name of the node to expand
+        """
+        if not node_name in self.item_names:
+            raise ValueError(f"Node {node_name} expansion requested, node name unknown.")
+
+        node_index = self.item_names.index(node_name)
+        if self.item_created[node_index]:
+            return
+
+        items = list(self.items)
+        items[node_index] = self.nodes_instances[node_index].create()
+        item_created = list(self.item_created)
+        item_created[node_index] = True
+
+        self.items = items
+        self.item_created = item_created
 
     def remove_nodes(self, nodes:List[str]):
         """Removes the given nodes from the graph
 
+        Parameters
+        ----------
+        nodes : List[str]
+            List of nodes names to remove
+        """
+        self._remove_nodes(nodes)
+
+    def _remove_nodes(self, nodes:List[str]):
+        """Removes the given nodes from the graph, without the node deletion hooks of the subclasses 
+        (used to replace a node instance that stays alive, such as a node restored by the history)
+
         Parameters
         ----------
         nodes : List[str]
@@ -382,17 +828,193 @@ class ReactFlowGraph(ReactComponent):
             if not node in self.item_names:
                 raise ValueError(f"Node {node} deletion requested, node name unknown.")
             
-        self._send_event(ESMEvent, data={
-                                            "action":f"NodesRemoval",
-                                            "nodes_names":nodes,
-                                         })
+        if not self.collaborative:
+            self._send_event(ESMEvent, data={
+                                                "action":f"NodesRemoval",
+                                                "nodes_names":nodes,
+                                             })
         
+        removed_series = {node: None for node in nodes if node in self.node_series}
+        if removed_series:
+            self.set_node_series(removed_series)
+
         for node in nodes:
             node_index = self.item_names.index(node)
 
             self.items.pop(node_index)
             self.item_names.pop(node_index)
+            self.item_created.pop(node_index)
             self.item_ports.pop(node_index)
+            self.nodes_instances.pop(node_index)
+            self._unindex_group(node)
+        self._topology_version += 1
+
+        if self._python_owned:
+            # The edges plugged to the removed nodes are removed with them
+            self._commit({"op":"remove_nodes", "ids":nodes}, 
+                            nodes=[n for n in self.nodes if not n["id"] in nodes],
+                            edges=[e for e in self.edges if not (e["source"] in nodes or e["target"] in nodes)])
+
+    def _unindex_group(self, node_name:str):
+        """Removes a deleted node from the groups index
+
+        Parameters
+        ----------
+        node_name : str
+            Deleted node name
+        """
+        parent = self.node_groups.pop(node_name, None)
+        if parent is not None and parent in self.group_children:
+            self.group_children[parent].remove(node_name)
+
+        for child in self.group_children.pop(node_name, []):
+            del self.node_groups[child]
+
+        self.collapsed_groups.discard(node_name)
+        self._collapsed_items.pop(node_name, None)
+        self._group_styles.pop(node_name, None)
+        self._collapsed_styles.pop(node_name, None)
+
+    def get_group_nodes(self, group:str) -> List[str]:
+        """Returns the nodes contained in a parent node, including the content of the nested parent nodes
+
+        Parameters
+        ----------
+        group : str
+            Parent node name
+
+        Returns
+        -------
+        List[str]
+            Contained nodes names, parents before their children
+        """
+        if not group in self.group_children:
+            raise ValueError(f"Node {group} is not a parent node.")
+
+        contained = []
+        for child in self.group_children[group]:
+            contained.append(child)
+            if child in self.group_children:
+                contained += self.get_group_nodes(child)
+        return contained
+
+    def collapse_group(self, group:str, width:float = 150., height:float = 40.):
+        """Collapses a parent node : its content is hidden in the graph and the children Viewables are replaced 
+        by placeholders, so that they are no longer synchronized with the browser until the group is expanded.
+
+        Parameters
+        ----------
+        group : str
+            Parent node name
+        width : float, optional
+            Width of the collapsed parent node, by default 150.
+        height : float, optional
+            Height of the collapsed parent node, by default 40.
+        """
+        if group in self.collapsed_groups:
+            return
+
+        contained = self.get_group_nodes(group)
+        self.collapsed_groups.add(group)
+        self._topology_version += 1
+
+        # Contained nodes may already be hidden by a collapsed nested group
+        items = list(self.items)
+        for name in contained:
+            if not name in self._collapsed_items:
+                node_index = self.item_names.index(name)
+                self._collapsed_items[name] = items[node_index]
+                items[node_index] = pn.Spacer(width=0, height=0)
+        self.items = items
+
+        # Style as last synchronized by the browser, or given at the node creation
+        style = dict(self.old_nodes.get(group, {}).get("style") or self._group_styles.get(group, {}))
+        self._collapsed_styles[group] = style
+
+        self._send_event(ESMEvent, data={
+                                            "action":"NodesUpdate",
+                                            "nodes":[{"id":group, "style":{**style, "width":width, "height":height}}] +\
+                                                    [{"id":name, "hidden":True} for name in contained],
+                                         })
+        self._send_event(ESMEvent, data={
+                                            "action":"EdgesUpdate",
+                                            "edges":[{"id":e["id"], "hidden":True} for e in self.edges if e["source"] in contained or e["target"] in contained],
+                                         })
+
+    def expand_group(self, group:str):
+        """Expands a collapsed parent node, restoring the display and the synchronization of its content.
+
+        Parameters
+        ----------
+        group : str
+            Parent node name
+        """
+        if not group in self.collapsed_groups:
+            return
+
+        self.collapsed_groups.discard(group)
+        self._topology_version += 1
+        style = self._collapsed_styles.pop(group)
+
+        # Content of the collapsed nested groups stays hidden
+        hidden = set()
+        for nested in self.collapsed_groups:
+            if nested in self.get_group_nodes(group):
+                hidden.update(self.get_group_nodes(nested))
+        shown = [name for name in self.get_group_nodes(group) if not name in hidden]
+
+        items = list(self.items)
+        for name in shown:
+            items[self.item_names.index(name)] = self._collapsed_items.pop(name)
+        self.items = items
+
+        self._send_event(ESMEvent, data={
+                                            "action":"NodesUpdate",
+                                            "nodes":[{"id":group, "style":style}] + [{"id":name, "hidden":False} for name in shown],
+                                         })
+        self._send_event(ESMEvent, data={
+                                            "action":"EdgesUpdate",
+                                            "edges":[
+                                                {"id":e["id"], "hidden":False} for e in self.edges 
+                                                if (e["source"] in shown or e["target"] in shown) and not (e["source"] in hidden or e["target"] in hidden)
+                                            ],
+                                         })
+
+    def move_group(self, group:str, x:float, y:float):
+        """Moves a parent node and its content in a single update, the children positions being relative to their parent.
+
+        Parameters
+        ----------
+        group : str
+            Parent node name
+        x : float
+            New X coordinate
+        y : float
+            New Y coordinate
+        """
+        if not group in self.group_children:
+            raise ValueError(f"Node {group} is not a parent node.")
+
+        self._move_nodes({group:(x, y)})
+
+    def _move_nodes(self, positions:Dict[str, Tuple[float, float]]):
+        """Moves nodes in the graph
+
+        Parameters
+        ----------
+        positions : Dict[str, Tuple[float, float]]
+            New X and Y coordinates of each moved node, relative to its parent if any
+        """
+        positions = {name: {"x":x, "y":y} for name, (x, y) in positions.items()}
+
+        if self._python_owned:
+            self._commit({"op":"move", "positions":positions}, nodes=[{**n, "position":positions[n["id"]]} if n["id"] in positions else n for n in self.nodes])
+
+        if not self.collaborative:
+            self._send_event(ESMEvent, data={
+                                                "action":"NodesUpdate",
+                                                "nodes":[{"id":name, "position":position} for name, position in positions.items()],
+                                             })
 
     def add_edges(self, edges:List[Edge]):
         """Adds edges to the graph
@@ -401,6 +1023,11 @@ class ReactFlowGraph(ReactComponent):
         ----------
         edges : List[Edge]
             Added edges
+
+        Raises
+        ------
+        ValueError
+            Unknown node or port, or incompatible ports restrictions
         """
         for edge in edges:
             if not edge.source in self.item_names:
@@ -408,32 +1035,37 @@ class ReactFlowGraph(ReactComponent):
             if not edge.target in self.item_names:
                 raise ValueError(f"Edge target node {edge.target} not present in the nodes list.")
             
-            source_ports = [
-                p[2]
-                for p in self.item_ports[self.item_names.index(edge.source)]
-            ]
-            target_ports = [
-                p[2]
-                for p in self.item_ports[self.item_names.index(edge.target)]
-            ]
+            source_ports = self._ports(edge.source)
+            target_ports = self._ports(edge.target)
             if not edge.source_handle in source_ports:
-                raise ValueError(f"Edge source handle {edge.source_handle} not present in the node {edge.source} handles, found ports : {source_ports}.")
+                raise ValueError(f"Edge source handle {edge.source_handle} not present in the node {edge.source} handles, found ports : {list(source_ports)}.")
             if not edge.target_handle in target_ports:
-                raise ValueError(f"Edge target handle {edge.target_handle} not present in the node {edge.target} handles, found ports : {target_ports}.")
-
-        self._send_event(ESMEvent, data={
-                                            "action":f"EdgesCreation",
-                                            "edges":[
-                                                {
-                                                    "id":":".join([e.source, e.source_handle, e.target, e.target_handle]),
-                                                    "source":e.source,
-                                                    "sourceHandle":e.source_handle,
-                                                    "target":e.target,
-                                                    "targetHandle":e.target_handle,
-                                                }
-                                                for e in edges
-                                            ]
-                                         })
+                raise ValueError(f"Edge target handle {edge.target_handle} not present in the node {edge.target} handles, found ports : {list(target_ports)}.")
+
+            if not self.restrictions.is_compatible(source_ports[edge.source_handle]["restriction"], target_ports[edge.target_handle]["restriction"]):
+                raise ValueError(f"Edge from {edge.source} - {edge.source_handle} to {edge.target} - {edge.target_handle} "
+                                 "plugs ports that have incompatible restrictions.")
+
+        self._sync_restrictions()
+
+        if not self.collaborative:
+            self._send_event(ESMEvent, data={
+                                                "action":f"EdgesCreation",
+                                                "edges":[
+                                                    {
+                                                        "id":":".join([e.source, e.source_handle, e.target, e.target_handle]),
+                                                        "source":e.source,
+                                                        "sourceHandle":e.source_handle,
+                                                        "target":e.target,
+                                                        "targetHandle":e.target_handle,
+                                                    }
+                                                    for e in edges
+                                                ]
+                                             })
+
+        if self._python_owned:
+            added = [self._edge_to_string(e) for e in edges]
+            self._commit({"op":"add_edges", "edges":added}, edges=self.edges + added)
 
     def remove_edges(self, edges:List[Edge]):
         """Removes the given edges from the graph
@@ -447,18 +1079,23 @@ class ReactFlowGraph(ReactComponent):
             if not edge in self.get_edges():
                 raise ValueError(f"Edge {edge} not in the current edges list.")
             
-        self._send_event(ESMEvent, data={
-                                            "action":f"EdgesRemoval",
-                                            "edges":[
-                                                {
-                                                    "source" : e.source, 
-                                                    "sourceHandle" : e.source_handle, 
-                                                    "target" : e.target, 
-                                                    "targetHandle" : e.target_handle
-                                                }
-                                                for e in edges
-                                            ],
-                                         })
+        if not self.collaborative:
+            self._send_event(ESMEvent, data={
+                                                "action":f"EdgesRemoval",
+                                                "edges":[
+                                                    {
+                                                        "source" : e.source, 
+                                                        "sourceHandle" : e.source_handle, 
+                                                        "target" : e.target, 
+                                                        "targetHandle" : e.target_handle
+                                                    }
+                                                    for e in edges
+                                                ],
+                                             })
+
+        if self._python_owned:
+            removed = [e["id"] for e in self.edges if Edge(e["source"], e["sourceHandle"], e["target"], e["targetHandle"]) in edges]
+            self._commit({"op":"remove_edges", "ids":removed}, edges=[e for e in self.edges if not e["id"] in removed])
 
     def clear(self,):
         """Clears the node graph.
@@ -484,31 +1121,38 @@ class ReactFlowGraph(ReactComponent):
         List[NodeChange] 
             List of node changes
         """
-        node_changes:List[NodeChange] = []
-        for node in new_node_dict:
-            if not node in self.old_nodes:
-                node_changes.append(NodeCreation(node))
-
-        for node in self.old_nodes:
-            if node in new_node_dict:
-                new = new_node_dict[node]
-                old = self.old_nodes[node]
+        node_changes = self.positions.diff(new_node_dict)
+        self._index_nodes(node_changes, new_node_dict)
+        return node_changes
 
-                if old["position"]["x"] != new["position"]["x"] or\
-                        old["position"]["y"] != new["position"]["y"]:
-                    node_changes.append(NodeMove(node, new["position"]["x"], new["position"]["y"], old["position"]["x"], old["position"]["y"]))
-                if "selected" in new:
-                    if new["selected"]:
-                        if (not "selected" in old) or not old["selected"]:
-                            node_changes.append(NodeSelected(node))
-                    else:
-                        if "selected" in old and old["selected"]:
-                            node_changes.append(NodeDeselected(node))
+    def _index_nodes(self, node_changes:List[NodeChange], new_node_dict:Dict[str, Any]):
+        """Updates the spatial index from the node changes of a sync
 
-            else:
-                node_changes.append(NodeDeletion(node))
-        
-        return node_changes
+        Parameters
+        ----------
+        node_changes : List[NodeChange]
+            Node changes found in the sync
+        new_node_dict : Dict[str, Any]
+            Dictionnary containing the nodes parameters for each node name
+        """
+        for node_change in node_changes:
+            if isinstance(node_change, NodeMove):
+                self.spatial.move(node_change.node_name, node_change.new_x, node_change.new_y)
+            elif isinstance(node_change, NodeCreation):
+                node = new_node_dict[node_change.node_name]
+                self.spatial.insert(node_change.node_name, node["position"]["x"], node["position"]["y"], node.get("parentId"))
+                if node.get("type") == "group":
+                    self._group_names.add(node_change.node_name)
+            elif isinstance(node_change, NodeDeletion):
+                self.spatial.remove(node_change.node_name)
+                self._group_names.discard(node_change.node_name)
+
+        # Groups sizes are only known once measured by reactflow
+        for name in self._group_names:
+            node = new_node_dict[name]
+            size = node.get("measured") or node.get("style") or {}
+            if size.get("width") is not None and size.get("height") is not None:
+                self.spatial.set_size(name, size["width"], size["height"])
 
     def _check_edge_change(self, new_edge_dict:Dict[str, Any]) -> List[EdgeChange] :
         """Checks if and what changed in the edges list
@@ -569,7 +1213,112 @@ class ReactFlowGraph(ReactComponent):
         """
         return [Edge(e["source"], e["sourceHandle"], e["target"], e["targetHandle"]) for e in self.edges]
         
-    def on_event(self, event:Union[Type[NodeChange], Type[EdgeChange]], callback:Callable):
+    def get_positions(self,) -> Tuple[List[str], np.ndarray]:
+        """Returns the nodes positions as last synchronized by the browser
+
+        Returns
+        -------
+        Tuple[List[str], np.ndarray]
+            Nodes names and (n, 2) array of their X and Y coordinates
+        """
+        return self.positions.as_array()
+        
+    def get_nodes_in_region(self, x0:float, y0:float, x1:float, y1:float) -> List[str]:
+        """Returns the nodes whose absolute position is inside a rectangle of the graph
+
+        Parameters
+        ----------
+        x0 : float
+            Left coordinate
+        y0 : float
+            Top coordinate
+        x1 : float
+            Right coordinate
+        y1 : float
+            Bottom coordinate
+
+        Returns
+        -------
+        List[str]
+            Nodes names
+        """
+        return self.spatial.region(x0, y0, x1, y1)
+
+    def get_nearest_nodes(self, x:float, y:float, k:int = 1) -> List[str]:
+        """Returns the nodes closest to a point of the graph
+
+        Parameters
+        ----------
+        x : float
+            X coordinate
+        y : float
+            Y coordinate
+        k : int, optional
+            Number of nodes to return, by default 1
+
+        Returns
+        -------
+        List[str]
+            Nodes names, from the closest to the farthest
+        """
+        return self.spatial.nearest(x, y, k)
+
+    def get_groups_at(self, x:float, y:float) -> List[str]:
+        """Returns the group nodes containing a point of the graph
+
+        Parameters
+        ----------
+        x : float
+            X coordinate
+        y : float
+            Y coordinate
+
+        Returns
+        -------
+        List[str]
+            Group nodes names, from the innermost to the outermost
+        """
+        return self.spatial.groups_at(x, y)
+        
+    def set_node_series(self, series:Dict[str, Union[np.ndarray, None]]):
+        """Displays numeric series as sparklines in the nodes, for example the values of a node output. The series are 
+        sent to the browser as binary typed arrays rather than json lists, and downsampled to the sparkline width
+        by the browser, so that series of millions of points are transferred at memory copy speed.
+
+        Parameters
+        ----------
+        series : Dict[str, Union[np.ndarray, None]]
+            Numeric series of each node name, None removing the node sparkline
+
+        Raises
+        ------
+        ValueError
+            Unknown node name or non numeric series
+        """
+        for name in series:
+            if not name in self.item_names:
+                raise ValueError(f"Series given for the node {name}, node name unknown.")
+
+        payload:Dict[str, Union[np.ndarray, None]] = {}
+        for name, values in series.items():
+            if values is None:
+                self.node_series.pop(name, None)
+                payload[name] = None
+            else:
+                self.node_series[name] = payload[name] = typed_array(values).reshape(-1)
+        self._send_event(ESMEvent, data={"action":"NodeSeries", "series":payload})
+
+    def undo(self, ):
+        """Undoes the last edit recorded in the history, when track_history is set.
+        """
+        self.history.undo()
+
+    def redo(self, ):
+        """Redoes the last undone edit.
+        """
+        self.history.redo()
+
+    def on_event(self, event:Union[Type[NodeChange], Type[EdgeChange]], callback:Callable, batch:bool = False):
         """Registering a callback for the provided event type
 
         Parameters
@@ -578,13 +1327,49 @@ class ReactFlowGraph(ReactComponent):
             event type
         callback : Callable
             function to call (takes the NodeChange/EdgeChange as argument)
+        batch : bool, optional
+            Call the function once per graph sync with the list of the changes of this type, by default False. 
+            Batch callbacks registered for NodeChange or EdgeChange receive all the node or edge changes of the sync.
         """
-        if issubclass(event, NodeChange) or issubclass(event, EdgeChange):
-            self._rf_event__callbacks[event].append(callback)
+        if isinstance(event, type) and (issubclass(event, NodeChange) or issubclass(event, EdgeChange)):
+            if batch:
+                self._rf_event__batch_callbacks[event].append(callback)
+            else:
+                self._rf_event__callbacks[event].append(callback)
 
         else:
             super().on_event(event, callback)
 
+    def _dispatch_changes(self, changes:List[Union[NodeChange, EdgeChange]]):
+        """Calls the callbacks registered for the changes found in a graph sync
+
+        Parameters
+        ----------
+        changes : List[Union[NodeChange, EdgeChange]]
+            Node and edge changes of the sync
+        """
+        if self.track_metrics:
+            self.metrics.record_changes(changes)
+        if self.track_history:
+            self.history.record(changes)
+        if self.journal is not None:
+            self.journal.record(changes)
+
+        for change in changes:
+            for callback in self._rf_event__callbacks[change.__class__]:
+                callback(change)
+
+        # Grouping the changes by type only when batch callbacks are registered
+        if any(self._rf_event__batch_callbacks.values()):
+            batches:Dict[Union[Type[NodeChange], Type[EdgeChange]], List[Union[NodeChange, EdgeChange]]] = {}
+            for change in changes:
+                batches.setdefault(change.__class__, []).append(change)
+                batches.setdefault(NodeChange if isinstance(change, NodeChange) else EdgeChange, []).append(change)
+
+            for event, batch in batches.items():
+                for callback in self._rf_event__batch_callbacks[event]:
+                    callback(batch)
+
             
     def update_nodes(self, _:param.parameterized.Event):
         """Updates the nodes based on the noticed changes in the graph
@@ -599,17 +1384,39 @@ class ReactFlowGraph(ReactComponent):
 
         node_changes = self._check_node_change(node_dict)
         edge_changes = self._check_edge_change(edge_dict)
-        
+
         # Calling every registered callbacks
-        for node_change in node_changes:
-            for callback in self._rf_event__callbacks[node_change.__class__]:
-                callback(node_change)
-                
-        for edge_change in edge_changes:
-            for callback in self._rf_event__callbacks[edge_change.__class__]:
-                callback(edge_change)
+        self._dispatch_changes(node_changes + edge_changes)
                 
         # Storing the current node and edge state for next call
         self.old_nodes = node_dict
         self.old_edges = edge_dict
-         
\ No newline at end of file
+         
+
+
+def shared_graph(key:str, factory:Callable[[], ReactFlowGraph]) -> ReactFlowGraph:
+    """Returns the graph shared by all the sessions of the process under the given key, built by the factory on the first call.
+    The graph nodes, their content and their computed values live once in the process, each session only holds its view 
+    (Bokeh models, viewport and selection).
+
+    Parameters
+    ----------
+    key : str
+        Shared graph key
+    factory : Callable[[], ReactFlowGraph]
+        Function building the graph, with read_only=True or collaborative=True
+
+    Returns
+    -------
+    ReactFlowGraph
+        Shared graph
+
+    Raises
+    ------
+    ValueError
+        The built graph is neither read only nor collaborative
+    """
+    graph = pn.state.as_cached(f"panel_reactflow.shared_graph.{key}", factory)
+    if not (graph.read_only or graph.collaborative):
+        raise ValueError(f"Shared graph {key} should be built with read_only=True or collaborative=True, sessions would otherwise edit each other graph state.")
+    return graph
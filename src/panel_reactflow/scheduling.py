@@ -0,0 +1,70 @@
+""" Ordering of the Workflow nodes updates
+"""
+from collections import deque
+from typing import Callable, Dict, Hashable, Iterable, List, Set, TypeVar, Union
+
+T = TypeVar("T", bound=Hashable)
+
+
+def topological_order(nodes:Iterable[T], successors:Callable[[T], Iterable[T]]) -> Union[List[T], None]:
+    """Sorts nodes so that each node comes after all the nodes it depends on (Kahn algorithm).
+    Successors outside of the sorted nodes are ignored.
+
+    Parameters
+    ----------
+    nodes : Iterable[T]
+        Nodes to sort
+    successors : Callable[[T], Iterable[T]]
+        Function returning the nodes depending on a node
+
+    Returns
+    -------
+    Union[List[T], None]
+        Sorted nodes, None if the nodes contain a cycle
+    """
+    nodes = list(dict.fromkeys(nodes))
+    in_degree:Dict[T, int] = {node: 0 for node in nodes}
+    edges:Dict[T, List[T]] = {}
+    for node in nodes:
+        edges[node] = [s for s in dict.fromkeys(successors(node)) if s in in_degree]
+        for successor in edges[node]:
+            in_degree[successor] += 1
+
+    ready = deque(node for node in nodes if in_degree[node] == 0)
+    order:List[T] = []
+    while ready:
+        node = ready.popleft()
+        order.append(node)
+        for successor in edges[node]:
+            in_degree[successor] -= 1
+            if in_degree[successor] == 0:
+                ready.append(successor)
+
+    return order if len(order) == len(nodes) else None
+
+
+def reachable(sources:Iterable[T], successors:Callable[[T], Iterable[T]], within:Union[Set[T], None] = None) -> Set[T]:
+    """Returns the nodes reachable from the sources, sources included
+
+    Parameters
+    ----------
+    sources : Iterable[T]
+        Starting nodes
+    successors : Callable[[T], Iterable[T]]
+        Function returning the nodes depending on a node
+    within : Union[Set[T], None], optional
+        Nodes to which the search is restricted, by default None
+
+    Returns
+    -------
+    Set[T]
+        Reached nodes
+    """
+    found = set(sources)
+    stack = list(found)
+    while stack:
+        for successor in successors(stack.pop()):
+            if not successor in found and (within is None or successor in within):
+                found.add(successor)
+                stack.append(successor)
+    return found
@@ -0,0 +1,160 @@
+""" Source nodes pushing data into a workflow periodically or when data is received
+"""
+import threading
+from time import monotonic
+from typing import Any, Union
+
+import panel as pn
+
+from panel_reactflow.workflow import WorkflowNode
+
+
+class SourceNode(WorkflowNode):
+    """Node pushing data into the workflow, either polled periodically (files, sockets) with poll or received with push
+    (queues, sockets callbacks, possibly from another thread). The data received between two propagations are coalesced
+    with combine_data, so that the plugged nodes are updated at most max_rate times per second, and ticks happening while
+    the plugged nodes are still being updated are skipped.
+
+    The source runs once start is called, or once added to a Workflow if autostart is set, until stop is called 
+    or the node is deleted from the workflow.
+    """
+    period:Union[float, None] = 1.
+    """Time in seconds between two poll calls, None for the sources only receiving data with push"""
+    max_rate:float = 10.
+    """Maximum number of propagations per second"""
+    autostart:bool = False
+    """Start the source when it is added to a Workflow, or restored by an undo or a journal recovery"""
+
+    def __init__(self, ):
+        super().__init__()
+
+        self.value:Any = None
+        """Last propagated data"""
+        self.received:int = 0
+        """Number of data received"""
+        self.propagations:int = 0
+        """Number of propagations, lower than the number of data received when data were coalesced"""
+
+        self._pending:Any = None
+        self._has_pending:bool = False
+        self._lock = threading.Lock()
+        self._last_poll:float = float("-inf")
+        self._callback = None
+
+    @property
+    def running(self) -> bool:
+        return self._callback is not None
+
+    def start(self, ):
+        """Starts the timer polling the source and propagating the received data.
+        """
+        if self._callback is None:
+            self._callback = pn.state.add_periodic_callback(self._tick, period=max(1, int(1000 / self.max_rate)))
+
+    def stop(self, ):
+        """Stops the timer, the data received afterwards are propagated when the source is started again.
+        """
+        if self._callback is not None:
+            self._callback.stop()
+            self._callback = None
+
+    def poll(self, ) -> Any:
+        """Function called every period seconds to read the new data of the source
+
+        Returns
+        -------
+        Any
+            New data, None if there is no new data
+        """
+        return None
+
+    def combine_data(self, pending:Any, data:Any) -> Any:
+        """Coalesces data received before the previous ones were propagated, by default the last data is kept.
+
+        Parameters
+        ----------
+        pending : Any
+            Data waiting to be propagated
+        data : Any
+            Received data
+
+        Returns
+        -------
+        Any
+            Data to propagate
+        """
+        return data
+
+    def push(self, data:Any):
+        """Receives data, propagated at the next tick of the source timer. Can be called from any thread.
+
+        Parameters
+        ----------
+        data : Any
+            Received data
+        """
+        with self._lock:
+            self._pending = self.combine_data(self._pending, data) if self._has_pending else data
+            self._has_pending = True
+            self.received += 1
+
+    def flush(self, ) -> bool:
+        """Propagates the data received since the last propagation
+
+        Returns
+        -------
+        bool
+            Whether data was propagated
+        """
+        with self._lock:
+            if not self._has_pending:
+                return False
+            data = self._pending
+            self._pending = None
+            self._has_pending = False
+
+        self.value = data
+        self.propagations += 1
+        self.update_outputs()
+        return True
+
+    def _tick(self, ):
+        """Timer callback, polling the source every period seconds and propagating the received data
+        """
+        if self.period is not None and monotonic() - self._last_poll >= self.period:
+            self._last_poll = monotonic()
+            data = self.poll()
+            if data is not None:
+                self.push(data)
+        self.flush()
+
+    def update(self, _):
+        """Update the node content based on the input ports.
+
+        Parameters
+        ----------
+        _ : Any
+            Event requesting the update
+        """
+        self.update_outputs()
+
+    def on_node_added(self, ):
+        """Function triggered when the node is added to a Workflow, starting the source if autostart is set
+        """
+        if self.autostart:
+            self.start()
+
+    def on_node_deleted(self, ):
+        """Function triggered when the node is deleted from the graph
+        """
+        self.stop()
+
+    def get_node_json_value(self, ):
+        """ Returns a dictionnary describing the node content, this dictionnary can be obtain by other nodes in their update call.
+
+        Returns
+        ----------
+        Dict[str, Any]
+            Node properties
+        """
+        return {"value" : self.value}
@@ -0,0 +1,252 @@
+""" Grid spatial index of the nodes positions
+"""
+from math import floor, inf, sqrt
+from typing import Dict, Iterator, List, Set, Tuple, Union
+
+
+class SpatialIndex:
+    def __init__(self, cell_size:float = 256.):
+        """Buckets the nodes absolute positions in a regular grid, to find the nodes in a region or near a point
+        without iterating over all the nodes. Child nodes positions are given relative to their parent, as in reactflow.
+
+        Parameters
+        ----------
+        cell_size : float, optional
+            Width and height of the grid cells in graph coordinates, by default 256.
+        """
+        self.cell_size:float = cell_size
+        """Width and height of the grid cells in graph coordinates"""
+        self.cells:Dict[Tuple[int, int], Set[str]] = {}
+        """Nodes names in each non empty cell"""
+        self.points:Dict[str, Tuple[float, float]] = {}
+        """Absolute position of each node"""
+        self.sizes:Dict[str, Tuple[float, float]] = {}
+        """Width and height of the nodes whose size is known"""
+        self.parents:Dict[str, str] = {}
+        """Parent of each child node"""
+        self.children:Dict[str, Set[str]] = {}
+        """Children of each parent node"""
+
+    def __len__(self, ):
+        return len(self.points)
+
+    def __contains__(self, name:str):
+        return name in self.points
+
+    def _cell(self, x:float, y:float) -> Tuple[int, int]:
+        return floor(x / self.cell_size), floor(y / self.cell_size)
+
+    def _place(self, name:str, x:float, y:float):
+        old = self.points.get(name)
+        if old is not None:
+            old_cell = self._cell(*old)
+            new_cell = self._cell(x, y)
+            if old_cell != new_cell:
+                self._unplace(name, old_cell)
+                self.cells.setdefault(new_cell, set()).add(name)
+        else:
+            self.cells.setdefault(self._cell(x, y), set()).add(name)
+        self.points[name] = (x, y)
+
+    def _unplace(self, name:str, cell:Tuple[int, int]):
+        bucket = self.cells[cell]
+        bucket.discard(name)
+        if not bucket:
+            del self.cells[cell]
+
+    def insert(self, name:str, x:float, y:float, parent:Union[str, None] = None):
+        """Adds a node to the index
+
+        Parameters
+        ----------
+        name : str
+            Node name
+        x : float
+            X coordinate, relative to the parent if any
+        y : float
+            Y coordinate, relative to the parent if any
+        parent : Union[str, None], optional
+            Parent node name, by default None
+        """
+        if parent is not None and parent in self.points:
+            self.parents[name] = parent
+            self.children.setdefault(parent, set()).add(name)
+            parent_x, parent_y = self.points[parent]
+            x, y = x + parent_x, y + parent_y
+        self._place(name, x, y)
+
+    def move(self, name:str, x:float, y:float):
+        """Moves a node and its children
+
+        Parameters
+        ----------
+        name : str
+            Node name
+        x : float
+            New X coordinate, relative to the parent if any
+        y : float
+            New Y coordinate, relative to the parent if any
+        """
+        parent = self.parents.get(name)
+        if parent is not None:
+            parent_x, parent_y = self.points[parent]
+            x, y = x + parent_x, y + parent_y
+
+        old_x, old_y = self.points[name]
+        self._shift(name, x - old_x, y - old_y)
+
+    def _shift(self, name:str, dx:float, dy:float):
+        x, y = self.points[name]
+        self._place(name, x + dx, y + dy)
+        for child in self.children.get(name, ()):
+            self._shift(child, dx, dy)
+
+    def remove(self, name:str):
+        """Removes a node from the index, its children are kept with their current absolute position
+
+        Parameters
+        ----------
+        name : str
+            Node name
+        """
+        self._unplace(name, self._cell(*self.points.pop(name)))
+        self.sizes.pop(name, None)
+
+        parent = self.parents.pop(name, None)
+        if parent is not None:
+            self.children[parent].discard(name)
+        for child in self.children.pop(name, ()):
+            del self.parents[child]
+
+    def set_size(self, name:str, width:float, height:float):
+        """Stores the size of a node, used to find the groups containing a point
+
+        Parameters
+        ----------
+        name : str
+            Node name
+        width : float
+            Node width
+        height : float
+            Node height
+        """
+        self.sizes[name] = (width, height)
+
+    def _cells_in(self, x0:float, y0:float, x1:float, y1:float) -> Iterator[Tuple[int, int]]:
+        (i0, j0), (i1, j1) = self._cell(x0, y0), self._cell(x1, y1)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(self.cells):
+            # Large regions : iterating over the occupied cells is cheaper
+            yield from (cell for cell in list(self.cells) if i0 <= cell[0] <= i1 and j0 <= cell[1] <= j1)
+        else:
+            yield from ((i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1) if (i, j) in self.cells)
+
+    def region(self, x0:float, y0:float, x1:float, y1:float) -> List[str]:
+        """Returns the nodes whose position is inside a rectangle
+
+        Parameters
+        ----------
+        x0 : float
+            Left coordinate
+        y0 : float
+            Top coordinate
+        x1 : float
+            Right coordinate
+        y1 : float
+            Bottom coordinate
+
+        Returns
+        -------
+        List[str]
+            Nodes names
+        """
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+
+        found = []
+        for cell in self._cells_in(x0, y0, x1, y1):
+            for name in self.cells[cell]:
+                x, y = self.points[name]
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    found.append(name)
+        return found
+
+    def nearest(self, x:float, y:float, k:int = 1, max_distance:float = inf) -> List[str]:
+        """Returns the nodes closest to a point, searching the grid rings around the point
+
+        Parameters
+        ----------
+        x : float
+            X coordinate
+        y : float
+            Y coordinate
+        k : int, optional
+            Number of nodes to return, by default 1
+        max_distance : float, optional
+            Maximum distance between the point and the nodes positions, by default inf
+
+        Returns
+        -------
+        List[str]
+            Nodes names, from the closest to the farthest
+        """
+        assert k > 0, "The number of nodes to find should be positive."
+        if not self.points:
+            return []
+
+        i, j = self._cell(x, y)
+        # Ring from which all the occupied cells were searched
+        last_ring = max(max(abs(ci - i), abs(cj - j)) for ci, cj in self.cells)
+
+        candidates:List[Tuple[float, str]] = []
+        for ring in range(last_ring + 1):
+            for cell in self._ring(i, j, ring):
+                for name in self.cells.get(cell, ()):
+                    px, py = self.points[name]
+                    distance = sqrt((px - x) ** 2 + (py - y) ** 2)
+                    if distance <= max_distance:
+                        candidates.append((distance, name))
+
+            # The nodes outside the searched rings are at least ring * cell_size away from the point
+            reach = ring * self.cell_size
+            if reach > max_distance:
+                break
+            if len(candidates) >= k:
+                candidates.sort()
+                if candidates[k - 1][0] <= reach:
+                    break
+
+        candidates.sort()
+        return [name for _, name in candidates[:k]]
+
+    def _ring(self, i:int, j:int, ring:int) -> Iterator[Tuple[int, int]]:
+        if ring == 0:
+            yield (i, j)
+            return
+        for di in range(-ring, ring + 1):
+            yield (i + di, j - ring)
+            yield (i + di, j + ring)
+        for dj in range(-ring + 1, ring):
+            yield (i - ring, j + dj)
+            yield (i + ring, j + dj)
+
+    def groups_at(self, x:float, y:float) -> List[str]:
+        """Returns the nodes of known size whose area contains a point, from the innermost to the outermost
+
+        Parameters
+        ----------
+        x : float
+            X coordinate
+        y : float
+            Y coordinate
+
+        Returns
+        -------
+        List[str]
+            Nodes names
+        """
+        found = []
+        for name, (width, height) in self.sizes.items():
+            px, py = self.points[name]
+            if px <= x <= px + width and py <= y <= py + height:
+                found.append((width * height, name))
+        return [name for _, name in sorted(found)]
@@ -0,0 +1,230 @@
+""" Workflow subgraphs packaged as a single node
+"""
+from typing import Any, Dict, List, Tuple, Type, Union
+
+import panel as pn
+
+from panel_reactflow.api import Edge, NodePort, PortDirection, PortPosition
+from panel_reactflow.scheduling import reachable, topological_order
+from panel_reactflow.workflow import Workflow, WorkflowNode
+
+
+class SubWorkflowNode(WorkflowNode):
+    """Node executing a subgraph of nodes. The subgraph nodes are not displayed in the graph: the input ports
+    left unplugged by the subgraph edges become the node inputs, the unplugged output ports become the node outputs.
+    The node classes are built with make_sub_workflow_node.
+
+    The node is the NodeScheduler of the subgraph nodes: their workflow attribute is the SubWorkflowNode, not a Workflow.
+    """
+    node_classes:Dict[str, Type[WorkflowNode]] = {}
+    """Class of each subgraph node"""
+    inner_edges:List[Edge] = []
+    """Edges between the subgraph nodes"""
+    plan:List[str] = []
+    """Subgraph nodes names in execution order"""
+    input_bindings:Dict[str, Tuple[str, str]] = {}
+    """Subgraph node and port names of each input port"""
+    output_bindings:Dict[str, Tuple[str, str]] = {}
+    """Subgraph node and port names of each output port"""
+    displayed_nodes:Union[List[str], None] = None
+    """Subgraph nodes whose content is displayed in the node, None to display the number of subgraph nodes"""
+
+    def __init__(self, ):
+        super().__init__()
+
+        self.inner_nodes:Dict[str, WorkflowNode] = {}
+        """Subgraph nodes instances"""
+        for name, node_class in self.node_classes.items():
+            node = node_class()
+            node.name = name
+            node.plugged_nodes = {port.name: [] for port in node.ports}
+            # The subgraph nodes propagation is driven by the plan, through the NodeScheduler protocol
+            node.workflow = self
+            self.inner_nodes[name] = node
+
+        for edge in self.inner_edges:
+            source = self.inner_nodes[edge.source]
+            target = self.inner_nodes[edge.target]
+            source.plugged_nodes[edge.source_handle].append(target)
+            target.plugged_nodes[edge.target_handle].append(source)
+
+        self._plan_nodes:List[WorkflowNode] = [self.inner_nodes[name] for name in self.plan]
+        self._running = False
+
+    def _successors(self, node:WorkflowNode) -> List[WorkflowNode]:
+        return [
+                    plugged 
+                    for port in node.ports if port.direction == PortDirection.OUTPUT
+                    for plugged in node.plugged_nodes[port.name]
+                ]
+
+    def _run_plan(self, nodes:Union[List[WorkflowNode], None] = None):
+        """Updates the subgraph nodes in execution order, then the nodes plugged to the outputs.
+
+        Parameters
+        ----------
+        nodes : Union[List[WorkflowNode], None], optional
+            Subgraph nodes to update, by default all of them
+        """
+        self._running = True
+        try:
+            for node in self._plan_nodes:
+                if nodes is None or node in nodes:
+                    node.update(None)
+        finally:
+            self._running = False
+
+        self.update_outputs()
+
+    def _propagate(self, source:WorkflowNode):
+        """Called by the subgraph nodes update_outputs. During the plan execution, the plan already orders the updates, 
+        otherwise (displayed widget change) the nodes depending on the source are updated.
+
+        Parameters
+        ----------
+        source : WorkflowNode
+            Subgraph node whose outputs changed
+        """
+        if not self._running:
+            self._run_plan(reachable(self._successors(source), self._successors))
+
+    def create(self, ) -> pn.viewable.Viewable:
+        """Function called by the Reactflow class to instanciate the content of the node
+        """
+        if not self.displayed_nodes:
+            return pn.pane.Markdown(f"{len(self.inner_nodes)} nodes", margin=0)
+        return pn.Column(*[self.inner_nodes[name].create() for name in self.displayed_nodes], margin=0)
+
+    def update(self, _):
+        """Updates the subgraph nodes in execution order, then the nodes plugged to the outputs.
+
+        Parameters
+        ----------
+        _ : Any
+            Event requesting the update
+        """
+        for port_name, (node_name, inner_port) in self.input_bindings.items():
+            self.inner_nodes[node_name].plugged_nodes[inner_port] = self.plugged_nodes.get(port_name, [])
+
+        self._run_plan()
+
+    def get_node_json_value(self, ) -> Dict[str, Any]:
+        """ Returns the value of the subgraph output node, or the value of each output port if there are several outputs.
+
+        Returns
+        ----------
+        Dict[str, Any]
+            Node properties
+        """
+        values = {port_name: self.inner_nodes[node_name].get_node_json_value() for port_name, (node_name, _) in self.output_bindings.items()}
+        if len(values) == 1:
+            return next(iter(values.values()))
+        return values
+
+
+def make_sub_workflow_node(node_class_name:str,
+                            node_classes:Dict[str, Type[WorkflowNode]],
+                            edges:List[Edge],
+                            node_category:str = "",
+                            displayed_nodes:Union[List[str], None] = None) -> Type[SubWorkflowNode]:
+    """Builds a node class executing a subgraph, that can be provided to a Workflow nodes_classes.
+
+    Parameters
+    ----------
+    node_class_name : str
+        Node class name, as it will appear in the reactflow side bar
+    node_classes : Dict[str, Type[WorkflowNode]]
+        Class of each subgraph node, instanciated without argument for each node instance
+    edges : List[Edge]
+        Edges between the subgraph nodes
+    node_category : str, optional
+        Category used to group the node classes in the reactflow side bar, by default ""
+    displayed_nodes : Union[List[str], None], optional
+        Subgraph nodes whose content is displayed in the node, by default None to display the number of subgraph nodes
+
+    Returns
+    -------
+    Type[SubWorkflowNode]
+        Node class
+
+    Raises
+    ------
+    ValueError
+        Unknown node or port in the edges, or cycle in the subgraph
+    """
+    # Ports are class attributes, the node classes are only instanciated by the SubWorkflowNode instances
+    ports = {name: {port.name: port for port in node_class.ports} for name, node_class in node_classes.items()}
+
+    plugged = set()
+    for edge in edges:
+        for node_name, port_name in [(edge.source, edge.source_handle), (edge.target, edge.target_handle)]:
+            if not node_name in ports:
+                raise ValueError(f"Subgraph edge plugs the node {node_name} that is not in the subgraph nodes.")
+            if not port_name in ports[node_name]:
+                raise ValueError(f"Subgraph edge plugs the port {port_name} that is not in the node {node_name} ports.")
+            plugged.add((node_name, port_name))
+
+    plan = topological_order(node_classes, lambda name: [e.target for e in edges if e.source == name])
+    if plan is None:
+        raise ValueError(f"Subgraph {node_class_name} contains a cycle, it cannot be executed as a single node.")
+
+    # Unplugged ports are exposed as the node ports
+    input_bindings:Dict[str, Tuple[str, str]] = {}
+    output_bindings:Dict[str, Tuple[str, str]] = {}
+    derived_ports:List[NodePort] = []
+    for node_name in plan:
+        for port in ports[node_name].values():
+            if (node_name, port.name) in plugged:
+                continue
+
+            bindings = input_bindings if port.direction == PortDirection.INPUT else output_bindings
+            port_name = f"{node_name}.{port.name}"
+            derived_ports.append(NodePort(
+                                            direction=port.direction,
+                                            position=PortPosition.LEFT if port.direction == PortDirection.INPUT else PortPosition.RIGHT,
+                                            name=port_name,
+                                            display_name=True,
+                                            offset=20 + 20 * len(bindings),
+                                            connection_count_limit=port.connection_count_limit,
+                                            restriction=port.restriction,
+                                        ))
+            bindings[port_name] = (node_name, port.name)
+
+    return type(node_class_name.replace(" ", "") + "Node", (SubWorkflowNode,), {
+        "node_class_name":node_class_name,
+        "node_category":node_category,
+        "ports":derived_ports,
+        "node_classes":dict(node_classes),
+        "inner_edges":list(edges),
+        "plan":plan,
+        "input_bindings":input_bindings,
+        "output_bindings":output_bindings,
+        "displayed_nodes":None if displayed_nodes is None else list(displayed_nodes),
+    })
+
+
+def sub_workflow_node_from(workflow:Workflow, node_class_name:str, node_names:Union[List[str], None] = None, **kwargs) -> Type[SubWorkflowNode]:
+    """Builds a node class executing a subgraph of an existing workflow, the workflow nodes classes being instanciated without argument.
+
+    Parameters
+    ----------
+    workflow : Workflow
+        Workflow containing the subgraph
+    node_class_name : str
+        Node class name, as it will appear in the reactflow side bar
+    node_names : Union[List[str], None], optional
+        Names of the subgraph nodes, by default all the workflow nodes
+    kwargs : Any
+        Additional make_sub_workflow_node arguments
+
+    Returns
+    -------
+    Type[SubWorkflowNode]
+        Node class
+    """
+    if node_names is None:
+        node_names = list(workflow.item_names)
+
+    node_classes = {name: type(workflow.nodes_instances[workflow.item_names.index(name)]) for name in node_names}
+    edges = [e for e in workflow.get_edges() if e.source in node_classes and e.target in node_classes]
+    return make_sub_workflow_node(node_class_name, node_classes, edges, **kwargs)
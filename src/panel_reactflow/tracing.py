@@ -0,0 +1,240 @@
+""" Export of the Workflow propagation waves as traces
+"""
+from collections import deque
+from dataclasses import dataclass, field
+import os
+import random
+import time
+from time import perf_counter
+from typing import Any, Deque, Dict, List, Union
+
+from panel_reactflow.encoding import dumps
+from panel_reactflow.events import EdgeChange, NodeChange
+from panel_reactflow.profiling import NodeRun, PropagationWave
+
+
+@dataclass
+class Span:
+    """Timed operation of a propagation wave."""
+    trace_id:str
+    """Hexadecimal id shared by the spans of a wave"""
+    span_id:str
+    """Hexadecimal id of the span"""
+    parent_span_id:Union[str, None]
+    """Id of the enclosing span, None for the wave span"""
+    name:str
+    """Span name"""
+    start:float
+    """perf_counter time at which the span started"""
+    duration:float
+    """Duration of the span in seconds"""
+    attributes:Dict[str, Any] = field(default_factory=dict)
+    """Additional span properties"""
+
+
+def describe_trigger(trigger:Any) -> Dict[str, Any]:
+    """Returns the name and attributes of the span of a wave trigger
+
+    Parameters
+    ----------
+    trigger : Any
+        What started the wave : a NodeChange/EdgeChange or the node whose outputs were updated
+
+    Returns
+    -------
+    Dict[str, Any]
+        Span name and attributes
+    """
+    if isinstance(trigger, (NodeChange, EdgeChange)):
+        return {"name":repr(trigger), "attributes":{"workflow.event":type(trigger).__name__, **trigger.to_dict()}}
+
+    name = getattr(trigger, "name", repr(trigger))
+    return {"name":f"Outputs update : {name}", "attributes":{"workflow.event":"OutputsUpdate", "node_name":name}}
+
+
+class WorkflowTracer:
+    def __init__(self, max_waves:int = 1000):
+        """Converts the propagation waves of a Workflow into spans, exportable to the Chrome trace_event format or as OTLP json.
+
+        Parameters
+        ----------
+        max_waves : int, optional
+            Number of propagation waves kept in memory, by default 1000
+        """
+        self.traces:Deque[List[Span]] = deque(maxlen=max_waves)
+        """Spans of the last propagation waves, the wave span being the first of each list"""
+
+        # Reference times to convert perf_counter times to unix times
+        self._origin = perf_counter()
+        self._origin_ns = time.time_ns()
+        self._prefix = f"{random.getrandbits(64):016x}"
+        self._span_count = 0
+
+    def reset(self, ):
+        """Clears the recorded traces.
+        """
+        self.traces.clear()
+
+    def _span_id(self, ) -> str:
+        self._span_count += 1
+        return f"{self._span_count:016x}"
+
+    def wave_started(self, wave:PropagationWave):
+        """Function called by the Workflow when a propagation wave starts
+
+        Parameters
+        ----------
+        wave : PropagationWave
+            Started wave
+        """
+        pass
+
+    def node_updated(self, wave:PropagationWave, run:NodeRun):
+        """Function called by the Workflow after each node update
+
+        Parameters
+        ----------
+        wave : PropagationWave
+            Current wave
+        run : NodeRun
+            Node update description
+        """
+        pass
+
+    def wave_finished(self, wave:PropagationWave):
+        """Function called by the Workflow when a propagation wave ends, converts the wave to spans
+
+        Parameters
+        ----------
+        wave : PropagationWave
+            Finished wave
+        """
+        trace_id = f"{self._prefix}{wave.wave_id:016x}"
+        trigger = describe_trigger(wave.trigger)
+        wave_span = Span(trace_id, self._span_id(), None, trigger["name"], wave.start, wave.duration,
+                         {**trigger["attributes"], "workflow.wave_id":wave.wave_id})
+
+        spans = [wave_span]
+        # Runs are recorded when they end: sorting them by start time and depth rebuilds the updates nesting
+        open_spans:List[Span] = []
+        for run in sorted(wave.runs, key=lambda r: (r.start, r.depth)):
+            del open_spans[run.depth:]
+            span = Span(
+                            trace_id,
+                            self._span_id(),
+                            open_spans[-1].span_id if open_spans else wave_span.span_id,
+                            f"update : {run.node_name}",
+                            run.start,
+                            run.duration,
+                            {
+                                "node_name":run.node_name,
+                                "workflow.requested_by":run.parent_name,
+                                "workflow.self_time":run.self_time,
+                                "workflow.queue_wait":run.queue_wait,
+                                "workflow.output_size":run.output_size,
+                            }
+                        )
+            open_spans.append(span)
+            spans.append(span)
+
+        self.traces.append(spans)
+
+    def to_chrome_trace(self, ) -> Dict[str, Any]:
+        """Returns the recorded spans in the Chrome trace_event format, readable by chrome://tracing or https://ui.perfetto.dev
+
+        Returns
+        -------
+        Dict[str, Any]
+            trace_event json object
+        """
+        pid = os.getpid()
+        events = []
+        for spans in self.traces:
+            for span in spans:
+                events.append({
+                    "name":span.name,
+                    "cat":"wave" if span.parent_span_id is None else "node",
+                    "ph":"X",
+                    "ts":(span.start - self._origin) * 1e6,
+                    "dur":span.duration * 1e6,
+                    "pid":pid,
+                    "tid":0,
+                    "args":{k: v for k, v in span.attributes.items() if v is not None},
+                })
+
+        return {"traceEvents":events, "displayTimeUnit":"ms"}
+
+    def export_chrome_trace(self, path:str):
+        """Writes the recorded spans in a Chrome trace_event json file
+
+        Parameters
+        ----------
+        path : str
+            Output file path
+        """
+        with open(path, "w") as f:
+            f.write(dumps(self.to_chrome_trace()))
+
+    def to_otlp(self, service_name:str = "panel-reactflow") -> Dict[str, Any]:
+        """Returns the recorded spans as an OpenTelemetry OTLP/JSON trace request, that can be sent to a collector or loaded offline
+
+        Parameters
+        ----------
+        service_name : str, optional
+            Service name of the resource, by default "panel-reactflow"
+
+        Returns
+        -------
+        Dict[str, Any]
+            OTLP/JSON ExportTraceServiceRequest
+        """
+        def to_unix_ns(t:float) -> str:
+            return str(self._origin_ns + int((t - self._origin) * 1e9))
+
+        def to_attribute(key:str, value:Any) -> Dict[str, Any]:
+            if isinstance(value, bool):
+                return {"key":key, "value":{"boolValue":value}}
+            if isinstance(value, int):
+                return {"key":key, "value":{"intValue":str(value)}}
+            if isinstance(value, float):
+                return {"key":key, "value":{"doubleValue":value}}
+            return {"key":key, "value":{"stringValue":str(value)}}
+
+        otlp_spans = []
+        for spans in self.traces:
+            for span in spans:
+                otlp_span = {
+                    "traceId":span.trace_id,
+                    "spanId":span.span_id,
+                    "name":span.name,
+                    "kind":1,
+                    "startTimeUnixNano":to_unix_ns(span.start),
+                    "endTimeUnixNano":to_unix_ns(span.start + span.duration),
+                    "attributes":[to_attribute(k, v) for k, v in span.attributes.items() if v is not None],
+                }
+                if span.parent_span_id is not None:
+                    otlp_span["parentSpanId"] = span.parent_span_id
+                otlp_spans.append(otlp_span)
+
+        return {
+            "resourceSpans":[{
+                "resource":{"attributes":[to_attribute("service.name", service_name)]},
+                "scopeSpans":[{
+                    "scope":{"name":"panel_reactflow.workflow"},
+                    "spans":otlp_spans,
+                }],
+            }]
+        }
+
+    def export_otlp(self, path:str, service_name:str = "panel-reactflow"):
+        """Writes the recorded spans in an OTLP/JSON file
+
+        Parameters
+        ----------
+        path : str
+            Output file path
+        service_name : str, optional
+            Service name of the resource, by default "panel-reactflow"
+        """
+        with open(path, "w") as f:
+            f.write(dumps(self.to_otlp(service_name)))
@@ -1,5 +1,9 @@
 
-from typing import Any, Dict, List, Type
+from contextlib import contextmanager
+from functools import partial
+from time import perf_counter
+from typing import Any, AsyncIterable, Dict, Iterable, List, Protocol, Set, Tuple, Type, Union
+import asyncio
 import panel as pn
 
 import param
@@ -8,15 +12,64 @@ from panel_reactflow.reactflow import ReactFlowGraph
 from panel_reactflow.events import NodeCreation, NodeDeletion, NodeMove, NodeSelected, NodeDeselected
 from panel_reactflow.events import EdgeCreation, EdgeDeletion, EdgeSelected, EdgeDeselected
 from panel_reactflow.api import ReactFlowNode, Edge, Node, NodePort, PortDirection
+from panel_reactflow.deltas import Delta
+from panel_reactflow.profiling import NodeRun, PropagationWave, WorkflowProfiler, estimate_size
+from panel_reactflow.tracing import WorkflowTracer
+from panel_reactflow.scheduling import reachable, topological_order
+
+async def _next_chunk(iterator:Iterable[Any]) -> Any:
+    """Returns the next chunk of a synchronous iterator, raising StopAsyncIteration at its end"""
+    try:
+        return next(iterator)
+    except StopIteration:
+        raise StopAsyncIteration from None
+
+
+def _update_node(node:"WorkflowNode", source:Union["WorkflowNode", None]):
+    """Updates a node, with the change of the source node output if the node applies it"""
+    if source is not None and source.output_delta is not None and node.apply_delta(source, source.output_delta):
+        return
+    node.update(None)
+
+
+class NodeScheduler(Protocol):
+    """Object scheduling the updates of the nodes it contains, stored in their workflow attribute: the Workflow 
+    displaying the node, or the SubWorkflowNode executing the subgraph containing it. The nodes only call its 
+    _propagate method, the other attributes of a Workflow can only be used after checking the scheduler is a Workflow.
+    """
+    def _propagate(self, source:"WorkflowNode"):
+        """Updates the nodes depending on the source node outputs
+
+        Parameters
+        ----------
+        source : WorkflowNode
+            Node whose outputs changed
+        """
+        ...
+
 
 class WorkflowNode:
     node_class_name = ""
     """Node class name, as it will appear in the reactflow side bar."""
+    node_category = ""
+    """Category used to group the node classes in the reactflow side bar."""
     ports:List[NodePort]
     """List of node ports"""
     plugged_nodes:Dict[str, List['WorkflowNode']]
     """List of currently plugged ports, automatically updated by the ReactFlow class"""
     name:str
+    workflow:Union[NodeScheduler, None] = None
+    """Scheduler of the node updates, set when the node is added to a Workflow or built in a SubWorkflowNode"""
+    streaming_consumer:bool = False
+    """Node receiving the chunks streamed by the nodes plugged to its inputs with on_chunk. Other nodes are only updated 
+    once the stream is finished."""
+    streaming:bool = False
+    """A stream of the node outputs is running"""
+    stream_value:Any = None
+    """Chunks of the last stream combined with combine_chunks, as the final value given to the non-streaming nodes"""
+    output_delta:Union[Delta, None] = None
+    """Change of the node value published by the last update_outputs call, None if only the full value was published"""
+    _stream_id:int = 0
 
     def __init__(self,):
         """ ReactflowNode constructor used to instanciate the plugged_nodes dictionnary. It is necessary to call it in nodes constructors.
@@ -24,7 +77,10 @@ class WorkflowNode:
         self.plugged_nodes = {}
 
     def create(self, ) -> pn.viewable.Viewable:
-        """Function called by the Reactflow class to instanciate the content of the node
+        """Function called by the Reactflow class to instanciate the content of the node.
+        
+        With the lazy_nodes option, this function is only called when the node is first displayed: the node 
+        state used by get_node_json_value and update should be built in the constructor, not here.
         """
         raise NotImplementedError
 
@@ -38,15 +94,160 @@ class WorkflowNode:
         """
         self.update_outputs()
     
-    def update_outputs(self, ):
+    def update_outputs(self, delta:Union[Delta, None] = None):
         """Call the output function on all nodes plugged on output ports.
+
+        Parameters
+        ----------
+        delta : Union[Delta, None], optional
+            Change of the node collection valued output, given to the plugged nodes implementing apply_delta, by default None
         """
+        self.output_delta = delta
+        if self.workflow is not None:
+            self.workflow._propagate(self)
+            return
+
         for port in self.ports:
             if port.direction == PortDirection.OUTPUT and port.name in self.plugged_nodes:
                 for node in self.plugged_nodes[port.name]:
-                    node.update(None)
+                    _update_node(node, self)
+
+    def apply_delta(self, source:"WorkflowNode", delta:Delta) -> bool:
+        """Updates the node incrementally from the change of the output of a node plugged to its inputs. 
+        Like update, it calls update_outputs, optionally with the change of its own output.
+
+        Parameters
+        ----------
+        source : WorkflowNode
+            Node whose output changed
+        delta : Delta
+            Change of the source node output, its full value being given by its get_node_json_value
+
+        Returns
+        -------
+        bool
+            Whether the change was applied, update being called otherwise. By default, the changes are not applied.
+        """
+        return False
+
+    def stream_outputs(self, chunks:Union[Iterable[Any], AsyncIterable[Any]]):
+        """Streams the node outputs, replacing update_outputs for nodes producing their value incrementally (reading 
+        a large file, long simulation). Each chunk is given to the plugged streaming consumers with on_chunk and 
+        combined in stream_value, then the plugged nodes are updated with update_outputs once the stream is finished.
+
+        Chunks are pulled one at a time, only once the consumers processed the previous one. In a server session, the 
+        stream runs on the event loop, released between two chunks so that the first results are displayed while the 
+        stream runs. Otherwise, the stream runs until its end before returning. A new stream stops the running one.
+
+        Parameters
+        ----------
+        chunks : Union[Iterable[Any], AsyncIterable[Any]]
+            Generator or asynchronous iterator of the output chunks
+        """
+        self._stream_id += 1
+        self.streaming = True
+        self.stream_value = None
+        for node in self._streaming_consumers():
+            node.on_stream_start(self)
+
+        if hasattr(chunks, "__aiter__") or (pn.state.curdoc is not None and pn.state.curdoc.session_context is not None):
+            pn.state.execute(partial(self._stream, chunks, self._stream_id))
+            return
+
+        stream_id = self._stream_id
+        try:
+            for chunk in chunks:
+                if not self._push_chunk(chunk, stream_id):
+                    return
+        finally:
+            self._end_stream(stream_id)
+        if stream_id == self._stream_id:
+            self.update_outputs()
+
+    async def _stream(self, chunks:Union[Iterable[Any], AsyncIterable[Any]], stream_id:int):
+        if hasattr(chunks, "__aiter__"):
+            next_chunk = chunks.__aiter__().__anext__
+        else:
+            next_chunk = partial(_next_chunk, iter(chunks))
+
+        try:
+            while True:
+                try:
+                    chunk = await next_chunk()
+                except StopAsyncIteration:
+                    break
+                if not self._push_chunk(chunk, stream_id):
+                    return
+                await asyncio.sleep(0)
+        finally:
+            self._end_stream(stream_id)
+        if stream_id == self._stream_id:
+            self.update_outputs()
+
+    def _push_chunk(self, chunk:Any, stream_id:int) -> bool:
+        """Gives a chunk to the streaming consumers, returns False if the stream was superseded by a new one"""
+        if stream_id != self._stream_id:
+            return False
+        self.stream_value = self.combine_chunks(self.stream_value, chunk)
+        for node in self._streaming_consumers():
+            node.on_chunk(self, chunk)
+        return True
+
+    def _end_stream(self, stream_id:int):
+        """Marks the stream as finished, unless it was superseded by a new one"""
+        if stream_id == self._stream_id:
+            self.streaming = False
+
+    def _streaming_consumers(self, ) -> List["WorkflowNode"]:
+        return [
+                    node
+                    for port in self.ports if port.direction == PortDirection.OUTPUT and port.name in self.plugged_nodes
+                    for node in self.plugged_nodes[port.name] if node.streaming_consumer
+                ]
+
+    def combine_chunks(self, value:Any, chunk:Any) -> Any:
+        """Combines a streamed chunk with the previous ones, by default the chunks are gathered in a list.
+
+        Parameters
+        ----------
+        value : Any
+            Combination of the previous chunks, None for the first chunk
+        chunk : Any
+            Streamed chunk
+
+        Returns
+        -------
+        Any
+            Combination of the chunks, stored in stream_value
+        """
+        if value is None:
+            value = []
+        value.append(chunk)
+        return value
+
+    def on_stream_start(self, source:"WorkflowNode"):
+        """Function triggered on the streaming consumers when a node plugged to their inputs starts a stream
+
+        Parameters
+        ----------
+        source : WorkflowNode
+            Streaming node
+        """
+        pass
+
+    def on_chunk(self, source:"WorkflowNode", chunk:Any):
+        """Function triggered on the streaming consumers for each chunk streamed by a node plugged to their inputs.
+        The consumer is also updated with update once the stream is finished.
+
+        Parameters
+        ----------
+        source : WorkflowNode
+            Streaming node
+        chunk : Any
+            Streamed chunk
+        """
+        pass
 
-    
     def get_node_json_value(self,) -> Dict[str, Any]:
         """ Returns a dictionnary describing the node content, this dictionnary can be obtain by other nodes in their update call.
         
@@ -77,9 +278,27 @@ class WorkflowNode:
         """
         pass
 
+    def on_node_added(self, ):
+        """Function triggered when the node is added to a Workflow, including the nodes restored by an undo 
+        and the nodes recovered from a journal
+        """
+        pass
+
+    def on_node_deleted(self, ):
+        """Function triggered when a node is deleted from the graph
+        """
+        pass
+
 
 class Workflow(ReactFlowGraph):
 
+    profiling = param.Boolean()
+    """Record the execution time of the nodes updates in the profiler."""
+    profiling_overlay = param.Boolean()
+    """Color the nodes based on their recorded update time."""
+    tracing = param.Boolean()
+    """Record the propagation waves as spans in the tracer."""
+
     def __init__(self, 
                     sizing_mode = "stretch_both", 
                     nodes_classes:List[Type[ReactFlowNode]] = [], 
@@ -105,6 +324,26 @@ class Workflow(ReactFlowGraph):
         allow_edge_loops : bool, optional
             Allow to have edge loops in the graph (can lead to update infinite loops), by default False
         """
+        self.profiler:WorkflowProfiler = WorkflowProfiler()
+        """Per node execution statistics, recorded when profiling is enabled"""
+        self.tracer:WorkflowTracer = WorkflowTracer()
+        """Propagation waves spans, recorded when tracing is enabled"""
+        self._instruments:List[Any] = []
+        self._current_wave:Union[PropagationWave, None] = None
+        self._wave_count:int = 0
+        self._run_stack:List[List[float]] = []
+        self._group_plans:Dict[str, Union[List[WorkflowNode], None]] = {}
+        self._group_plans_version:int = -1
+        self._group_runs:List[Tuple[str, List[Tuple[WorkflowNode, WorkflowNode]]]] = []
+        self._plans_version:int = -1
+        self._plans:Dict[int, Tuple[List[int], Set[int]]] = {}
+        self._plan_runs:List[Tuple[Set[int], Dict[int, WorkflowNode], Set[int]]] = []
+        self._node_index:Dict[WorkflowNode, int] = {}
+        self._successor_indices:List[List[int]] = []
+        self._step_of:List[int] = []
+        self._step_members:Dict[int, List[int]] = {}
+        self._topological_rank:Union[List[int], None] = None
+
         super().__init__(
             sizing_mode = sizing_mode,
             nodes_classes = nodes_classes,
@@ -115,6 +354,422 @@ class Workflow(ReactFlowGraph):
             **kwargs
         )
 
+        self.param.watch(self._update_instruments, ["profiling", "profiling_overlay", "tracing"])
+        self._update_instruments()
+
+    def add_nodes(self, nodes:List[Node]):
+        """Adds nodes to the graph, the class attributes synchronized with the browser being updated once for all the nodes
+
+        Parameters
+        ----------
+        nodes : List[Node]
+            Nodes to store
+        """
+        for node in nodes:
+            node.node.workflow = self
+        super().add_nodes(nodes)
+        for node in nodes:
+            node.node.on_node_added()
+
+    def remove_nodes(self, nodes:List[str]):
+        """Removes the given nodes from the graph
+
+        Parameters
+        ----------
+        nodes : List[str]
+            List of nodes names to remove
+        """
+        instances = [self.nodes_instances[self.item_names.index(name)] for name in nodes if name in self.item_names]
+        super().remove_nodes(nodes)
+        for instance in instances:
+            instance.on_node_deleted()
+
+    def _update_instruments(self, _:param.parameterized.Event = None):
+        """Registers the profiler and the tracer if profiling and tracing are enabled.
+
+        Parameters
+        ----------
+        _ : param.parameterized.Event, optional
+            Triggering event, by default None
+        """
+        for instrument, enabled in [(self.profiler, self.profiling), (self.tracer, self.tracing)]:
+            if enabled and instrument not in self._instruments:
+                self._instruments.append(instrument)
+            elif not enabled and instrument in self._instruments:
+                self._instruments.remove(instrument)
+
+        if not self.profiling_overlay:
+            self.node_overlay = {}
+
+    @contextmanager
+    def _wave(self, trigger:Any):
+        """Context in which the nodes updates belong to the same propagation wave. Nested calls join the current wave.
+
+        Parameters
+        ----------
+        trigger : Any
+            What started the wave
+        """
+        if self._current_wave is not None or not self._instruments:
+            yield
+            return
+
+        self._wave_count += 1
+        self._current_wave = PropagationWave(self._wave_count, trigger, perf_counter())
+        for instrument in self._instruments:
+            instrument.wave_started(self._current_wave)
+
+        try:
+            yield
+        finally:
+            wave = self._current_wave
+            self._current_wave = None
+            wave.duration = perf_counter() - wave.start
+            for instrument in self._instruments:
+                instrument.wave_finished(wave)
+
+            if self.profiling_overlay:
+                self.node_overlay = self.profiler.costs()
+
+    def _run_update(self, node:WorkflowNode, parent:Union[WorkflowNode, None], requested_at:float, incremental:bool = True):
+        """Calls the node update, recording its execution if instruments are registered
+
+        Parameters
+        ----------
+        node : WorkflowNode
+            Updated node
+        parent : Union[WorkflowNode, None]
+            Node whose outputs requested the update, None for graph changes
+        requested_at : float
+            perf_counter time of the update request
+        incremental : bool, optional
+            Whether the parent output change can be applied, the parent being the only changed input of the node, by default True
+        """
+        source = parent if incremental else None
+        if self._current_wave is None:
+            _update_node(node, source)
+            return
+
+        # Each frame accumulates the duration of the updates triggered by the node
+        self._run_stack.append([0.])
+        start = perf_counter()
+        try:
+            _update_node(node, source)
+        finally:
+            duration = perf_counter() - start
+            children_time = self._run_stack.pop()[0]
+            if self._run_stack:
+                self._run_stack[-1][0] += duration
+
+        output_size = 0
+        if self.profiler.measure_output_size:
+            try:
+                output_size = estimate_size(node.get_node_json_value())
+            except NotImplementedError:
+                pass
+
+        run = NodeRun(
+                        node_name=node.name,
+                        parent_name=None if parent is None else parent.name,
+                        start=start,
+                        duration=duration,
+                        self_time=duration - children_time,
+                        queue_wait=start - requested_at,
+                        output_size=output_size,
+                        depth=len(self._run_stack),
+                    )
+        self._current_wave.runs.append(run)
+        for instrument in self._instruments:
+            instrument.node_updated(self._current_wave, run)
+
+    def _successors(self, node:WorkflowNode) -> List[WorkflowNode]:
+        """Returns the nodes plugged on the output ports of a node
+
+        Parameters
+        ----------
+        node : WorkflowNode
+            Source node
+
+        Returns
+        -------
+        List[WorkflowNode]
+            Plugged nodes
+        """
+        return [
+                    plugged 
+                    for port in node.ports if port.direction == PortDirection.OUTPUT and port.name in node.plugged_nodes
+                    for plugged in node.plugged_nodes[port.name]
+                ]
+
+    def _group_plan(self, group:str) -> Union[List[WorkflowNode], None]:
+        """Returns the nodes of a collapsed group in their execution order, computed once per topology change
+
+        Parameters
+        ----------
+        group : str
+            Parent node name
+
+        Returns
+        -------
+        Union[List[WorkflowNode], None]
+            Group nodes in topological order, None if they contain a cycle
+        """
+        if self._group_plans_version != self._topology_version:
+            self._group_plans = {}
+            self._group_plans_version = self._topology_version
+
+        if not group in self._group_plans:
+            nodes = [self.nodes_instances[self.item_names.index(name)] for name in self.get_group_nodes(group)]
+            self._group_plans[group] = topological_order(nodes, self._successors)
+
+        return self._group_plans[group]
+
+    def _collapsed_group(self, node:WorkflowNode) -> Union[str, None]:
+        """Returns the outermost collapsed group containing a node, if its content can be executed as a compiled plan
+
+        Parameters
+        ----------
+        node : WorkflowNode
+            Workflow node
+
+        Returns
+        -------
+        Union[str, None]
+            Parent node name, None if the node is not in a collapsed group
+        """
+        group = None
+        name = node.name
+        while name in self.node_groups:
+            name = self.node_groups[name]
+            if name in self.collapsed_groups:
+                group = name
+
+        if group is not None and self._group_plan(group) is None:
+            return None
+        return group
+
+    def _run_group(self, group:str, entries:List[WorkflowNode], parent:Union[WorkflowNode, None], requested_at:float):
+        """Updates once, in topological order, the nodes of a collapsed group depending on the entry nodes, 
+        then the nodes outside the group plugged to them
+
+        Parameters
+        ----------
+        group : str
+            Collapsed parent node name
+        entries : List[WorkflowNode]
+            Group nodes whose update was requested
+        parent : Union[WorkflowNode, None]
+            Node whose outputs requested the update, None for graph changes
+        requested_at : float
+            perf_counter time of the update request
+        """
+        plan = self._group_plan(group)
+        to_run = reachable(entries, self._successors, set(plan))
+
+        externals:List[Tuple[WorkflowNode, WorkflowNode]] = []
+        self._group_runs.append((group, externals))
+        try:
+            for node in plan:
+                if node in to_run:
+                    # The group nodes inputs are not all given by the parent
+                    self._run_update(node, parent, requested_at, incremental=False)
+        finally:
+            self._group_runs.pop()
+
+        # Nodes outside the group are updated once, after the whole group
+        self._update_targets(list({node: source for node, source in externals}.items()), requested_at)
+
+    def _update_targets(self, targets:List[Tuple[WorkflowNode, WorkflowNode]], requested_at:float):
+        """Updates the target nodes, running the collapsed groups as compiled plans
+
+        Parameters
+        ----------
+        targets : List[Tuple[WorkflowNode, WorkflowNode]]
+            Updated nodes and the node that requested their update
+        requested_at : float
+            perf_counter time of the update request
+        """
+        groups = [self._collapsed_group(node) for node, _ in targets]
+        entries:Dict[str, List[WorkflowNode]] = {}
+        for (node, _), group in zip(targets, groups, strict=True):
+            if group is not None:
+                entries.setdefault(group, []).append(node)
+
+        # Each collapsed group runs once, with all its targeted nodes as entries
+        for (node, source), group in zip(targets, groups, strict=True):
+            if group is None:
+                self._run_update(node, source, requested_at)
+            elif group in entries:
+                self._run_group(group, entries.pop(group), source, requested_at)
+
+    def _compile(self, ):
+        """Computes, once per topology version, the nodes successors as indices and the execution steps with their 
+        topological rank. Each node is a step, except the nodes of a collapsed group that form a single step.
+        """
+        if self._plans_version == self._topology_version:
+            return
+
+        self._plans_version = self._topology_version
+        self._plans = {}
+        self._node_index = {node: i for i, node in enumerate(self.nodes_instances)}
+        self._successor_indices = [
+                                    list(dict.fromkeys(self._node_index[n] for n in self._successors(node) if n in self._node_index)) 
+                                    for node in self.nodes_instances
+                                ]
+
+        count = len(self.nodes_instances)
+        self._step_of = list(range(count))
+        self._step_members = {}
+        if self.collapsed_groups:
+            steps:Dict[str, int] = {}
+            for node in self.nodes_instances:
+                group = self._collapsed_group(node)
+                if group is not None and not group in steps:
+                    steps[group] = count + len(steps)
+                    self._step_members[steps[group]] = [self._node_index[n] for n in self._group_plan(group)]
+            for step, members in self._step_members.items():
+                for index in members:
+                    self._step_of[index] = step
+
+        order = topological_order(range(count + len(self._step_members)), self._step_successors)
+        if order is None and self._step_members:
+            # Collapsed groups both feeding and fed by the same outside nodes can't run as a single step
+            self._step_of = list(range(count))
+            self._step_members = {}
+            order = topological_order(range(count), self._step_successors)
+
+        if order is None:
+            self._topological_rank = None
+        else:
+            self._topological_rank = [0] * len(order)
+            for rank, step in enumerate(order):
+                self._topological_rank[step] = rank
+
+    def _step_successors(self, step:int) -> List[int]:
+        """Returns the steps depending on a step
+
+        Parameters
+        ----------
+        step : int
+            Node index, or collapsed group step
+
+        Returns
+        -------
+        List[int]
+            Steps plugged to the outputs of the step nodes
+        """
+        return list(dict.fromkeys(
+                                    self._step_of[successor]
+                                    for index in self._step_members.get(step, (step,))
+                                    for successor in self._successor_indices[index] if self._step_of[successor] != step
+                                ))
+
+    def _plan(self, source:WorkflowNode) -> Union[Tuple[List[int], Set[int]], None]:
+        """Returns the steps depending on the source node, in topological order, and the indices of their nodes. 
+        The plan is computed once per topology version and reused for every propagation from the source.
+
+        Parameters
+        ----------
+        source : WorkflowNode
+            Node whose outputs changed
+
+        Returns
+        -------
+        Union[Tuple[List[int], Set[int]], None]
+            Steps in execution order and their nodes indices, None if the graph contains a cycle or if the node is not in the workflow
+        """
+        self._compile()
+        if self._topological_rank is None or not source in self._node_index:
+            return None
+
+        index = self._node_index[source]
+        if not index in self._plans:
+            # A source inside a collapsed group runs the group step for its successors in the group
+            downstream = reachable([self._step_of[i] for i in self._successor_indices[index]], self._step_successors)
+            members = {member for step in downstream for member in self._step_members.get(step, (step,))}
+            self._plans[index] = (sorted(downstream, key=self._topological_rank.__getitem__), members)
+        return self._plans[index]
+
+    def _run_plan(self, source:WorkflowNode, plan:Tuple[List[int], Set[int]], requested_at:float):
+        """Updates the plan nodes whose inputs changed: a node is updated once, after all the nodes it depends on, 
+        if one of them called update_outputs. A collapsed group step updates its nodes depending on the requested ones, 
+        as in _run_group.
+
+        Parameters
+        ----------
+        source : WorkflowNode
+            Node whose outputs changed
+        plan : Tuple[List[int], Set[int]]
+            Steps in execution order and their nodes indices
+        requested_at : float
+            perf_counter time of the update request
+        """
+        order, members = plan
+        # Nodes to update, with the node that requested their update
+        dirty:Dict[int, WorkflowNode] = {index: source for index in self._successor_indices[self._node_index[source]]}
+        # Nodes whose update was requested several times, that can't be updated incrementally
+        merged:Set[int] = set()
+
+        self._plan_runs.append((members, dirty, merged))
+        try:
+            for step in order:
+                group_members = self._step_members.get(step)
+                if group_members is None:
+                    if step in dirty:
+                        self._run_update(self.nodes_instances[step], dirty[step], requested_at, incremental=not step in merged)
+                    continue
+
+                entries = [index for index in group_members if index in dirty]
+                if not entries:
+                    continue
+                to_run = reachable(entries, self._successor_indices.__getitem__, set(group_members))
+                parent = dirty[entries[0]]
+                for index in group_members:
+                    if index in to_run:
+                        # The group nodes inputs are not all given by the parent
+                        self._run_update(self.nodes_instances[index], dirty.get(index, parent), requested_at, incremental=False)
+        finally:
+            self._plan_runs.pop()
+
+    def _propagate(self, source:WorkflowNode):
+        """Updates the nodes plugged on the output ports of the source node
+
+        Parameters
+        ----------
+        source : WorkflowNode
+            Node whose outputs changed
+        """
+        requested_at = perf_counter()
+
+        with self._wave(source):
+            if self._plan_runs:
+                members, dirty, merged = self._plan_runs[-1]
+                index = self._node_index.get(source)
+                if index in members:
+                    # The running plan updates the successors later
+                    for successor in self._successor_indices[index]:
+                        if successor in dirty:
+                            merged.add(successor)
+                        else:
+                            dirty[successor] = source
+                    return
+
+            plan = self._plan(source)
+            if plan is not None:
+                self._run_plan(source, plan, requested_at)
+                return
+
+            # Graphs with cycles are propagated node by node
+            targets = self._successors(source)
+
+            if self._group_runs:
+                # The nodes of the running group are updated by its plan, the other ones after it
+                group, externals = self._group_runs[-1]
+                externals += [(node, source) for node in targets if self._collapsed_group(node) != group]
+                return
+
+            self._update_targets([(node, source) for node in targets], requested_at)
+
     def update_nodes(self, _:param.parameterized.Event):
         """Updates the nodes based on the noticed changes in the graph
 
@@ -138,7 +793,12 @@ class Workflow(ReactFlowGraph):
 
         for node_change in node_changes:
             if isinstance(node_change, NodeCreation):
-                self.nodes_instances[self.item_names.index(node_change.node_name)].update(None)
+                with self._wave(node_change):
+                    self._run_update(self.nodes_instances[self.item_names.index(node_change.node_name)], None, perf_counter())
+            elif isinstance(node_change, NodeDeletion):
+                # Nodes removed by remove_nodes are no longer in the instances list
+                if node_change.node_name in self.item_names:
+                    self.nodes_instances[self.item_names.index(node_change.node_name)].on_node_deleted()
             elif isinstance(node_change, NodeMove):
                 self.nodes_instances[self.item_names.index(node_change.node_name)].on_node_move(node_change)
             elif isinstance(node_change, NodeSelected):
@@ -148,11 +808,13 @@ class Workflow(ReactFlowGraph):
 
         for edge_change in edge_changes:
             if isinstance(edge_change, EdgeCreation):
-                self.nodes_instances[self.item_names.index(edge_change.target)].update(None)
+                with self._wave(edge_change):
+                    self._run_update(self.nodes_instances[self.item_names.index(edge_change.target)], None, perf_counter())
             elif isinstance(edge_change, EdgeDeletion):
                 # Checking the node wasn't removed from the list (node deletion triggers an edge deletion)
                 if edge_change.target in self.item_names:
-                    self.nodes_instances[self.item_names.index(edge_change.target)].update(None)
+                    with self._wave(edge_change):
+                        self._run_update(self.nodes_instances[self.item_names.index(edge_change.target)], None, perf_counter())
             elif isinstance(edge_change, EdgeSelected):
                 if self.edge_selection_callback is not None:
                     self.edge_selection_callback(edge_change)
@@ -161,13 +823,7 @@ class Workflow(ReactFlowGraph):
                     self.edge_deselection_callback(edge_change)
 
         # Calling every registered callbacks
-        for node_change in node_changes:
-            for callback in self._rf_event__callbacks[node_change.__class__]:
-                callback(node_change)
-                
-        for edge_change in edge_changes:
-            for callback in self._rf_event__callbacks[edge_change.__class__]:
-                callback(edge_change)
+        self._dispatch_changes(node_changes + edge_changes)
                 
         # Storing the current node and edge state for next call
         self.old_nodes = node_dict
@@ -176,15 +832,19 @@ class Workflow(ReactFlowGraph):
     def _build_node_tree(self,):
         """Provides to the nodes who is plugged to them for the nodes updates
         """
+        self._topology_version += 1
+
+        instances = {node.name: node for node in self.nodes_instances}
+
         # Removing edges of the nodes that could have been removed in the event triggering the node tree building
-        self.edges = [e for e in self.edges if e["source"] in self.item_names and e["target"] in self.item_names]
+        self.edges = [e for e in self.edges if e["source"] in instances and e["target"] in instances]
 
         for node in self.nodes_instances:
             node.plugged_nodes = {port.name : [] for port in node.ports}
 
         for edge in self.edges:
-            source_node = [node for node in self.nodes_instances if node.name == edge["source"]][0]
-            target_node = [node for node in self.nodes_instances if node.name == edge["target"]][0]
+            source_node = instances[edge["source"]]
+            target_node = instances[edge["target"]]
 
             source_port_name = edge["sourceHandle"]
             target_port_name = edge["targetHandle"]
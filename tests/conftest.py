@@ -8,6 +8,12 @@ from panel.io.reload import _watched_files
 from panel.io.state import state
 from panel.theme import Design
 
+from panel_reactflow.api import Edge
+from panel_reactflow.api import Node
+from panel_reactflow.nodes import FloatInputNode
+from panel_reactflow.nodes import PrintInputNode
+from panel_reactflow.workflow import Workflow
+
 optional_markers = {
     "ui": {
         "help": "Runs UI related tests",
@@ -63,3 +69,15 @@ def cache_cleanup():
     state.clear_caches()
     Design._resolve_modifiers.cache_clear()
     Design._cache.clear()
+
+
+@pytest.fixture
+def make_two_nodes_workflow():
+    """Return a factory of workflows whose FloatInputNode "input" is plugged to a PrintInputNode "print"."""
+
+    def make(nodes_classes=(), **kwargs):
+        nodes = [Node("input", FloatInputNode(), 0, 0), Node("print", PrintInputNode(), 200, 0)]
+        edges = [Edge("input", "Output", "print", "Input")]
+        return Workflow(nodes_classes=[FloatInputNode, PrintInputNode, *nodes_classes], initial_nodes=nodes, initial_edges=edges, **kwargs)
+
+    return make
@@ -35,3 +35,90 @@ def test_add_node_with_nodes():
     assert len(two_nodes_graph.item_ports) == 2
     assert len(two_nodes_graph.items) == 2
     assert len(two_nodes_graph.edges) == 0
+
+def test_add_node_lazy():
+    lazy_graph = ReactFlowGraph(nodes_classes=[FloatInputNode], initial_nodes=[], initial_edges=[], lazy_nodes=True)
+
+    node = FloatInputNode()
+    lazy_graph.add_node(Node("node", node, 0, 0))
+
+    assert lazy_graph.item_created == [False]
+    assert len(lazy_graph.items) == 1
+    assert node.get_node_json_value() == {"value" : node.float_input.value}
+
+    lazy_graph._handle_msg({"action": "RENDER_NODE", "node_id": "node"})
+
+    assert lazy_graph.item_created == [True]
+    assert lazy_graph.items[0].objects == [node.float_input]
+
+def test_remove_node_lazy():
+    lazy_graph = ReactFlowGraph(nodes_classes=[FloatInputNode], initial_nodes=[], initial_edges=[], lazy_nodes=True)
+
+    node = FloatInputNode()
+    node2 = FloatInputNode()
+    lazy_graph.add_node(Node("node", node, 0, 0))
+    lazy_graph.add_node(Node("node2", node2, 0, 0))
+    lazy_graph.remove_nodes(["node"])
+    lazy_graph.expand_node("node2")
+
+    assert lazy_graph.item_created == [True]
+    assert lazy_graph.nodes_instances == [node2]
+    assert lazy_graph.items[0].objects == [node2.float_input]
+
+def test_add_node_port_table():
+    from panel_reactflow.api import NodePort, PortDirection, PortPosition, PortRestriction, PortRestrictionRegistry
+    from panel_reactflow.nodes import SelectNode
+
+    class RestrictedNode(FloatInputNode):
+        ports = [NodePort(direction=PortDirection.INPUT, position=PortPosition.LEFT, name="Input", restriction=PortRestriction("float", "#f00")),
+                 NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output", restriction=PortRestriction("float", "#f00"))]
+
+    graph = ReactFlowGraph(nodes_classes=[FloatInputNode], initial_nodes=[], initial_edges=[], restrictions=PortRestrictionRegistry())
+    graph.add_node(Node("node", SelectNode(), 0, 0))
+    graph.add_node(Node("node2", RestrictedNode(), 0, 0))
+
+    assert graph.item_ports[0]["top"] == []
+    assert graph.item_ports[0]["left"] == [{"name":"Options", "type":"target", "display_name":False, "offset":None, "connection_count":1, "restriction":None}]
+    assert [p["name"] for p in graph.item_ports[0]["right"]] == ["Output"]
+    assert graph.item_ports[1]["left"][0]["restriction"] == graph.item_ports[1]["right"][0]["restriction"] == 0
+    assert graph.port_restrictions == [{"name":"float", "color":"#f00", "accepts":[]}]
+
+def test_add_node_from_sidebar():
+    from panel_reactflow.nodes import PrintInputNode
+
+    graph = ReactFlowGraph(nodes_classes=[FloatInputNode, PrintInputNode], initial_nodes=[], initial_edges=[])
+    graph._handle_msg({"action": "NEW_NODE", "node_id": "dndnode_0", "type": "Print Input", "x": 0, "y": 0})
+    graph._handle_msg({"action": "NEW_NODE", "node_id": "dndnode_1", "type": "Unknown", "x": 0, "y": 0})
+
+    assert graph.node_class_categories == ["Widgets", "Display"]
+    assert graph.item_names == ["dndnode_0"]
+    assert isinstance(graph.nodes_instances[0], PrintInputNode)
+
+def test_batch_callbacks():
+    from panel_reactflow.events import NodeChange, NodeSelected
+
+    graph = ReactFlowGraph(nodes_classes=[FloatInputNode])
+    for i in range(3):
+        graph.add_node(Node(f"node_{i}", FloatInputNode(), 0, 0))
+    graph.nodes = [{"id":f"node_{i}", "position":{"x":0, "y":0}} for i in range(3)]
+
+    single, batches, all_changes = [], [], []
+    graph.on_event(NodeSelected, single.append)
+    graph.on_event(NodeSelected, batches.append, batch=True)
+    graph.on_event(NodeChange, all_changes.append, batch=True)
+
+    # Box selection of all the nodes
+    graph.nodes = [{"id":f"node_{i}", "position":{"x":0, "y":0}, "selected":True} for i in range(3)]
+
+    assert len(single) == 3
+    assert len(batches) == 1
+    assert [change.node_name for change in batches[0]] == ["node_0", "node_1", "node_2"]
+    assert len(all_changes) == 1 and len(all_changes[0]) == 3
+
+def test_slotted_events():
+    from panel_reactflow.events import NodeMove, EdgeSelected
+
+    move = NodeMove("node", 1., 2., 0., 0.)
+    assert not hasattr(move, "__dict__")
+    assert move.to_dict() == {"node_name":"node", "new_x":1., "new_y":2., "old_x":0., "old_y":0.}
+    assert EdgeSelected("a", "out", "b", "in").to_dict()["target_handle"] == "in"
@@ -0,0 +1,75 @@
+import panel as pn
+
+from panel_reactflow.api import Edge, Node, NodePort, PortDirection, PortPosition
+from panel_reactflow.collaboration import OperationLog
+from panel_reactflow.nodes import FloatInputNode, PrintInputNode
+from panel_reactflow.workflow import Workflow, WorkflowNode
+
+class RelayNode(WorkflowNode):
+    node_class_name = "Relay"
+    ports = [NodePort(direction=PortDirection.INPUT, position=PortPosition.LEFT, name="Input"),
+             NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output")]
+
+    def create(self, ):
+        return pn.pane.Markdown(self.name)
+
+    def update(self, _):
+        self.update_outputs()
+
+    def get_node_json_value(self):
+        return {}
+
+def make_collaborative_workflow():
+    nodes = [Node("input", FloatInputNode(), 0, 0), Node("relay", RelayNode(), 200, 0), Node("print", PrintInputNode(), 400, 0)]
+    edges = [Edge("relay", "Output", "print", "Input")]
+    return Workflow(nodes_classes=[FloatInputNode, RelayNode, PrintInputNode], initial_nodes=nodes, initial_edges=edges, collaborative=True)
+
+def test_operation_log():
+    log = OperationLog(max_operations=3)
+    for i in range(5):
+        assert log.append({"op":"move", "positions":{"a":{"x":i, "y":0}}})["seq"] == i + 1
+
+    assert len(log) == 3
+    assert [entry["seq"] for entry in log.since(3)] == [4, 5]
+    assert [entry["seq"] for entry in log.since(2)] == [3, 4, 5]
+    assert log.since(5) == []
+    # Trimmed operations : the view needs the whole graph state
+    assert log.since(1) is None
+
+def test_collaborative_operations():
+    workflow = make_collaborative_workflow()
+    sent = []
+    workflow._send_event = lambda Event, data: sent.append(data)
+    print_node = workflow.nodes_instances[2]
+
+    # Concurrent edits of two views, in the order received by python
+    workflow._handle_msg({"action":"OPERATIONS", "operations":[
+        {"op":"add_edges", "edges":[{"source":"input", "sourceHandle":"Output", "target":"print", "targetHandle":"Input"}]},
+        {"op":"move", "positions":{"input":{"x":10, "y":20}}},
+    ]})
+    workflow._handle_msg({"action":"OPERATIONS", "operations":[
+        {"op":"move", "positions":{"input":{"x":30, "y":40}, "unknown":{"x":0, "y":0}}},
+        # Already plugged, then creating a loop
+        {"op":"add_edges", "edges":[{"source":"input", "sourceHandle":"Output", "target":"print", "targetHandle":"Input"}]},
+        {"op":"add_edges", "edges":[{"source":"relay", "sourceHandle":"Output", "target":"relay", "targetHandle":"Input"}]},
+    ]})
+
+    # A single message per applied batch, without the rejected operations
+    assert [[entry["op"] for entry in data["operations"]] for data in sent] == [["add_edges", "move"], ["move"]]
+    assert [entry["seq"] for data in sent for entry in data["operations"]] == [1, 2, 3]
+    assert sent[1]["operations"][0]["positions"] == {"input":{"x":30, "y":40}}
+
+    assert workflow.operation_seq == 3
+    assert workflow.get_edges() == [Edge("relay", "Output", "print", "Input"), Edge("input", "Output", "print", "Input")]
+    assert workflow.positions.position("input") == (30, 40)
+    assert set(print_node.json.object) == {"relay", "input"}
+
+    # Removing a node removes its edges in the same operation
+    workflow._handle_msg({"action":"OPERATIONS", "operations":[{"op":"remove_nodes", "ids":["input"]}]})
+    assert sent[-1]["operations"] == [{"seq":4, "op":"remove_nodes", "ids":["input"]}]
+    assert workflow.get_edges() == [Edge("relay", "Output", "print", "Input")]
+    assert set(print_node.json.object) == {"relay"}
+
+    # Late view requesting the operations following the last one it applied
+    workflow._handle_msg({"action":"RESYNC", "seq":2})
+    assert [entry["seq"] for entry in sent[-1]["operations"]] == [3, 4]
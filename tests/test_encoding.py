@@ -0,0 +1,88 @@
+import datetime
+import json
+
+import numpy as np
+import pytest
+
+from panel_reactflow import encoding
+from panel_reactflow.encoding import JSONEncoderToString, dumps, loads, register_type, typed_array
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+VALUE = {
+    "array": np.arange(6).reshape(2, 3),
+    "strided": np.arange(10.)[::2],
+    "objects": np.array([1, "a"], dtype=object),
+    "scalars": [np.int64(1), np.float32(0.5), np.bool_(True)],
+    "date": datetime.date(2024, 1, 2),
+    "datetime": datetime.datetime(2024, 1, 2, 3, 4, 5),
+    1: "integer key",
+}
+
+EXPECTED = {
+    "array": [[0, 1, 2], [3, 4, 5]],
+    "strided": [0., 2., 4., 6., 8.],
+    "objects": [1, "a"],
+    "scalars": [1, 0.5, True],
+    "date": "2024-01-02",
+    "datetime": "2024-01-02T03:04:05",
+    "1": "integer key",
+}
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_dumps(monkeypatch, fast):
+    if fast:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(encoding, "orjson", None)
+
+    assert loads(dumps(VALUE)) == EXPECTED
+    # The fallback encoder gives the same values
+    assert json.loads(json.dumps(VALUE, cls=JSONEncoderToString)) == EXPECTED
+
+    with pytest.raises(TypeError):
+        dumps({"point": Point(1, 2)})
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_dumps_non_finite(monkeypatch, fast):
+    if fast:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(encoding, "orjson", None)
+    monkeypatch.setattr(encoding, "_converters", {Point: lambda point: [point.x, np.float64(point.y)]})
+
+    value = {"nan": np.nan, "inf": np.float64(-np.inf), "array": np.array([1., np.nan]), "point": Point(1, np.nan)}
+    text = dumps(value)
+    assert "NaN" not in text and "Infinity" not in text
+    assert json.loads(text) == {"nan": None, "inf": None, "array": [1., None], "point": [1, None]}
+
+def test_register_type(monkeypatch):
+    monkeypatch.setattr(encoding, "_converters", {})
+    register_type(Point, lambda point: {"x": point.x, "y": np.array([point.y])})
+
+    assert loads(dumps({"point": Point(1, 2)})) == {"point": {"x": 1, "y": [2]}}
+
+def test_dumps_dataframe():
+    pd = pytest.importorskip("pandas")
+    frame = pd.DataFrame({"a": [1, 2], "b": [0.5, 1.5]})
+
+    assert loads(dumps({"frame": frame, "series": frame["a"]})) == {"frame": {"a": [1, 2], "b": [0.5, 1.5]}, "series": [1, 2]}
+
+def test_typed_array():
+    assert typed_array(np.arange(3, dtype=np.int64)).dtype == np.int32
+    assert typed_array(np.arange(3, dtype=np.uint64) + 2**31).dtype == np.uint32
+    # 64 bits integers out of the 32 bits range are refused instead of losing precision as float64
+    with pytest.raises(ValueError):
+        typed_array(np.array([2**53 + 1], dtype=np.int64))
+    assert typed_array(np.arange(3, dtype=np.float16)).dtype == np.float32
+    assert typed_array([1.5, 2.5]).dtype == np.float64
+
+    strided = typed_array(np.arange(10.)[::2])
+    assert strided.flags["C_CONTIGUOUS"]
+    assert strided.tolist() == [0., 2., 4., 6., 8.]
+
+    with pytest.raises(ValueError):
+        typed_array(np.array(["a"]))
@@ -0,0 +1,146 @@
+import panel as pn
+import pytest
+
+from panel_reactflow.api import Edge, Node
+from panel_reactflow.history import History
+from panel_reactflow.nodes import FloatInputNode
+from panel_reactflow.workflow import Workflow
+
+@pytest.fixture
+def history_workflow(make_two_nodes_workflow):
+    return make_two_nodes_workflow(collaborative=True, track_history=True)
+
+def test_history_initial_graph(history_workflow):
+    workflow = history_workflow
+
+    assert not workflow.history.can_undo
+    workflow.undo()
+    assert workflow.item_names == ["input", "print"]
+
+def test_undo_node_deletion(history_workflow):
+    workflow = history_workflow
+    input_node, print_node = workflow.nodes_instances
+    input_node.float_input.value = 3.
+
+    # The node and its edge are deleted in the same sync
+    workflow._handle_msg({"action":"OPERATIONS", "operations":[{"op":"remove_nodes", "ids":["input"]}]})
+    assert workflow.item_names == ["print"]
+    assert print_node.json.object == {}
+
+    workflow.undo()
+    assert workflow.item_names == ["print", "input"]
+    assert workflow.nodes_instances[1] is input_node
+    assert workflow.get_edges() == [Edge("input", "Output", "print", "Input")]
+    assert print_node.json.object == {"input": {"value": 3.}}
+
+    workflow.redo()
+    assert workflow.item_names == ["print"]
+    assert workflow.edges == []
+
+    workflow.undo()
+    workflow.undo()
+    # Widget value change
+    assert input_node.float_input.value == 0.
+    assert print_node.json.object == {"input": {"value": 0.}}
+    assert not workflow.history.can_undo
+
+def test_undo_moves_and_edges(history_workflow):
+    workflow = history_workflow
+    workflow.history.merge_interval = 60.
+
+    # Syncs of a drag are undone at once
+    for x in [10, 20, 30]:
+        workflow._handle_msg({"action":"OPERATIONS", "operations":[{"op":"move", "positions":{"input":{"x":x, "y":5}}}]})
+    workflow.remove_edges([Edge("input", "Output", "print", "Input")])
+    assert len(workflow.history.undo_steps) == 2
+
+    workflow.undo()
+    assert workflow.get_edges() == [Edge("input", "Output", "print", "Input")]
+    workflow.undo()
+    assert workflow.positions.position("input") == (0, 0)
+
+    workflow.redo()
+    assert workflow.positions.position("input") == (30, 5)
+
+    # A new edit drops the undone steps
+    workflow.add_node(Node("other", FloatInputNode(), 0, 100))
+    assert not workflow.history.can_redo
+    workflow.undo()
+    assert workflow.item_names == ["input", "print"]
+
+def test_history_bounded(history_workflow):
+    workflow = history_workflow
+    workflow.history = History(workflow, max_steps=3)
+    # Moves of different nodes are not merged
+    for x in range(10):
+        workflow._handle_msg({"action":"OPERATIONS", "operations":[{"op":"move", "positions":{["input", "print"][x % 2]:{"x":x, "y":0}}}]})
+
+    assert len(workflow.history.undo_steps) == 3
+    for _ in range(5):
+        workflow.undo()
+    assert workflow.positions.position("input") == (6, 0)
+    assert workflow.positions.position("print") == (5, 0)
+
+class ZoomedInputNode(FloatInputNode):
+    state_widgets = ["float_input"]
+
+    def __init__(self, ):
+        super().__init__()
+        self.zoom = pn.widgets.Select(options=[1, 2], value=1)
+        self._scale = pn.widgets.FloatSlider(start=0, end=1)
+
+def test_view_widgets_not_recorded(history_workflow):
+    workflow = history_workflow
+    zoomed = ZoomedInputNode()
+    workflow.add_node(Node("zoomed", zoomed, 0, 100))
+    workflow.history.clear()
+
+    # Widgets not declared in state_widgets only change the display
+    zoomed.zoom.value = 2
+    zoomed._scale.value = 0.5
+    assert not workflow.history.can_undo
+
+    zoomed.float_input.value = 3.
+    workflow.undo()
+    assert zoomed.float_input.value == 0. and zoomed.zoom.value == 2
+
+def make_browser_workflow(nodes):
+    workflow = Workflow(nodes_classes=[FloatInputNode], initial_nodes=nodes, track_history=True)
+    sent = []
+    workflow._send_event = lambda Event, data: sent.append(data)
+    # Initial sync of the view, acknowledged on mount
+    workflow.nodes = [n.to_reactflow() for n in nodes]
+    workflow._handle_msg({"action":"SYNC_MARK", "mark":0})
+    return workflow, sent
+
+def test_dropped_echo_acknowledged():
+    workflow, sent = make_browser_workflow([Node("input", FloatInputNode(), 0, 0)])
+    workflow.nodes = [{**workflow.nodes[0], "position":{"x":10, "y":0}}]
+    assert len(workflow.history.undo_steps) == 1
+
+    # The view drops the echo of the undone move, then acknowledges the operation
+    workflow.undo()
+    assert sent[-1]["action"] == "SyncMark"
+    workflow._handle_msg({"action":"SYNC_MARK", "mark":sent[-1]["mark"]})
+
+    # A later edit with the same change as the dropped echo is recorded
+    workflow.nodes = [{**workflow.nodes[0], "position":{"x":0, "y":0}}]
+    assert len(workflow.history.undo_steps) == 1
+
+def test_restore_keeps_node_alive():
+    class DeletionCounter(FloatInputNode):
+        deletions = 0
+
+        def on_node_deleted(self, ):
+            DeletionCounter.deletions += 1
+
+    workflow, _ = make_browser_workflow([Node("input", DeletionCounter(), 0, 0)])
+    instance = workflow.nodes_instances[0]
+
+    # Deleted in the browser, the instance is kept until the deletion is undone
+    workflow.nodes = []
+    assert DeletionCounter.deletions == 1
+
+    workflow.undo()
+    assert workflow.nodes_instances == [instance]
+    assert DeletionCounter.deletions == 1
@@ -0,0 +1,130 @@
+import json
+
+import numpy as np
+import panel as pn
+import pytest
+
+from panel_reactflow.api import Edge, Node
+from panel_reactflow.nodes import ArrayInputNode, FloatInputNode
+
+@pytest.fixture
+def make_journaled_workflow(make_two_nodes_workflow):
+    return lambda path, collaborative=True: make_two_nodes_workflow(nodes_classes=[ArrayInputNode], journal=path, collaborative=collaborative)
+
+# ArrayInputNode names its widget
+@pytest.mark.filterwarnings("ignore::PendingDeprecationWarning")
+def test_journal_recovery(tmp_path, make_journaled_workflow):
+    path = tmp_path / "graph.jsonl"
+    workflow = make_journaled_workflow(path)
+
+    workflow._handle_msg({"action":"OPERATIONS", "operations":[{"op":"move", "positions":{"input":{"x":10, "y":20}}}]})
+    workflow.add_node(Node("array", ArrayInputNode(), 0, 100))
+    workflow.add_edges([Edge("array", "Output", "print", "Input")])
+    workflow.nodes_instances[0].float_input.value = 4.
+    workflow.nodes_instances[2].array_input.value = np.array([1, 2])
+    workflow.remove_nodes(["input"])
+    workflow.journal.close()
+
+    # The journal replaces the initial graph
+    recovered = make_journaled_workflow(path)
+    assert recovered.item_names == ["print", "array"]
+    assert recovered.get_edges() == [Edge("array", "Output", "print", "Input")]
+    assert recovered.nodes[1]["position"] == {"x":0, "y":100}
+    assert recovered.nodes_instances[1].array_input.value.tolist() == [1, 2]
+    assert recovered.nodes_instances[0].values["array"]["value"].tolist() == [1, 2]
+
+    # The recovery compacted the journal
+    assert path.read_text() == ""
+    assert len(json.loads((tmp_path / "graph.jsonl.snapshot").read_text())["nodes"]) == 2
+
+def test_journal_compaction(tmp_path, make_journaled_workflow):
+    path = tmp_path / "graph.jsonl"
+    workflow = make_journaled_workflow(path)
+    workflow.journal.compact_every = 3
+
+    for x in range(1, 8):
+        workflow._handle_msg({"action":"OPERATIONS", "operations":[{"op":"move", "positions":{"input":{"x":x, "y":0}}}]})
+    workflow.nodes_instances[0].float_input.value = 2.
+    workflow.journal.close()
+
+    assert len(path.read_text().splitlines()) == 2
+    # Entry interrupted by a crash
+    with open(path, "a") as f:
+        f.write('{"seq":9,"op":"mo')
+
+    recovered = make_journaled_workflow(path)
+    assert recovered.nodes[0]["position"] == {"x":7, "y":0}
+    assert recovered.nodes_instances[0].float_input.value == 2.
+    assert recovered.journal.seq == 8
+
+def test_journal_bytes_values(tmp_path, make_journaled_workflow):
+    from panel_reactflow.nodes import FileInputNode
+
+    path = tmp_path / "graph.jsonl"
+    workflow = make_journaled_workflow(path)
+    workflow.add_node(Node("file", FileInputNode(), 0, 100))
+    workflow.nodes_instances[2].file_input.value = b"\x00csv content"
+    workflow.journal.close()
+
+    recovered = make_journaled_workflow(path)
+    assert recovered.item_names == ["input", "print", "file"]
+    assert recovered.nodes_instances[2].file_input.value == b"\x00csv content"
+
+def test_journal_unsupported_values(tmp_path):
+    from panel_reactflow.journal import _dump_value
+
+    # Values that are neither json, arrays nor bytes are not journaled
+    widget = pn.widgets.FileInput()
+    widget.value = [b"a", b"b"]
+    assert _dump_value(widget) is None
+
+def test_journal_timed_sync(tmp_path, make_journaled_workflow):
+    import time
+
+    path = tmp_path / "graph.jsonl"
+    workflow = make_journaled_workflow(path)
+    workflow.journal.sync_interval = 0.2
+    workflow.journal.sync()
+
+    # Last entry before an idle period, flushed by the timer
+    workflow.nodes_instances[0].float_input.value = 5.
+    assert workflow.journal._unsynced == 1
+    time.sleep(0.6)
+    assert workflow.journal._unsynced == 0
+    assert '"value"' in path.read_text()
+    workflow.journal.close()
+
+def test_journal_initial_sync(tmp_path, make_journaled_workflow):
+    path = tmp_path / "graph.jsonl"
+    workflow = make_journaled_workflow(path, collaborative=False)
+
+    # The first sync of the view gives the nodes and edges of the snapshot
+    workflow.nodes = [{"id":"input", "position":{"x":0, "y":0}, "data":{}}, {"id":"print", "position":{"x":200, "y":0}, "data":{}}]
+    workflow.edges = [{"id":"input_Output_print_Input", "source":"input", "sourceHandle":"Output", "target":"print", "targetHandle":"Input"}]
+    workflow.journal.close()
+    assert path.read_text() == ""
+
+    # Removed then created again
+    workflow.edges = []
+    workflow.edges = [{"id":"input_Output_print_Input", "source":"input", "sourceHandle":"Output", "target":"print", "targetHandle":"Input"}]
+    workflow.journal.close()
+    assert [json.loads(line)["op"] for line in path.read_text().splitlines()] == ["remove_edges", "add_edges"]
+
+class ZoomedInputNode(FloatInputNode):
+    state_widgets = ["float_input"]
+
+    def __init__(self, ):
+        super().__init__()
+        self.zoom = pn.widgets.Select(options=[1, 2], value=1)
+
+def test_journal_view_widgets(tmp_path, make_journaled_workflow):
+    path = tmp_path / "graph.jsonl"
+    workflow = make_journaled_workflow(path)
+    zoomed = ZoomedInputNode()
+    workflow.add_node(Node("zoomed", zoomed, 0, 100))
+
+    # Widgets not declared in state_widgets are not journaled
+    zoomed.zoom.value = 2
+    zoomed.float_input.value = 3.
+    workflow.journal.close()
+    assert [json.loads(line)["op"] for line in path.read_text().splitlines()] == ["add_node", "value"]
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from panel_reactflow.nodes import FloatInputNode, PrintInputNode
+from panel_reactflow.reactflow import ReactFlowGraph
+from panel_reactflow.metrics import SyncMetrics, payload_size
+from panel_reactflow.api import Node
+
+def test_metrics():
+    graph = ReactFlowGraph(nodes_classes=[FloatInputNode, PrintInputNode], track_metrics=True)
+    graph.add_node(Node("input", FloatInputNode(), 0, 0))
+
+    assert graph.metrics.params_sent["item_names"].messages == 1
+    assert graph.metrics.params_sent["item_names"].bytes == payload_size(["input"])
+    assert graph.metrics.params_sent["items"].bytes == 0
+    assert graph.metrics.events_sent["NodeCreation"].messages == 1
+
+    # Simulating the nodes sync by the browser
+    nodes = [{"id":"input", "type":"panelWidget", "position":{"x":0, "y":0}, "data":{"label":"input"}}]
+    graph._process_events({"nodes":nodes})
+
+    assert graph.metrics.params_received["nodes"].bytes == payload_size(nodes)
+    assert graph.metrics.changes == {"NodeCreation": 1}
+    assert list(graph.metrics.diff_sizes) == [1]
+
+    graph._handle_msg({"action":"NEW_NODE", "node_id":"print", "type":PrintInputNode.node_class_name, "x":0, "y":0})
+    assert graph.metrics.messages_received["NEW_NODE"].messages == 1
+
+    summary = graph.metrics.summary()
+    assert summary["messages_received"] == 2
+    assert summary["messages_per_second"] > 0
+
+def test_metrics_sampling():
+    metrics = SyncMetrics(sample_every=2)
+    for value in [[1], [1, 2, 3], [1, 2]]:
+        metrics.record_param("nodes", value, received=True)
+
+    # The second sync is counted with the size of the first one
+    assert metrics.params_received["nodes"].messages == 3
+    assert metrics.params_received["nodes"].bytes == 2 * payload_size([1]) + payload_size([1, 2])
+
+def test_metrics_disabled():
+    graph = ReactFlowGraph(nodes_classes=[FloatInputNode])
+    graph.add_node(Node("input", FloatInputNode(), 0, 0))
+
+    assert graph.metrics.totals() == {"sent":(0, 0), "received":(0, 0)}
+
+def test_node_series():
+    graph = ReactFlowGraph(nodes_classes=[FloatInputNode], initial_nodes=[Node("input", FloatInputNode(), 0, 0)], track_metrics=True)
+    sent = []
+    graph._send_event = lambda Event, data: sent.append(data)
+
+    graph.set_node_series({"input": np.arange(1_000_000, dtype=np.int64)})
+
+    # The series is sent as an array, transferred as a binary buffer
+    values = sent[-1]["series"]["input"]
+    assert isinstance(values, np.ndarray) and values.dtype == np.int32
+    assert payload_size(sent[-1]) < 4_000_100
+
+    # Views rendered later request the series
+    graph._handle_msg({"action":"NODE_SERIES"})
+    assert sent[-1]["series"]["input"] is values
+
+    with pytest.raises(ValueError):
+        graph.set_node_series({"unknown": np.zeros(3)})
+
+    graph.remove_nodes(["input"])
+    assert sent[-1] == {"action":"NodeSeries", "series":{"input":None}}
+    assert graph.node_series == {}
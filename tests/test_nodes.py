@@ -0,0 +1,97 @@
+import json
+
+import numpy as np
+import pytest
+
+from panel_reactflow.api import Node
+from panel_reactflow.nodes import ArrayInputNode, JSONEncoderToString, JSONPane, PrintInputNode, preview_value
+from panel_reactflow.workflow import Workflow
+
+def test_preview_value():
+    assert preview_value({"value": 2.}) == {"value": 2.}
+    assert preview_value(np.arange(3)) == [0, 1, 2]
+
+    summary = preview_value(np.arange(1000.).reshape(100, 10), max_items=4)
+    assert summary["shape"] == [100, 10]
+    assert summary["dtype"] == "float64"
+    assert summary["head"] == [0., 1.]
+    assert summary["tail"] == [998., 999.]
+    assert summary["max"] == 999.
+
+    assert preview_value(list(range(20)), max_items=3) == [0, 1, 2, "... 17 more elements"]
+    assert preview_value({"a": {"b": {"c": 1}}}, max_depth=2) == {"a": {"b": "dict (1 keys)"}}
+    assert preview_value("x" * 300, max_string=5) == "xxxxx... (300 characters)"
+
+def test_preview_dataframe():
+    pd = pytest.importorskip("pandas")
+    frame = preview_value(pd.DataFrame({"a": range(100), "b": 1.}), max_items=4)
+    assert frame["shape"] == [100, 2]
+    assert frame["dtypes"] == {"a": "int64", "b": "float64"}
+    assert frame["tail"]["a"] == {98: 98, 99: 99}
+    json.dumps(frame, cls=JSONEncoderToString)
+
+@pytest.mark.filterwarnings("ignore::PendingDeprecationWarning")
+def test_print_input_preview():
+    array_input = ArrayInputNode()
+    array_input.array_input.value = np.arange(10000)
+    nodes = [Node("array", array_input, 0, 0), Node("print", PrintInputNode(), 200, 0)]
+    workflow = Workflow(nodes_classes=[ArrayInputNode, PrintInputNode], initial_nodes=nodes)
+    workflow.nodes = [n.to_reactflow() for n in nodes]
+    workflow.edges = [{"id":"array_Output_print_Input", "source":"array", "sourceHandle":"Output", "target":"print", "targetHandle":"Input"}]
+    print_input = nodes[1].node
+
+    assert print_input.json.object["array"]["value"]["shape"] == [10000]
+    assert len(json.dumps(print_input.json.object, cls=JSONEncoderToString)) < 500
+
+    # The expanded input is shown with a larger limit
+    print_input.expand.value = "array"
+    assert len(print_input.json.object["array"]["value"]["head"]) == 500
+
+def test_preview_all_nan():
+    summary = preview_value(np.full(100, np.nan), max_items=4)
+    assert summary["min"] is None and summary["mean"] is None
+
+    summary = preview_value(np.array([np.nan] * 50 + [1.]), max_items=4)
+    assert summary["max"] == 1.
+
+def test_print_input_single_render(monkeypatch):
+    from panel_reactflow.nodes import FloatInputNode
+
+    renders = []
+    render = PrintInputNode._render
+    monkeypatch.setattr(PrintInputNode, "_render", lambda self: (renders.append(1), render(self)))
+
+    nodes = [Node("input", FloatInputNode(), 0, 0), Node("print", PrintInputNode(), 200, 0)]
+    workflow = Workflow(nodes_classes=[FloatInputNode, PrintInputNode], initial_nodes=nodes)
+    workflow.nodes = [n.to_reactflow() for n in nodes]
+    workflow.edges = [{"id":"input_Output_print_Input", "source":"input", "sourceHandle":"Output", "target":"print", "targetHandle":"Input"}]
+    print_input = nodes[1].node
+    print_input.expand.value = "input"
+
+    # The expanded input is unplugged: the selection is reset and the inputs rendered once
+    renders.clear()
+    workflow.edges = []
+    assert print_input.expand.value is None
+    assert len(renders) == 1
+
+def test_json_pane():
+    # JSONPane overrides pn.pane.JSON._transform_object, the models must be built through it
+    pane = JSONPane(object={"nan": np.nan, "array": np.arange(2)}, encoder=JSONEncoderToString)
+    model = pane.get_root()
+    assert json.loads(model.text) == {"nan": None, "array": [0, 1]}
+
+    # The falsy objects are kept
+    for value in [[], [0], {"zero": 0, "false": False}]:
+        pane.object = value
+        assert json.loads(model.text) == value
+
+def test_print_input_expand_not_recorded(make_two_nodes_workflow):
+    workflow = make_two_nodes_workflow(collaborative=True, track_history=True)
+    input_node, print_input = workflow.nodes_instances
+    input_node.float_input.value = 2.
+
+    # Expanding an input is not an edit: undo reverts the last value change
+    print_input.expand.value = "input"
+    workflow.undo()
+    assert input_node.float_input.value == 0.
+    assert print_input.expand.value == "input"
@@ -0,0 +1,38 @@
+import numpy as np
+
+from panel_reactflow.positions import PositionTable
+from panel_reactflow.events import NodeCreation, NodeDeletion, NodeMove, NodeSelected, NodeDeselected
+
+def node(name, x, y, **kwargs):
+    return {"id":name, "position":{"x":x, "y":y}, **kwargs}
+
+def test_diff():
+    table = PositionTable(capacity=2)
+
+    changes = table.diff({n["id"]: n for n in [node("a", 0, 0), node("b", 1, 1), node("c", 2, 2)]})
+    assert [type(c) for c in changes] == [NodeCreation] * 3
+    assert len(table) == 3
+
+    changes = table.diff({n["id"]: n for n in [node("a", 5, 0, selected=True), node("b", 1, 1, selected=False), node("c", 2, 2)]})
+    assert [type(c) for c in changes] == [NodeMove, NodeSelected]
+    assert (changes[0].old_x, changes[0].new_x) == (0., 5.)
+
+    changes = table.diff({n["id"]: n for n in [node("a", 5, 0, selected=False), node("d", 3, 3)]})
+    assert [type(c) for c in changes] == [NodeCreation, NodeDeselected, NodeDeletion, NodeDeletion]
+    assert [c.node_name for c in changes[2:]] == ["b", "c"]
+
+    names, xy = table.as_array()
+    assert names == ["a", "d"]
+    assert np.array_equal(xy, [[5., 0.], [3., 3.]])
+    assert table.position("d") == (3., 3.)
+
+def test_diff_reordered():
+    table = PositionTable()
+    table.diff({n["id"]: n for n in [node("a", 0, 0), node("b", 1, 1)]})
+
+    # Same nodes in another order, the rows are looked up again
+    changes = table.diff({n["id"]: n for n in [node("b", 1, 2), node("a", 0, 0, selected=True)]})
+    assert [type(c) for c in changes] == [NodeMove, NodeSelected]
+    assert (changes[0].node_name, changes[0].old_y, changes[0].new_y) == ("b", 1., 2.)
+    assert changes[1].node_name == "a"
+    assert table.position("b") == (1., 2.)
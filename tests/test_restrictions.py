@@ -0,0 +1,105 @@
+import pytest
+
+from panel_reactflow.nodes import FloatInputNode
+from panel_reactflow.reactflow import ReactFlowGraph
+from panel_reactflow.api import Node, Edge, NodePort, PortDirection, PortPosition, PortRestriction, PortRestrictionRegistry
+
+FLOAT = PortRestriction("float", "#f00")
+INT = PortRestriction("int", "#0f0")
+
+class FloatNode(FloatInputNode):
+    ports = [NodePort(direction=PortDirection.INPUT, position=PortPosition.LEFT, name="Input", restriction=FLOAT),
+             NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output", restriction=FLOAT)]
+
+class IntNode(FloatInputNode):
+    ports = [NodePort(direction=PortDirection.INPUT, position=PortPosition.LEFT, name="Input", restriction=INT),
+             NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output", restriction=INT)]
+
+def test_registry_intern():
+    registry = PortRestrictionRegistry()
+
+    assert registry.intern(None) is None
+    assert registry.intern(FLOAT) == 0
+    assert registry.intern(INT) == 1
+    assert registry.intern(PortRestriction("float", "#f00")) == 0
+    assert registry.get(0) is FLOAT
+
+    # Same name with another color: distinct id, compatible restrictions
+    blue_float = registry.intern(PortRestriction("float", "#00f"))
+    assert blue_float == 2
+    assert registry.is_compatible(blue_float, 0) and registry.is_compatible(0, blue_float)
+    assert registry.get(blue_float).color == "#00f"
+
+def test_registry_compatibility():
+    registry = PortRestrictionRegistry()
+    registry.allow(FLOAT, [INT])
+
+    float_id = registry.intern(FLOAT)
+    int_id = registry.intern(INT)
+
+    assert registry.is_compatible(float_id, float_id)
+    assert registry.is_compatible(int_id, float_id)
+    assert not registry.is_compatible(float_id, int_id)
+    assert not registry.is_compatible(None, float_id)
+    assert registry.to_reactflow() == [{"name":"float", "color":"#f00", "accepts":[int_id]},
+                                       {"name":"int", "color":"#0f0", "accepts":[]}]
+
+def test_graph_incompatible_edge():
+    with pytest.raises(ValueError):
+        ReactFlowGraph(initial_nodes=[Node("float", FloatNode(), 0, 0), Node("int", IntNode(), 0, 0)],
+                       initial_edges=[Edge("float", "Output", "int", "Input")],
+                       restrictions=PortRestrictionRegistry())
+
+def test_graph_accepted_edge():
+    registry = PortRestrictionRegistry()
+    registry.allow(FLOAT, [INT])
+
+    graph = ReactFlowGraph(initial_nodes=[Node("float", FloatNode(), 0, 0), Node("int", IntNode(), 0, 0)],
+                           initial_edges=[Edge("int", "Output", "float", "Input")],
+                           restrictions=registry)
+
+    graph.add_edges([Edge("int", "Output", "float", "Input")])
+    with pytest.raises(ValueError):
+        graph.add_edges([Edge("float", "Output", "int", "Input")])
+    assert graph.port_restrictions == registry.to_reactflow()
+
+def test_graphs_restrictions_colors():
+    registry = PortRestrictionRegistry()
+
+    class BlueFloatNode(FloatInputNode):
+        ports = [NodePort(direction=PortDirection.INPUT, position=PortPosition.LEFT, name="Input", restriction=PortRestriction("float", "#00f"))]
+
+    red_graph = ReactFlowGraph(initial_nodes=[Node("float", FloatNode(), 0, 0)], restrictions=registry)
+    blue_graph = ReactFlowGraph(initial_nodes=[Node("float", BlueFloatNode(), 0, 0)], restrictions=registry)
+
+    red_id = red_graph.item_ports[0]["left"][0]["restriction"]
+    blue_id = blue_graph.item_ports[0]["left"][0]["restriction"]
+    assert blue_graph.port_restrictions[blue_id]["color"] == "#00f"
+    assert red_graph.port_restrictions[red_id]["color"] == "#f00"
+
+def test_graph_late_allow():
+    registry = PortRestrictionRegistry()
+    graph = ReactFlowGraph(initial_nodes=[Node("float", FloatNode(), 0, 0), Node("int", IntNode(), 0, 0)], restrictions=registry)
+
+    registry.allow(FLOAT, [INT])
+    assert graph.port_restrictions == registry.to_reactflow()
+    assert graph.port_restrictions[registry.intern(FLOAT)]["accepts"] == [registry.intern(INT)]
+    graph.add_edges([Edge("int", "Output", "float", "Input")])
+
+def test_graph_allow_from_other_session():
+    from bokeh.document import Document
+
+    registry = PortRestrictionRegistry()
+    graph = ReactFlowGraph(initial_nodes=[Node("float", FloatNode(), 0, 0), Node("int", IntNode(), 0, 0)], restrictions=registry)
+    document = Document()
+    document.add_root(graph.get_root(document))
+    # Document of a served session
+    document._session_context = lambda: object()
+    ticks = []
+    document.add_next_tick_callback = ticks.append
+
+    # The change is applied on the next tick of the graph session
+    registry.allow(FLOAT, [INT])
+    assert graph.port_restrictions[registry.intern(FLOAT)]["accepts"] == []
+    ticks[0]()
+    assert graph.port_restrictions == registry.to_reactflow()
@@ -0,0 +1,48 @@
+import pytest
+
+from panel_reactflow.nodes import FloatInputNode
+from panel_reactflow.reactflow import ReactFlowGraph, shared_graph
+from panel_reactflow.api import Node, Edge
+
+@pytest.fixture
+def make_shared_workflow(make_two_nodes_workflow):
+    return lambda: make_two_nodes_workflow(read_only=True)
+
+def test_read_only_graph_state(make_shared_workflow):
+    workflow = make_shared_workflow()
+
+    # The graph is computed without any view synchronizing it
+    assert [n["id"] for n in workflow.nodes] == ["input", "print"]
+    assert workflow.get_edges() == [Edge("input", "Output", "print", "Input")]
+    print_node = workflow.nodes_instances[1]
+    assert print_node.json.object == {"input": {"value": 0}}
+
+    workflow.add_node(Node("other", FloatInputNode(), 0, 100))
+    workflow.add_edges([Edge("other", "Output", "print", "Input")])
+    assert set(print_node.json.object) == {"input", "other"}
+
+    workflow.remove_edges([Edge("other", "Output", "print", "Input")])
+    workflow.remove_nodes(["other"])
+    assert [n["id"] for n in workflow.nodes] == ["input", "print"]
+    assert set(print_node.json.object) == {"input"}
+
+def test_shared_graph(make_shared_workflow):
+    first = shared_graph("test", make_shared_workflow)
+    assert shared_graph("test", make_shared_workflow) is first
+
+    with pytest.raises(ValueError):
+        shared_graph("editable", lambda: ReactFlowGraph())
+
+def test_read_only_node_widgets(make_shared_workflow):
+    workflow = make_shared_workflow()
+    input_node, print_node = workflow.nodes_instances
+
+    # The node inputs are shared by the viewers, they are only set by python
+    assert input_node.float_input.disabled
+    workflow.add_node(Node("other", FloatInputNode(), 0, 100))
+    assert workflow.nodes_instances[2].float_input.disabled
+    input_node.float_input.value = 2.
+    assert print_node.json.object == {"input": {"value": 2.}}
+
+    # Display widgets stay enabled, shown the same in all the views
+    assert not print_node.expand.disabled
@@ -0,0 +1,110 @@
+import threading
+
+import numpy as np
+import panel as pn
+
+from panel_reactflow.api import Node, NodePort, PortDirection, PortPosition
+from panel_reactflow.nodes import PrintInputNode
+from panel_reactflow.sources import SourceNode
+from panel_reactflow.workflow import Workflow
+
+class CounterSourceNode(SourceNode):
+    ports = [NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output")]
+    period = 10.
+
+    def __init__(self, ):
+        super().__init__()
+        self.polls = 0
+
+    def create(self, ):
+        return pn.pane.Markdown("")
+
+    def poll(self, ):
+        self.polls += 1
+        return self.polls
+
+class RowsSourceNode(CounterSourceNode):
+    period = None
+
+    def combine_data(self, pending, data):
+        return np.concatenate([pending, data])
+
+def make_source_workflow(source):
+    nodes = [Node("source", source, 0, 0), Node("print", PrintInputNode(), 200, 0)]
+    workflow = Workflow(nodes_classes=[PrintInputNode], initial_nodes=nodes)
+    workflow.nodes = [n.to_reactflow() for n in nodes]
+    workflow.edges = [{"id":"source_Output_print_Input", "source":"source", "sourceHandle":"Output", "target":"print", "targetHandle":"Input"}]
+    return workflow, nodes[1].node
+
+def test_source_coalescing():
+    source = CounterSourceNode()
+    workflow, print_input = make_source_workflow(source)
+    source.period = None
+
+    for value in range(5):
+        source.push(value)
+    assert source.flush()
+    assert not source.flush()
+
+    # The received data are propagated once
+    assert source.received == 5
+    assert source.propagations == 1
+    assert print_input.json.object == {"source": {"value": 4}}
+
+    rows = RowsSourceNode()
+    threads = [threading.Thread(target=rows.push, args=(np.full(2, i),)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    rows.flush()
+    assert sorted(rows.value.tolist()) == [0, 0, 1, 1, 2, 2, 3, 3]
+
+def test_source_poll():
+    source = CounterSourceNode()
+    workflow, print_input = make_source_workflow(source)
+
+    source._tick()
+    source._tick()
+
+    # Polled once per period, the ticks in between only flushing pushed data
+    assert source.polls == 1
+    assert print_input.json.object == {"source": {"value": 1}}
+
+def test_source_stopped_on_deletion():
+    source = CounterSourceNode()
+    workflow, print_input = make_source_workflow(source)
+    source.start()
+    assert source.running
+
+    workflow.remove_nodes(["source"])
+    assert not source.running
+
+def test_source_deleted_in_browser():
+    source = CounterSourceNode()
+    workflow, print_input = make_source_workflow(source)
+    source.start()
+
+    workflow.nodes = [n for n in workflow.nodes if n["id"] != "source"]
+    assert not source.running
+
+def test_source_autostart():
+    source = CounterSourceNode()
+    source.autostart = True
+    nodes = [Node("source", source, 0, 0), Node("print", PrintInputNode(), 200, 0)]
+    workflow = Workflow(nodes_classes=[PrintInputNode], initial_nodes=nodes, collaborative=True, track_history=True)
+    assert source.running
+
+    workflow.remove_nodes(["source"])
+    assert not source.running
+
+    # The source restored by the undo runs again
+    workflow.undo()
+    assert workflow.nodes_instances[1] is source
+    assert source.running
+    source.stop()
+
+    # Sources are started by hand by default
+    manual = CounterSourceNode()
+    workflow.add_node(Node("manual", manual, 0, 100))
+    assert not manual.running
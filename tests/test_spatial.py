@@ -0,0 +1,49 @@
+import random
+
+from panel_reactflow.spatial import SpatialIndex
+from panel_reactflow.nodes import FloatInputNode
+from panel_reactflow.reactflow import ReactFlowGraph
+from panel_reactflow.api import Node
+
+def test_region_and_nearest():
+    index = SpatialIndex(cell_size=10.)
+    rng = random.Random(0)
+    points = {f"n{i}": (rng.uniform(-100, 100), rng.uniform(-100, 100)) for i in range(200)}
+    for name, (x, y) in points.items():
+        index.insert(name, x, y)
+
+    expected = {name for name, (x, y) in points.items() if -20 <= x <= 35 and 0 <= y <= 50}
+    assert set(index.region(-20, 0, 35, 50)) == expected
+
+    by_distance = sorted(points, key=lambda name: (points[name][0] - 3) ** 2 + (points[name][1] + 7) ** 2)
+    assert index.nearest(3, -7, k=5) == by_distance[:5]
+
+    index.move("n0", 1000, 1000)
+    assert index.nearest(990, 990) == ["n0"]
+    index.remove("n0")
+    assert "n0" not in index.region(900, 900, 1100, 1100)
+
+def test_children_follow_parent():
+    index = SpatialIndex()
+    index.insert("group", 100, 100)
+    index.insert("child", 10, 10, parent="group")
+    index.set_size("group", 200, 200)
+
+    assert index.points["child"] == (110, 110)
+    assert index.groups_at(150, 150) == ["group"]
+
+    index.move("group", 0, 0)
+    assert index.points["child"] == (10, 10)
+    assert sorted(index.region(0, 0, 20, 20)) == ["child", "group"]
+
+def test_graph_queries():
+    graph = ReactFlowGraph(nodes_classes=[FloatInputNode])
+    for i in range(3):
+        graph.add_node(Node(f"node_{i}", FloatInputNode(), 100 * i, 0))
+    graph.nodes = [{"id":f"node_{i}", "position":{"x":100 * i, "y":0}} for i in range(3)]
+
+    assert sorted(graph.get_nodes_in_region(50, -10, 250, 10)) == ["node_1", "node_2"]
+    assert graph.get_nearest_nodes(190, 0) == ["node_2"]
+
+    graph.nodes = [{"id":f"node_{i}", "position":{"x":100 * i, "y":500 if i == 2 else 0}} for i in range(3)]
+    assert graph.get_nearest_nodes(190, 0) == ["node_1"]
@@ -0,0 +1,474 @@
+import asyncio
+
+import numpy as np
+import panel as pn
+import pytest
+
+from panel_reactflow.deltas import Delta, array_delta
+from panel_reactflow.nodes import ArrayInputNode, FloatInputNode, PrintInputNode, ParentNode
+from panel_reactflow.workflow import Workflow, WorkflowNode
+from panel_reactflow.api import Node, Edge, NodePort, PortDirection, PortPosition
+
+def make_workflow(**kwargs):
+    nodes = [Node("input", FloatInputNode(), 0, 0), Node("print", PrintInputNode(), 200, 0)]
+    workflow = Workflow(nodes_classes=[FloatInputNode, PrintInputNode], initial_nodes=nodes, initial_edges=[], **kwargs)
+
+    # Simulating the graph synchronization by the browser
+    workflow.nodes = [n.to_reactflow() for n in nodes]
+    workflow.edges = [{"id":"input_Output_print_Input", "source":"input", "sourceHandle":"Output", "target":"print", "targetHandle":"Input"}]
+    return workflow, nodes[0].node, nodes[1].node
+
+def test_propagation():
+    workflow, float_input, print_input = make_workflow()
+    float_input.float_input.value = 2.
+
+    assert float_input.workflow is workflow
+    assert print_input.json.object == {"input": {"value": 2.}}
+
+def test_profiling():
+    workflow, float_input, print_input = make_workflow(profiling=True, profiling_overlay=True)
+    workflow.profiler.reset()
+
+    float_input.float_input.value = 2.
+
+    assert len(workflow.profiler.waves) == 1
+    wave = workflow.profiler.waves[0]
+    assert wave.trigger is float_input
+    assert [run.node_name for run in wave.runs] == ["print"]
+    assert wave.runs[0].parent_name == "input"
+    assert wave.runs[0].output_size == 0
+
+    assert workflow.profiler.stats["print"].calls == 1
+    assert workflow.profiler.summary()[0]["node"] == "print"
+    assert workflow.node_overlay == {"print": 1.}
+
+def test_profiling_disabled():
+    workflow, float_input, _ = make_workflow()
+    float_input.float_input.value = 2.
+
+    assert len(workflow.profiler.waves) == 0
+    assert workflow.node_overlay == {}
+
+def test_estimate_size():
+    import numpy as np
+    from panel_reactflow.profiling import estimate_size
+
+    assert estimate_size({"value": np.zeros(100)}) == len("value") + 800
+    assert estimate_size(["ab", b"cd"]) == 4
+
+def test_tracing(tmp_path):
+    import json
+    from panel_reactflow.events import EdgeCreation
+
+    nodes = [Node("input", FloatInputNode(), 0, 0), Node("print", PrintInputNode(), 200, 0)]
+    workflow = Workflow(nodes_classes=[FloatInputNode, PrintInputNode], initial_nodes=nodes, initial_edges=[], tracing=True)
+    workflow.nodes = [n.to_reactflow() for n in nodes]
+    workflow.tracer.reset()
+    workflow.edges = [{"id":"input_Output_print_Input", "source":"input", "sourceHandle":"Output", "target":"print", "targetHandle":"Input"}]
+    nodes[0].node.float_input.value = 2.
+
+    assert len(workflow.tracer.traces) == 2
+    edge_wave, value_wave = workflow.tracer.traces
+    assert edge_wave[0].attributes["workflow.event"] == EdgeCreation.__name__
+    assert value_wave[0].attributes["workflow.event"] == "OutputsUpdate"
+    assert value_wave[1].parent_span_id == value_wave[0].span_id
+    assert value_wave[1].attributes["workflow.requested_by"] == "input"
+
+    workflow.tracer.export_chrome_trace(tmp_path / "trace.json")
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    assert [e["name"] for e in trace["traceEvents"]][-1] == "update : print"
+
+    otlp = workflow.tracer.to_otlp()
+    spans = otlp["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert len(spans) == 4
+    assert spans[-1]["parentSpanId"] == spans[-2]["spanId"]
+
+class CountingNode(WorkflowNode):
+    node_class_name = "Counting"
+    ports = [NodePort(direction=PortDirection.INPUT, position=PortPosition.LEFT, name="Input"),
+             NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output")]
+
+    def __init__(self, propagate:bool = True):
+        super().__init__()
+        self.calls = 0
+        self.propagate = propagate
+
+    def create(self, ):
+        return pn.pane.Markdown(self.name)
+
+    def update(self, _):
+        self.calls += 1
+        if self.propagate:
+            self.update_outputs()
+
+    def get_node_json_value(self):
+        return {"calls": self.calls}
+
+def make_group_workflow(with_cycle:bool = False):
+    """Diamond b, c -> d inside the group, fed by the source node and feeding the output node."""
+    group_props = {"parentId": "group"}
+    nodes = [Node("group", ParentNode(), 0, 0, react_props={"style": {"width": 400, "height": 200}}, is_parent=True),
+             Node("source", CountingNode(), -200, 0)] +\
+            [Node(name, CountingNode(), 0, 0, react_props=group_props) for name in ["b", "c", "d"]] +\
+            [Node("output", CountingNode(), 500, 0)]
+    links = [("source", "b"), ("source", "c"), ("b", "d"), ("c", "d"), ("d", "output")]
+    if with_cycle:
+        # Cycle elsewhere in the graph, disabling the graph wide plans
+        nodes += [Node(name, CountingNode(propagate=False), 0, 500) for name in ["loop_0", "loop_1"]]
+        links += [("loop_0", "loop_1"), ("loop_1", "loop_0")]
+    workflow = Workflow(nodes_classes=[CountingNode], initial_nodes=nodes, initial_edges=[], allow_edge_loops=with_cycle)
+
+    workflow.nodes = [n.to_reactflow() for n in nodes]
+    workflow.edges = [{"id":f"{s}_{t}", "source":s, "sourceHandle":"Output", "target":t, "targetHandle":"Input"} for s, t in links]
+    for node in nodes:
+        node.node.calls = 0
+    return workflow, {node.name: node.node for node in nodes}
+
+def test_groups_index():
+    workflow, _ = make_group_workflow()
+
+    assert workflow.group_children == {"group": ["b", "c", "d"]}
+    assert workflow.node_groups["d"] == "group"
+    assert workflow.get_group_nodes("group") == ["b", "c", "d"]
+
+    workflow.collapse_group("group")
+    index = workflow.item_names.index("b")
+    assert isinstance(workflow.items[index], pn.Spacer)
+
+    workflow.expand_group("group")
+    assert isinstance(workflow.items[index], pn.pane.Markdown)
+
+    workflow.remove_nodes(["d"])
+    assert workflow.get_group_nodes("group") == ["b", "c"]
+
+def test_collapsed_group_execution():
+    workflow, nodes = make_group_workflow()
+    nodes["b"].propagate = nodes["c"].propagate = False
+
+    # Expanded, the nodes that don't call update_outputs stop the propagation
+    nodes["source"].update_outputs()
+    assert [nodes[name].calls for name in ["b", "c", "d", "output"]] == [1, 1, 0, 0]
+
+    for node in nodes.values():
+        node.calls = 0
+    workflow.collapse_group("group")
+
+    # Collapsed, the group runs as one step: every group node depending on the updated ones runs once
+    nodes["source"].update_outputs()
+    assert [nodes[name].calls for name in ["b", "c", "d", "output"]] == [1, 1, 1, 1]
+
+    # Update requested from inside the group
+    nodes["b"].update_outputs()
+    assert [nodes[name].calls for name in ["b", "c", "d", "output"]] == [1, 1, 2, 2]
+
+def test_collapsed_group_execution_with_cycle():
+    workflow, nodes = make_group_workflow(with_cycle=True)
+
+    # Without plan, the output node is updated by each branch of the diamond
+    nodes["source"].update_outputs()
+    assert nodes["d"].calls == 2 and nodes["output"].calls == 2
+
+    for node in nodes.values():
+        node.calls = 0
+    workflow.collapse_group("group")
+
+    nodes["source"].update_outputs()
+    assert [nodes[name].calls for name in ["b", "c", "d", "output"]] == [1, 1, 1, 1]
+
+def test_sub_workflow_node():
+    from panel_reactflow.subworkflow import make_sub_workflow_node
+
+    Block = make_sub_workflow_node("Block", {"a": CountingNode, "b": CountingNode}, [Edge("a", "Output", "b", "Input")])
+    assert [port.name for port in Block.ports] == ["a.Input", "b.Output"]
+
+    nodes = [Node("input", FloatInputNode(), 0, 0), Node("block", Block(), 200, 0), Node("print", PrintInputNode(), 400, 0)]
+    workflow = Workflow(nodes_classes=[FloatInputNode, Block, PrintInputNode], initial_nodes=nodes, initial_edges=[])
+    workflow.nodes = [n.to_reactflow() for n in nodes]
+    workflow.edges = [
+        {"id":"input_block", "source":"input", "sourceHandle":"Output", "target":"block", "targetHandle":"a.Input"},
+        {"id":"block_print", "source":"block", "sourceHandle":"b.Output", "target":"print", "targetHandle":"Input"},
+    ]
+
+    block = nodes[1].node
+    block.inner_nodes["a"].calls = block.inner_nodes["b"].calls = 0
+    nodes[0].node.float_input.value = 3.
+
+    assert block.inner_nodes["a"].plugged_nodes["Input"] == [nodes[0].node]
+    assert (block.inner_nodes["a"].calls, block.inner_nodes["b"].calls) == (1, 1)
+    assert nodes[2].node.json.object == {"block": {"calls": 1}}
+
+def test_sub_workflow_displayed_widget():
+    from panel_reactflow.subworkflow import make_sub_workflow_node
+
+    Block = make_sub_workflow_node("Block", {"x": FloatInputNode, "c": CountingNode}, [Edge("x", "Output", "c", "Input")], displayed_nodes=["x"])
+    block = Block()
+    block.create()
+
+    block.inner_nodes["x"].float_input.value = 1.
+    assert block.inner_nodes["c"].calls == 1
+
+def test_sub_workflow_build_without_instances():
+    from panel_reactflow.subworkflow import make_sub_workflow_node
+
+    class InstanceCounter(CountingNode):
+        instances = 0
+
+        def __init__(self, ):
+            super().__init__()
+            InstanceCounter.instances += 1
+
+    Block = make_sub_workflow_node("Block", {"a": InstanceCounter, "b": CountingNode}, [Edge("a", "Output", "b", "Input")])
+    assert InstanceCounter.instances == 0
+    assert Block.displayed_nodes is None
+
+    block = Block()
+    assert InstanceCounter.instances == 1
+    assert block.inner_nodes["a"].workflow is block
+
+def test_sub_workflow_cycle():
+    import pytest
+    from panel_reactflow.subworkflow import make_sub_workflow_node
+
+    with pytest.raises(ValueError):
+        make_sub_workflow_node("Loop", {"a": CountingNode, "b": CountingNode}, [Edge("a", "Output", "b", "Input"), Edge("b", "Output", "a", "Input")])
+
+def test_execution_plan():
+    workflow, nodes = make_group_workflow()
+
+    nodes["source"].update_outputs()
+    assert [nodes[name].calls for name in ["b", "c", "d", "output"]] == [1, 1, 1, 1]
+
+    # The plan is reused while the topology is unchanged
+    plan = workflow._plan(nodes["source"])
+    nodes["source"].update_outputs()
+    assert workflow._plan(nodes["source"]) is plan
+    assert [workflow.item_names[i] for i in plan[0]][-1] == "output"
+
+    # Nodes that do not call update_outputs stop the propagation
+    nodes["b"].propagate = nodes["c"].propagate = False
+    nodes["source"].update_outputs()
+    assert [nodes[name].calls for name in ["b", "c", "d", "output"]] == [3, 3, 2, 2]
+
+    workflow.edges = [e for e in workflow.edges if e["target"] != "output"]
+    assert workflow._plan(nodes["source"]) is not plan
+
+class ChunkSourceNode(WorkflowNode):
+    ports = [NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output")]
+
+    def __init__(self, ):
+        super().__init__()
+        self.chunks = []
+        self.pulled = []
+
+    def generate(self, ):
+        for chunk in self.chunks:
+            self.pulled.append(chunk)
+            yield chunk
+
+    async def generate_async(self, ):
+        for chunk in self.chunks:
+            self.pulled.append(chunk)
+            yield chunk
+
+    def create(self, ):
+        return pn.pane.Markdown("")
+
+    def update(self, _):
+        self.stream_outputs(self.generate())
+
+    def get_node_json_value(self, ):
+        return {"value": self.stream_value}
+
+class ChunkConsumerNode(WorkflowNode):
+    ports = [NodePort(direction=PortDirection.INPUT, position=PortPosition.LEFT, name="Input")]
+
+    def __init__(self, streaming_consumer:bool, source:ChunkSourceNode):
+        super().__init__()
+        self.streaming_consumer = streaming_consumer
+        self.source = source
+        self.received = []
+        self.updates = []
+
+    def on_stream_start(self, source):
+        self.received = []
+
+    def on_chunk(self, source, chunk):
+        # Chunks are pulled only once the previous one is consumed
+        assert self.source.pulled[-1] == chunk
+        self.received.append(chunk)
+
+    def create(self, ):
+        return pn.pane.Markdown("")
+
+    def update(self, _):
+        if self.plugged_nodes.get("Input"):
+            self.updates.append(self.plugged_nodes["Input"][0].get_node_json_value()["value"])
+
+    def get_node_json_value(self, ):
+        return {}
+
+def make_stream_workflow():
+    source = ChunkSourceNode()
+    nodes = [
+                Node("source", source, 0, 0), 
+                Node("live", ChunkConsumerNode(True, source), 200, 0), 
+                Node("final", ChunkConsumerNode(False, source), 200, 100),
+            ]
+    workflow = Workflow(nodes_classes=[ChunkSourceNode], initial_nodes=nodes)
+    workflow.nodes = [n.to_reactflow() for n in nodes]
+    workflow.edges = [
+                        {"id":f"source_Output_{name}_Input", "source":"source", "sourceHandle":"Output", "target":name, "targetHandle":"Input"}
+                        for name in ["live", "final"]
+                    ]
+    return workflow, source, nodes[1].node, nodes[2].node
+
+def test_stream_outputs():
+    workflow, source, live, final = make_stream_workflow()
+    live.updates.clear()
+    final.updates.clear()
+
+    source.chunks = [1, 2, 3]
+    source.update(None)
+
+    assert not source.streaming
+    assert live.received == [1, 2, 3]
+    assert final.received == []
+    # Non-streaming consumers get the final value once
+    assert final.updates == [[1, 2, 3]]
+    assert live.updates == [[1, 2, 3]]
+
+    source.chunks = ["a", "b"]
+    source.stream_outputs(source.generate_async())
+    assert live.received == ["a", "b"]
+    assert final.updates == [[1, 2, 3], ["a", "b"]]
+
+def test_stream_superseded():
+    workflow, source, live, final = make_stream_workflow()
+    final.updates.clear()
+
+    def restarting():
+        source.pulled.append(1)
+        yield 1
+        # A new input restarts the stream while it runs
+        source.chunks = [4, 5]
+        source.update(None)
+        source.pulled.append(2)
+        yield 2
+
+    source.stream_outputs(restarting())
+
+    assert live.received == [4, 5]
+    assert final.updates == [[4, 5]]
+    assert source.stream_value == [4, 5]
+
+def test_stream_on_event_loop():
+    workflow, source, live, final = make_stream_workflow()
+    final.updates.clear()
+    source.chunks = [1, 2, 3]
+
+    async def run():
+        source.stream_outputs(source.generate_async())
+        assert source.streaming
+        received = []
+        while source.streaming:
+            await asyncio.sleep(0)
+            received.append(list(live.received))
+        return received
+
+    received = asyncio.run(run())
+
+    # The first chunks are consumed before the stream ends
+    assert [1] in received
+    assert final.updates == [[1, 2, 3]]
+
+def test_array_delta():
+    old = np.array([1, 2, 3])
+    assert array_delta(old, np.array([1, 2, 3, 4, 5])).appended.tolist() == [4, 5]
+    assert array_delta(old, np.array([1, 2, 3, 4])).changed is None
+    assert array_delta(old, np.array([1, 7, 3])) == Delta(changed=[1])
+    assert array_delta(old, np.array([1, 2, 3])).empty
+    # Removed elements or different element shapes are not deltas
+    assert array_delta(old, np.array([1, 2])) is None
+    assert array_delta(old, np.array([[1, 2, 3]])) is None
+    assert array_delta(None, old) is None
+
+    rows = array_delta(np.zeros((2, 2)), np.array([[0, 0], [0, 1], [1, 1]]))
+    assert rows.changed == [1]
+    assert rows.appended.tolist() == [[1, 1]]
+
+class RunningSumNode(WorkflowNode):
+    ports = [
+                NodePort(direction=PortDirection.INPUT, position=PortPosition.LEFT, name="Input"),
+                NodePort(direction=PortDirection.OUTPUT, position=PortPosition.RIGHT, name="Output"),
+            ]
+
+    def __init__(self, ):
+        super().__init__()
+        self.total = 0.
+        self.full_updates = 0
+        self.deltas = []
+
+    def create(self, ):
+        return pn.pane.Markdown("")
+
+    def apply_delta(self, source, delta):
+        if delta.changed:
+            return False
+        self.deltas.append(delta)
+        if delta.appended is not None:
+            self.total += float(np.sum(delta.appended))
+        self.update_outputs()
+        return True
+
+    def update(self, _):
+        self.full_updates += 1
+        self.total = float(sum(np.sum(node.get_node_json_value()["value"]) for node in self.plugged_nodes.get("Input", [])))
+        self.update_outputs()
+
+    def get_node_json_value(self, ):
+        return {"value": self.total}
+
+@pytest.mark.filterwarnings("ignore::PendingDeprecationWarning")
+def test_delta_propagation():
+    array_input = ArrayInputNode()
+    array_input.array_input.value = np.array([1., 2.])
+    nodes = [Node("array", array_input, 0, 0), Node("sum", RunningSumNode(), 200, 0)]
+    workflow = Workflow(nodes_classes=[ArrayInputNode, RunningSumNode], initial_nodes=nodes)
+    workflow.nodes = [n.to_reactflow() for n in nodes]
+    workflow.edges = [{"id":"array_Output_sum_Input", "source":"array", "sourceHandle":"Output", "target":"sum", "targetHandle":"Input"}]
+    running_sum = nodes[1].node
+    assert running_sum.total == 3.
+    full_updates = running_sum.full_updates
+
+    # Appended elements are applied incrementally
+    array_input.array_input.value = np.array([1., 2., 4.])
+    assert running_sum.total == 7.
+    assert running_sum.full_updates == full_updates
+    assert running_sum.deltas[-1].appended.tolist() == [4.]
+
+    # Changes the node doesn't apply fall back to update
+    array_input.array_input.value = np.array([0., 2., 4.])
+    assert running_sum.total == 6.
+    assert running_sum.full_updates == full_updates + 1
+
+@pytest.mark.filterwarnings("ignore::PendingDeprecationWarning")
+def test_delta_merged_inputs():
+    array_input = ArrayInputNode()
+    array_input.array_input.value = np.array([1.])
+    nodes = [Node("array", array_input, 0, 0), Node("first", RunningSumNode(), 200, 0), Node("second", RunningSumNode(), 400, 0)]
+    workflow = Workflow(nodes_classes=[ArrayInputNode, RunningSumNode], initial_nodes=nodes)
+    workflow.nodes = [n.to_reactflow() for n in nodes]
+    workflow.edges = [
+                        {"id":"array_Output_first_Input", "source":"array", "sourceHandle":"Output", "target":"first", "targetHandle":"Input"},
+                        {"id":"array_Output_second_Input", "source":"array", "sourceHandle":"Output", "target":"second", "targetHandle":"Input"},
+                        {"id":"first_Output_second_Input", "source":"first", "sourceHandle":"Output", "target":"second", "targetHandle":"Input"},
+                    ]
+    first, second = nodes[1].node, nodes[2].node
+    full_updates = second.full_updates
+
+    array_input.array_input.value = np.array([1., 2.])
+
+    assert first.total == 3.
+    # Second depends on both array and first, whose changes are merged in a full update
+    assert second.total == 6.
+    assert second.full_updates == full_updates + 1